@@ -0,0 +1,15 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+__MAIN__.PY
+
+Runs the command-line interface as 'python -m nodesmith'.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+from .cli import main
+
+main()
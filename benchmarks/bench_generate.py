@@ -0,0 +1,177 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+BENCH_GENERATE.PY
+
+Times each generation phase over a grid of synthetic plugin specs and
+writes the results as JSON, so runs from different nodesmith versions
+can be compared for regressions.
+
+Usage:
+	python bench_generate.py [-nodes 10,100] [-plugs 2,20] [-mix mixed]
+		[-output results.json] [-label name]
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import argparse
+import copy
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+basepath = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath(__file__) ) ) )
+
+if not basepath in sys.path:
+	sys.path.insert( 0, basepath )
+
+from nodesmith.benchmarks.synthetic import make_spec
+from nodesmith.manifest import Manifest, generator_fingerprint
+from nodesmith.plugin import Plugin
+
+## ----------------------------------------------------------------------
+
+default_nodes = '10,100,1000,10000'
+default_plugs = '2,20,200'
+default_mixes = 'float,angle,matrix,mixed'
+
+## phases, in the order they run
+phases = [
+	'from_json', 'generate_include', 'generate_class', 'generate_node_main',
+	'generate_common_header', 'generate_plugin_cpp', 'generate_plugin_cmake',
+	'write',
+]
+
+
+## ----------------------------------------------------------------------
+def timed( function, *args ):
+	start = time.perf_counter( )
+	result = function( *args )
+	return (time.perf_counter( ) - start, result)
+
+def run_once( spec, folder ):
+	"""
+	Runs every phase once over a spec.
+	:return: (dict of phase name to seconds, number of bytes generated)
+	"""
+	times = { }
+	generated = { }
+
+	data = copy.deepcopy( spec )    ## from_json consumes its input
+	plugin = Plugin( )
+	times['from_json'], _ = timed( plugin.from_json, data )
+
+	nodes = list( plugin.nodes.values( ) )
+	for phase in [ 'generate_include', 'generate_class', 'generate_node_main' ]:
+		start = time.perf_counter( )
+		generated[phase] = [ getattr( node, phase )( ) for node in nodes ]
+		times[phase] = time.perf_counter( ) - start
+
+	files = [ ]
+	for node, header, cpp, main in zip( nodes, generated['generate_include'],
+				generated['generate_class'], generated['generate_node_main'] ):
+		files.extend( zip( node.file_names, [ header, cpp, main ] ) )
+
+	for phase, name in [ ('generate_common_header', 'common.h'),
+				('generate_plugin_cpp', 'plugin_main.cpp'),
+				('generate_plugin_cmake', 'CMakeLists.txt') ]:
+		times[phase], content = timed( getattr( plugin, phase ) )
+		files.append( (name, content) )
+
+	manifest = Manifest( folder )
+	start = time.perf_counter( )
+	for name, content in files:
+		manifest.write( name, content )
+	times['write'] = time.perf_counter( ) - start
+
+	return (times, sum( len( content ) for _, content in files ))
+
+def run_case( nodes, plugs, mix, repeat ):
+	spec = make_spec( nodes, plugs, mix )
+	best = None
+	size = 0
+
+	for _ in range( repeat ):
+		folder = tempfile.mkdtemp( prefix='nodesmith_bench_' )
+		try:
+			times, size = run_once( spec, folder )
+		finally:
+			shutil.rmtree( folder, ignore_errors=True )
+
+		if best is None:
+			best = times
+		else:
+			best = dict( (x, min( best[x], times[x] )) for x in best )
+
+	total = sum( best.values( ) )
+
+	return ({
+		'nodes':         nodes,
+		'plugs':         plugs,
+		'mix':           mix,
+		'bytes':         size,
+		'seconds':       dict( (x, best[x]) for x in phases ),
+		'total':         total,
+		'us_per_node':   total * 1e6 / nodes,
+		'us_per_plug':   total * 1e6 / (nodes * plugs),
+	})
+
+def int_list( text ):
+	return ([ int( x ) for x in text.split( ',' ) if x ])
+
+
+## ----------------------------------------------------------------------
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser( description='Benchmark nodesmith generation phases.' )
+	parser.add_argument( '-nodes', type=str, default=default_nodes,
+						help='Comma-separated node counts.' )
+	parser.add_argument( '-plugs', type=str, default=default_plugs,
+						help='Comma-separated plug counts per node.' )
+	parser.add_argument( '-mix', type=str, default=default_mixes,
+						help="Comma-separated plug type mixes; use ':' weights "
+							 "joined with '+', e.g. float:3+matrix:1." )
+	parser.add_argument( '-max-plugs', dest='max_plugs', type=int, default=500000,
+						help='Skip cases with more plugs than this in total.' )
+	parser.add_argument( '-repeat', type=int, default=1,
+						help='Best-of count per case.' )
+	parser.add_argument( '-label', type=str, default=None,
+						help='Free-form label stored with the results.' )
+	parser.add_argument( '-output', type=str, default=None,
+						help='JSON output file. Defaults to stdout.' )
+	args = parser.parse_args( )
+
+	results = [ ]
+	for mix in args.mix.split( ',' ):
+		mix = mix.replace( '+', ',' )
+		for plugs in int_list( args.plugs ):
+			for nodes in int_list( args.nodes ):
+				if nodes * plugs > args.max_plugs:
+					sys.stderr.write( "skipping %d nodes x %d plugs (%s)\n" % (nodes, plugs, mix) )
+					continue
+
+				result = run_case( nodes, plugs, mix, args.repeat )
+				results.append( result )
+				sys.stderr.write( "%6d nodes x %3d plugs (%s): %8.3f s, %8.1f us/node\n" % \
+					(nodes, plugs, mix, result['total'], result['us_per_node']) )
+
+	report = {
+		'label':     args.label,
+		'generator': generator_fingerprint( ),
+		'python':    platform.python_version( ),
+		'platform':  platform.platform( ),
+		'phases':    phases,
+		'results':   results,
+	}
+
+	text = json.dumps( report, indent=1, sort_keys=True )
+	if args.output:
+		with open( args.output, 'w' ) as fp:
+			fp.write( text + '\n' )
+	else:
+		print( text )
@@ -0,0 +1,92 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+BENCH_TEMPLATES.PY
+
+Measures the per-node cost of generating the header, class and main
+files with templates loaded once through the registry, against reading
+every template from disk on each call as the generators used to.
+
+Usage:
+	python bench_templates.py [-nodes N] [-plugs N]
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+import timeit
+
+basepath = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath(__file__) ) ) )
+
+if not basepath in sys.path:
+	sys.path.insert( 0, basepath )
+
+from nodesmith.mpxnode import MPxNodeCPP
+from nodesmith.templates import TemplateRegistry, get_registry
+
+
+## ----------------------------------------------------------------------
+class UncachedRegistry( TemplateRegistry ):
+	"""
+	Reads and checks the template on every request, which matches the
+	old behaviour of opening the file inside each generate_* call.
+	"""
+	def get( self, name ):
+		return (self.load( name ))
+
+
+## ----------------------------------------------------------------------
+class BenchNodeCPP( MPxNodeCPP ):
+	## plain attribute instead of the shared registry lookup, so the
+	## benchmark can swap registries between runs
+	templates = None
+
+
+## ----------------------------------------------------------------------
+def build_nodes( count, plugs ):
+	nodes = [ ]
+
+	for index in range( count ):
+		node = BenchNodeCPP( 'BenchNode%d' % index, 'bn_node%d' % index, 0x100000 + index,
+						'outValue0 = input0 * input1;\n' )
+		for plug in range( plugs ):
+			node.add_input_plug( 'input%d' % plug, 0.0 )
+		node.add_output_plug( 'outValue0', 0.0 )
+		nodes.append( node )
+
+	return (nodes)
+
+def generate( nodes ):
+	for node in nodes:
+		node.generate_include( )
+		node.generate_class( )
+		node.generate_node_main( )
+
+def measure( nodes, registry, repeat ):
+	for node in nodes:
+		node.templates = registry
+	best = min( timeit.repeat( lambda: generate( nodes ), number=1, repeat=repeat ) )
+	return (best / len( nodes ))
+
+
+## ----------------------------------------------------------------------
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser( description='Template registry benchmark.' )
+	parser.add_argument( '-nodes', type=int, default=1800 )
+	parser.add_argument( '-plugs', type=int, default=4 )
+	parser.add_argument( '-repeat', type=int, default=5 )
+	args = parser.parse_args( )
+
+	nodes = build_nodes( args.nodes, args.plugs )
+
+	before = measure( nodes, UncachedRegistry( ), args.repeat )
+	after  = measure( nodes, get_registry( ), args.repeat )
+
+	print( "nodes: %d, plugs per node: %d" % (args.nodes, args.plugs) )
+	print( "  per-file reads : %8.1f us/node" % (before * 1e6) )
+	print( "  registry       : %8.1f us/node" % (after * 1e6) )
+	print( "  speedup        : %8.2fx" % (before / after) )
@@ -0,0 +1,103 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+SYNTHETIC.PY
+
+Builds synthetic plugin specs in the examples/test_plugin.json format
+for benchmarking the generators at sizes no real plugin has yet.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import random
+
+## ----------------------------------------------------------------------
+
+## plug types the generators can currently create
+default_mix = 'float:1,angle:1,matrix:1'
+
+
+## ----------------------------------------------------------------------
+def parse_mix( mix ):
+	"""
+	Parses a plug type mix such as 'float', 'float:3,matrix:1' or 'mixed'.
+	:return: list of (type, weight) pairs.
+	"""
+	if mix == 'mixed':
+		mix = default_mix
+
+	result = [ ]
+	for item in mix.split( ',' ):
+		name, _, weight = item.partition( ':' )
+		result.append( (name.strip( ), float( weight ) if weight else 1.0) )
+
+	return (result)
+
+def plug_types( count, mix, rng ):
+	"""
+	Picks plug types for a node so the totals follow the mix exactly
+	(rounded), then shuffles them.
+	"""
+	pairs = parse_mix( mix )
+	total = sum( weight for _, weight in pairs )
+
+	result = [ ]
+	for name, weight in pairs:
+		result.extend( [ name ] * int( round( count * weight / total ) ) )
+
+	while len( result ) < count:
+		result.append( pairs[0][0] )
+	del result[count:]
+
+	rng.shuffle( result )
+	return (result)
+
+def plug_data( aType ):
+	data = { 'default': 0 if aType == 'matrix' else 0.0 }
+	if aType != 'float':
+		data['type'] = aType
+	return (data)
+
+def make_spec( nodes, plugs, mix=default_mix, outputs=None, seed=1 ):
+	"""
+	Builds a synthetic plugin spec.
+	:param nodes: Number of nodes.
+	:param plugs: Plugs per node, inputs and outputs together.
+	:param mix: Plug type mix; see parse_mix().
+	:param outputs: Outputs per node. Defaults to a quarter of the plugs.
+	:param seed: Seed for the type shuffle, so specs are reproducible.
+	:return: dict ready for Plugin.from_json().
+	"""
+	rng = random.Random( seed )
+	outputs = outputs or max( 1, plugs // 4 )
+	inputs = max( 1, plugs - outputs )
+
+	result = {
+		'name':    'synthetic_%d_%d' % (nodes, plugs),
+		'author':  'nodesmith',
+		'version': 'bench',
+		'constants': { 'BENCH_SCALE': 2 },
+		'nodes':   { },
+	}
+
+	for index in range( nodes ):
+		types = plug_types( inputs + outputs, mix, rng )
+
+		node = {
+			'node_name':  'bn_node%d' % index,
+			'id':         '0x%06x' % (0x100000 + index),
+			'expression': 'out0 = in0',
+			'inputs':     { },
+			'outputs':    { },
+		}
+
+		for plug in range( inputs ):
+			node['inputs']['in%d' % plug] = plug_data( types[plug] )
+		for plug in range( outputs ):
+			node['outputs']['out%d' % plug] = plug_data( types[inputs + plug] )
+
+		result['nodes']['BenchNode%d' % index] = node
+
+	return (result)
@@ -0,0 +1,235 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+BUILDPROFILES.PY
+
+Named optimization profiles for the generated CMake project. A profile
+sets the optimization level, debug info, link-time optimization and
+profile-guided optimization; the target architecture and fast math can
+be set for the whole plugin or per profile. Every profile is written to
+CMakeLists.txt with the flags of each compiler, and one is picked at
+configure time with -DNODESMITH_PROFILE=<name>.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import re
+from collections import OrderedDict
+
+## ----------------------------------------------------------------------
+
+## profile settings and their defaults
+profile_keys = {
+	'optimize'  : 3,        ## 0, 1, 2 or 3
+	'debug'     : True,     ## debug info
+	'lto'       : False,    ## link-time optimization
+	'pgo'       : None,     ## None, 'instrument' or 'use'
+	'arch'      : None,     ## see arch_flags; None leaves the compiler default
+	'fast_math' : False,
+}
+
+builtin_profiles = OrderedDict( [
+	( 'debug',          { 'optimize': 0, 'debug': True } ),
+	( 'release',        { 'optimize': 3, 'debug': True } ),
+	( 'release-lto',    { 'optimize': 3, 'debug': True, 'lto': True } ),
+	( 'pgo-instrument', { 'optimize': 2, 'debug': True, 'pgo': 'instrument' } ),
+	( 'pgo-use',        { 'optimize': 3, 'debug': True, 'lto': True, 'pgo': 'use' } ),
+] )
+
+default_profile = 'release'
+
+## arch name -> (gcc/clang flags, msvc flags). Other names are passed to
+## gcc and clang as -march and ignored by msvc.
+arch_flags = {
+	'native' : ( [ '-march=native' ], [ ] ),
+	'sse4.2' : ( [ '-msse4.2' ], [ ] ),
+	'avx'    : ( [ '-mavx' ], [ '/arch:AVX' ] ),
+	'avx2'   : ( [ '-mavx2', '-mfma' ], [ '/arch:AVX2' ] ),
+	'avx512' : ( [ '-mavx512f', '-mavx512dq', '-mavx512bw', '-mavx512vl' ], [ '/arch:AVX512' ] ),
+}
+
+## -march names, e.g. x86-64-v3, skylake-avx512 or armv8.2-a+crypto; they
+## go unquoted into CMakeLists.txt, so nothing else gets through
+p_arch = re.compile( r'[A-Za-z0-9][A-Za-z0-9_.+-]*$' )
+
+profile_block_code = """
+## build profiles: {names}
+## pick one with -DNODESMITH_PROFILE=<name>
+set( NODESMITH_PROFILE "{default}" CACHE STRING "nodesmith build profile" )
+set_property( CACHE NODESMITH_PROFILE PROPERTY STRINGS {names} )
+set( NODESMITH_PGO_DIR "${{CMAKE_CURRENT_SOURCE_DIR}}/pgo" CACHE PATH "Profile data of the pgo profiles" )
+
+{branches}else()
+	message( FATAL_ERROR "Unknown build profile '${{NODESMITH_PROFILE}}'." )
+endif()
+"""
+
+profile_branch_code = """{keyword}( NODESMITH_PROFILE STREQUAL "{name}" )
+	if( MSVC )
+{msvc}	else()
+{gcc}	endif()
+"""
+
+
+## ----------------------------------------------------------------------
+class BuildProfileException( Exception ):
+	pass
+
+
+## ----------------------------------------------------------------------
+def resolve_profiles( data=None ):
+	"""
+	Builds the full profile table from the 'build' object of a plugin spec.
+	:param data: dict with optional 'profile' (default profile name),
+		'arch', 'fast_math' and 'profiles' (name -> settings; a 'base'
+		setting names the profile it starts from, 'release' by default).
+	:return: (OrderedDict of name -> settings, default profile name).
+	"""
+	data = dict( data or {} )
+
+	defaults = dict( profile_keys )
+	for key in 'arch', 'fast_math':
+		if key in data:
+			defaults[key] = data.pop( key )
+
+	default = data.pop( 'profile', default_profile )
+	custom = data.pop( 'profiles', {} )
+
+	if data:
+		raise BuildProfileException( "unknown build setting(s): %s" % ', '.join( sorted( data ) ) )
+
+	if not isinstance( custom, dict ):
+		raise BuildProfileException( "'profiles' is not a dictionary." )
+
+	profiles = OrderedDict()
+	for name, settings in builtin_profiles.items():
+		profiles[name] = dict( defaults, **settings )
+
+	for name in sorted( custom ):
+		settings = dict( custom[name] )
+		base = settings.pop( 'base', default_profile if name not in profiles else name )
+		if base not in profiles:
+			raise BuildProfileException( "profile %s: unknown base profile '%s'." % (name, base) )
+
+		unknown = set( settings ).difference( profile_keys )
+		if unknown:
+			raise BuildProfileException( "profile %s: unknown setting(s): %s" % (name, ', '.join( sorted( unknown ) )) )
+
+		profiles[name] = dict( profiles[base], **settings )
+
+	for name, settings in profiles.items():
+		check_profile( name, settings )
+
+	if default not in profiles:
+		raise BuildProfileException( "unknown default profile '%s'." % default )
+
+	return (profiles, default)
+
+def check_profile( name, settings ):
+	if isinstance( settings['optimize'], bool ) or settings['optimize'] not in (0, 1, 2, 3):
+		raise BuildProfileException( "profile %s: 'optimize' should be 0 to 3." % name )
+
+	if settings['pgo'] not in (None, 'instrument', 'use'):
+		raise BuildProfileException( "profile %s: 'pgo' should be 'instrument' or 'use'." % name )
+
+	for key in 'debug', 'lto', 'fast_math':
+		if not isinstance( settings[key], bool ):
+			raise BuildProfileException( "profile %s: '%s' should be true or false." % (name, key) )
+
+	arch = settings['arch']
+	if arch is not None and arch not in arch_flags and not (isinstance( arch, str ) and p_arch.match( arch )):
+		raise BuildProfileException( "profile %s: 'arch' should be one of %s or a -march name (found %r)." % \
+			(name, ', '.join( sorted( arch_flags ) ), arch) )
+
+def gcc_flags( settings ):
+	"""
+	:return: (compile flags, link flags) for gcc and clang.
+	"""
+	compile_flags = [ '-O%d' % settings['optimize'] ]
+	link_flags = [ ]
+
+	if settings['debug']:
+		compile_flags.append( '-g' )
+
+	arch = settings['arch']
+	if arch:
+		compile_flags += arch_flags[arch][0] if arch in arch_flags else [ '-march=%s' % arch ]
+
+	if settings['fast_math']:
+		compile_flags.append( '-ffast-math' )
+
+	if settings['lto']:
+		compile_flags.append( '-flto' )
+		link_flags.append( '-flto' )
+
+	## clang reads <dir>/default.profdata for -fprofile-use=<dir>, so the
+	## same flags cover both compilers
+	if settings['pgo'] == 'instrument':
+		compile_flags.append( '-fprofile-generate=${NODESMITH_PGO_DIR}' )
+		link_flags.append( '-fprofile-generate=${NODESMITH_PGO_DIR}' )
+	elif settings['pgo'] == 'use':
+		compile_flags.append( '-fprofile-use=${NODESMITH_PGO_DIR}' )
+		link_flags.append( '-fprofile-use=${NODESMITH_PGO_DIR}' )
+
+	return (compile_flags, link_flags)
+
+def msvc_flags( settings ):
+	"""
+	:return: (compile flags, link flags) for msvc.
+	"""
+	compile_flags = [ [ '/Od', '/O1', '/O2', '/O2' ][settings['optimize']] ]
+	link_flags = [ ]
+
+	if settings['optimize'] == 3:
+		compile_flags.append( '/Ob2' )
+
+	if settings['debug']:
+		compile_flags.append( '/Zi' )
+
+	arch = settings['arch']
+	if arch in arch_flags:
+		compile_flags += arch_flags[arch][1]
+
+	compile_flags.append( '/fp:fast' if settings['fast_math'] else '/fp:precise' )
+
+	if settings['lto'] or settings['pgo']:
+		compile_flags.append( '/GL' )
+		link_flags.append( '/LTCG' )
+
+	if settings['pgo'] == 'instrument':
+		link_flags.append( '/GENPROFILE:PGD=${NODESMITH_PGO_DIR}/${PROJECT_NAME}.pgd' )
+	elif settings['pgo'] == 'use':
+		link_flags.append( '/USEPROFILE:PGD=${NODESMITH_PGO_DIR}/${PROJECT_NAME}.pgd' )
+
+	return (compile_flags, link_flags)
+
+def generate_flags( project_name, compile_flags, link_flags ):
+	result = '\t\ttarget_compile_options( {0} PRIVATE {1} )\n'.format( project_name, ' '.join( compile_flags ) )
+
+	if link_flags:
+		result += '\t\tset_property( TARGET {0} APPEND_STRING PROPERTY LINK_FLAGS " {1}" )\n'.format(
+			project_name, ' '.join( link_flags ) )
+
+	return (result)
+
+def generate_cmake_profiles( project_name, profiles, default ):
+	"""
+	Generates the CMake code selecting a profile and applying its flags.
+	"""
+	branches = [ ]
+
+	for index, (name, settings) in enumerate( profiles.items() ):
+		branches.append( profile_branch_code.format(
+			keyword='if' if index == 0 else 'elseif',
+			name=name,
+			msvc=generate_flags( project_name, *msvc_flags( settings ) ),
+			gcc=generate_flags( project_name, *gcc_flags( settings ) )
+		) )
+
+	return (profile_block_code.format(
+		names=' '.join( profiles.keys() ),
+		default=default,
+		branches=''.join( branches )
+	))
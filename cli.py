@@ -0,0 +1,695 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+CLI.PY
+
+Command-line interface of nodesmith, installed as the 'nodesmith'
+console script and run by 'python -m nodesmith' and main.py. Generates
+one plugin from a JSON spec, or a batch of them in one process:
+
+	nodesmith rigging.json -folder build/rigging
+	nodesmith specs/*.json -folder build/{name} -jobs 0 -report report.json
+
+A batch run loads the templates once, shares one pool of worker
+processes between every plugin and generates the plugins concurrently,
+then prints a combined status and timing report. The generator modules
+are only imported once the arguments are parsed, so -help and argument
+errors return at once.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+from __future__ import print_function
+
+import argparse, glob, json, os, sys, time
+
+## ----------------------------------------------------------------------
+
+## placeholder for the spec's file name, without extension, in -folder
+## and -archive; a batch run puts each plugin in a folder of its own
+name_field = '{name}'
+
+
+## ----------------------------------------------------------------------
+class CLIException( Exception ):
+	pass
+
+
+## ----------------------------------------------------------------------
+class Session( object ):
+	"""
+	What every plugin of one run shares: the generator fingerprint, the
+	loaded templates and the worker pools. Used as a context manager, it
+	shuts the pools down on exit.
+	"""
+
+	def __init__( self, jobs, template_dir=None ):
+		"""
+		:param jobs: Number of worker processes generating nodes, and of
+			threads writing files. 1 does everything in-process.
+		:param template_dir: Optional folder of user templates.
+		"""
+		from .manifest import generator_fingerprint
+		from .templates import get_registry
+
+		self.jobs         = jobs
+		self.template_dir = template_dir
+		self.fingerprint  = generator_fingerprint( template_dir )
+		self.node_pool    = None
+		self.write_pool   = None
+
+		## loaded before the workers are forked, so they inherit them
+		get_registry( template_dir ).preload( )
+
+		if jobs > 1:
+			from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+			self.node_pool  = ProcessPoolExecutor( max_workers=jobs )
+			self.write_pool = ThreadPoolExecutor( max_workers=jobs )
+
+			## the first task starts every worker; do it from this thread,
+			## before any plugin thread runs
+			self.node_pool.submit( int ).result( )
+
+	def close( self ):
+		for pool in self.node_pool, self.write_pool:
+			if pool is not None:
+				pool.shutdown( )
+		self.node_pool = self.write_pool = None
+
+	def __enter__( self ):
+		return (self)
+
+	def __exit__( self, exc_type, exc_value, traceback ):
+		self.close( )
+		return (False)
+
+
+## ----------------------------------------------------------------------
+def write_file( manifest, args, name, content, protect=False ):
+	status = manifest.write( name, content, protect=protect, force=args.force )
+	return (name, status)
+
+def report_file( args, name, status, log=print ):
+	from .manifest import kKept, kUnchanged
+
+	if status == kKept:
+		log( "\t\t! %s has been edited by hand, keeping it (use -force to overwrite)." % name )
+	elif args.debug or status != kUnchanged:
+		log( "\t\t+ %s (%s)" % (name, status) )
+
+def report_node( node, warnings, log=print ):
+	for warning in warnings:
+		log( "\t! Node %s: %s" % (node.class_name, warning) )
+	log( "\t+ Writing Node: %s" % node.class_name )
+
+def write_project( args, plugin, manifest, session, nodes=None, plugin_files=True, log=print ):
+	"""
+	Generates the project and writes every new or changed file through
+	the manifest.
+	:param nodes: Optional list of class names; only these nodes are
+		generated and the manifest keeps the others as they were.
+	:param plugin_files: If False, common.h, plugin_main.cpp, the unity
+		batches, the CMake project and the harness are left as they are.
+	:param log: Callable taking each line of the report.
+	:return: list of the class names of the nodes that failed.
+	"""
+	from .harness import HarnessException, generate_harness_files
+
+	selected = list( plugin.nodes.values() ) if nodes is None else [ plugin.nodes[x] for x in nodes ]
+
+	if plugin_files:
+		log( "\t+ Writing common.h ..." )
+		report_file( args, *write_file( manifest, args, 'common.h', plugin.generate_common_header() ), log=log )
+
+		log( "\t+ Writing plugin_main.cpp ..." )
+		report_file( args, *write_file( manifest, args, 'plugin_main.cpp', plugin.generate_plugin_cpp() ), log=log )
+
+	stale_nodes = [ ]
+	main_code = { }
+	failed = [ ]
+
+	## the scheduling type in the header only depends on the spec and on a
+	## hand-edited main file, which never leaves a node up to date, so the
+	## spec hash alone tells whether a node has to be generated again
+	for node in selected:
+		node_files = node.file_names
+
+		if not args.force and manifest.node_current( node.class_name, node.spec_hash, node_files ):
+			manifest.keep_node( node.class_name, node.spec_hash, node_files )
+			if args.debug:
+				log( "\t+ Node %s is up to date." % node.class_name )
+			continue
+
+		stale_nodes.append( node )
+
+		## a hand-edited main file is what will be compiled, so the workers
+		## scan that for the scheduling instead of the node's code
+		if not args.force and manifest.read_hash( node.main_file_name ) not in \
+				(None, manifest.old_files.get( node.main_file_name, None )):
+			with open( os.path.join( args.folder, node.main_file_name ), 'r' ) as fp:
+				main_code[node.class_name] = fp.read()
+
+	## nodes are generated in worker processes and their files written from a
+	## thread pool; both hand results back in node order, so the report and
+	## the output do not depend on the number of jobs
+	write_pool = session.write_pool
+
+	pending = [ ]
+
+	## a scheduling the scan rules out fails the node like any other
+	## generation error
+	for node, files, warnings, error in plugin.generate_nodes( stale_nodes, jobs=session.jobs,
+															   pool=session.node_pool, main_code=main_code ):
+		if error is not None:
+			log( "\t! Node %s failed: %s" % (node.class_name, error) )
+			failed.append( node.class_name )
+			continue
+
+		manifest.set_node( node.class_name, node.spec_hash )
+
+		writes = [ ]
+		for name, content in files:
+			## the main file holds the hand-written compute, so never clobber edits
+			protect = name == node.main_file_name
+			if write_pool is None:
+				writes.append( write_file( manifest, args, name, content, protect ) )
+			else:
+				writes.append( write_pool.submit( write_file, manifest, args, name, content, protect ) )
+
+		if write_pool is None:
+			report_node( node, warnings, log=log )
+			for result in writes:
+				report_file( args, *result, log=log )
+		else:
+			pending.append( (node, warnings, writes) )
+
+	for node, warnings, writes in pending:
+		report_node( node, warnings, log=log )
+		for future in writes:
+			report_file( args, *future.result(), log=log )
+
+	unity_files = plugin.generate_unity_files() if plugin_files else [ ]
+	if unity_files:
+		log( "\t+ Writing %d unity batches ..." % len( unity_files ) )
+		for name, content in unity_files:
+			report_file( args, *write_file( manifest, args, name, content ), log=log )
+
+	if args.cmake and plugin_files:
+		log( "\t+ Writing CMake project ..." )
+		report_file( args, *write_file( manifest, args, 'CMakeLists.txt', plugin.generate_plugin_cmake() ), log=log )
+
+	if args.harness and plugin_files:
+		try:
+			harness_files, skipped = generate_harness_files( plugin )
+		except HarnessException as e:
+			log( "\t! No benchmark harness written: %s" % e )
+		else:
+			log( "\t+ Writing benchmark harness ..." )
+			for name in skipped:
+				log( "\t\t! Node %s has plugs the harness cannot fill, skipping it." % name )
+			for name, content in harness_files:
+				report_file( args, *write_file( manifest, args, name, content ), log=log )
+
+	if nodes is not None or not plugin_files:
+		manifest.keep_rest()
+
+	return (failed)
+
+def write_archive( args, plugin, session, log=print ):
+	"""
+	Writes the whole project to a zip or tar archive instead of a folder.
+	:return: the number of files written.
+	"""
+	from .harness import HarnessException, generate_harness_files
+	from .writers import ArchiveWriter
+
+	log( "+ Writing archive '%s'." % args.archive )
+
+	with ArchiveWriter( args.archive ) as writer:
+		count = writer.write_all( plugin.generate_all( jobs=session.jobs, cmake=args.cmake, pool=session.node_pool ) )
+		if args.harness:
+			try:
+				count += writer.write_all( generate_harness_files( plugin )[0] )
+			except HarnessException as e:
+				log( "\t! No benchmark harness written: %s" % e )
+
+	log( "+ Files: %d written." % count )
+
+	return (count)
+
+def load_plugin( args, only=None, index=None, previous=None ):
+	"""
+	Loads the spec and applies the command-line overrides.
+	:raises SpecException, PluginException: on a bad spec.
+	"""
+	from .plugin import Plugin, PluginException
+	from .spec import load_spec
+
+	plugin = Plugin( template_dir=args.templates )
+	plugin.from_json( load_spec( args.filename, only=only, index=index ), previous=previous )
+
+	if args.unity is not None:
+		plugin.unity_batches = max( args.unity, 0 )
+	if args.profile is not None:
+		if args.profile not in plugin.build_profiles:
+			raise PluginException( "unknown build profile '%s' (expected one of %s)" % \
+				(args.profile, ', '.join( plugin.build_profiles.keys() )) )
+		plugin.build_profile = args.profile
+
+	return (plugin)
+
+def run_project( args, plugin, session, nodes=None, plugin_files=True, index=None, log=print ):
+	"""
+	Writes the project to -folder through a staging folder and reports
+	what changed; see write_project(). The report of the files is held
+	back until they are in place, so a failed run only reports its errors.
+	:param index: Optional spec.SpecIndex the spec was loaded with; it is
+		saved along with the files.
+	:return: tuple of the list of the class names of the nodes that
+		failed, in which case nothing was written, and the manifest's
+		summary of the files, or None if nothing was written.
+	"""
+	from .manifest import Manifest, kAdded, kChanged, kKept, kUnchanged
+	from .writers import AtomicDirectoryWriter
+
+	log( "+ Writing output to '%s'." % args.folder )
+
+	lines = [ ]
+	writer = AtomicDirectoryWriter( args.folder )
+	with writer:
+		manifest = Manifest( args.folder, session.fingerprint, writer=writer )
+		failed = write_project( args, plugin, manifest, session, nodes=nodes, plugin_files=plugin_files,
+								log=lines.append )
+
+		## nothing is moved into place unless every node made it
+		if failed:
+			writer.abort()
+		else:
+			manifest.remove_files( force=args.force )
+			manifest.save()
+			if index is not None:
+				index.save( writer )
+
+	if failed:
+		## the files were thrown away, so their states would be misleading
+		for line in lines:
+			if line.lstrip().startswith( '!' ):
+				log( line )
+		log( "!! Project generation failed for %d node(s), nothing was written: %s" % \
+			(len( failed ), ', '.join( failed )) )
+		return (failed, None)
+
+	for line in lines:
+		log( line )
+
+	summary = manifest.summary()
+
+	for key, label in [ ('nodes_added', 'Nodes added'), ('nodes_changed', 'Nodes changed'),
+						('nodes_removed', 'Nodes removed'), ('removed', 'Files removed'),
+						('left', 'Files no longer generated but edited by hand, left in place') ]:
+		if summary[key]:
+			log( "+ %s: %s" % (label, ', '.join( summary[key] )) )
+
+	log( "+ Files: %d added, %d changed, %d unchanged, %d kept, %d removed." % (
+		len( summary[kAdded] ), len( summary[kChanged] ), len( summary[kUnchanged] ),
+		len( summary[kKept] ), len( summary['removed'] ) ) )
+
+	return (failed, summary)
+
+def watch_project( args, session ):
+	"""
+	Regenerates the project whenever the spec changes, until interrupted.
+	"""
+	from .plugin import PluginException
+	from .spec import SpecException, SpecIndex
+	from .watch import SpecWatcher, changed_nodes
+
+	index = SpecIndex( os.path.dirname( os.path.abspath( args.filename ) ), args.folder )
+	watcher = SpecWatcher( args.filename, index )
+	previous = None
+
+	print( "+ Watching '%s' (Ctrl+C to stop)." % args.filename )
+
+	try:
+		while True:
+			start = time.time()
+
+			try:
+				plugin = load_plugin( args, index=index, previous=previous )
+			except (SpecException, PluginException) as e:
+				print( "!! %s" % e )
+			else:
+				nodes = changed_nodes( previous, plugin )
+				if nodes is None or nodes:
+					print( "\nPlugin: %s (%s)" % (plugin.name, 'all nodes' if nodes is None else ', '.join( nodes )) )
+
+					## after a failure the next run compares against the last
+					## output that was written, so nothing is skipped
+					if not run_project( args, plugin, session, nodes=nodes, index=index )[0]:
+						previous = plugin
+						print( "++ Regenerated in %.0f ms." % ((time.time() - start) * 1000.0) )
+				else:
+					previous = plugin
+
+			watcher.wait()
+	except KeyboardInterrupt:
+		print( "\n++ Stopped watching." )
+
+
+## ----------------------------------------------------------------------
+def expand_specs( patterns ):
+	"""
+	:param patterns: Spec files and glob patterns, which are expanded here
+		too for shells that leave them be.
+	:return: list of spec paths in the order given, without duplicates.
+	:raises CLIException: if a file is missing or a pattern matches nothing.
+	"""
+	result = [ ]
+	seen = set( )
+
+	for pattern in patterns:
+		if glob.has_magic( pattern ):
+			matches = sorted( glob.glob( pattern ) )
+			if not matches:
+				raise CLIException( "No spec matches %s." % pattern )
+		elif not os.path.isfile( pattern ):
+			raise CLIException( "Spec %s does not exist." % pattern )
+		else:
+			matches = [ pattern ]
+
+		for path in matches:
+			key = os.path.normcase( os.path.abspath( path ) )
+			if key not in seen:
+				seen.add( key )
+				result.append( path )
+
+	return (result)
+
+def spec_args( args, filename ):
+	"""
+	:return: a copy of the parsed arguments for one spec, with the
+		spec's name filled into -folder and -archive.
+	"""
+	name = os.path.splitext( os.path.basename( filename ) )[0]
+
+	result = argparse.Namespace( **vars( args ) )
+	result.filename = filename
+	result.folder = args.folder.replace( name_field, name )
+	if args.archive is not None:
+		result.archive = args.archive.replace( name_field, name )
+
+	return (result)
+
+def batch_plugin( args, session ):
+	"""
+	Generates one plugin of a batch run. Its report is collected rather
+	than printed, so the reports of concurrent plugins do not interleave.
+	:return: dict with the outcome and timing of the spec, and its 'log'.
+	"""
+	from .manifest import kAdded, kChanged
+	from .plugin import PluginException
+	from .spec import SpecException, SpecIndex
+	from .writers import WriterException
+
+	lines = [ ]
+	result = {
+		'spec':    args.filename,
+		'output':  args.archive if args.archive is not None else args.folder,
+		'plugin':  None,
+		'status':  'ok',
+		'nodes':   0,
+		'written': 0,
+		'failed':  [ ],
+		'error':   None,
+		'log':     lines,
+	}
+	start = time.time()
+
+	try:
+		## every plugin of a batch has an output folder, and so an index, of its own
+		index = SpecIndex( os.path.dirname( os.path.abspath( args.filename ) ),
+						   args.folder if args.archive is None else None )
+		plugin = load_plugin( args, index=index )
+
+		result['plugin'] = plugin.name
+		result['nodes'] = len( plugin.nodes )
+		lines.append( "Plugin: %s (%s)" % (plugin.name, args.filename) )
+
+		if args.archive is not None:
+			result['written'] = write_archive( args, plugin, session, log=lines.append )
+		else:
+			failed, summary = run_project( args, plugin, session, index=index, log=lines.append )
+			result['failed'] = failed
+			if failed:
+				result['status'] = 'failed'
+			else:
+				result['written'] = len( summary[kAdded] ) + len( summary[kChanged] ) + len( summary['removed'] )
+
+	except (SpecException, PluginException, WriterException, CLIException) as e:
+		lines.append( "!! %s: %s" % (args.filename, e) )
+		result['status'] = 'error'
+		result['error'] = str( e )
+	except Exception as e:
+		## one broken spec must not stop the rest of the batch
+		import traceback
+		lines.append( traceback.format_exc().rstrip() )
+		result['status'] = 'error'
+		result['error'] = '%s: %s' % (type( e ).__name__, e)
+
+	result['seconds'] = time.time() - start
+
+	return (result)
+
+def batch_report( results, seconds ):
+	"""
+	:return: lines of the combined report of a batch run.
+	"""
+	width = max( [ len( x['spec'] ) for x in results ] )
+	lines = [ "++ Batch report:" ]
+
+	for result in results:
+		if result['status'] == 'ok':
+			detail = "%d node(s), %d file(s) written" % (result['nodes'], result['written'])
+		elif result['status'] == 'failed':
+			detail = "node(s) failed: %s" % ', '.join( result['failed'] )
+		else:
+			detail = result['error'].splitlines()[0]
+		lines.append( "\t%-6s  %-*s  %7.2f s  %s" % (result['status'], width, result['spec'], result['seconds'], detail) )
+
+	ok = len( [ x for x in results if x['status'] == 'ok' ] )
+	lines.append( "++ %d plugin(s) in %.2f s: %d ok, %d failed." % (len( results ), seconds, ok, len( results ) - ok) )
+
+	return (lines)
+
+def run_batch( args, specs, jobs ):
+	"""
+	Generates every spec with a shared session, several at a time.
+	:return: True if every plugin was generated.
+	"""
+	from concurrent.futures import ThreadPoolExecutor, as_completed
+
+	start = time.time()
+	runs = [ spec_args( args, x ) for x in specs ]
+
+	outputs = { }
+	for run in runs:
+		output = os.path.abspath( run.archive if run.archive is not None else run.folder )
+		if output in outputs:
+			raise CLIException( "%s and %s would both be written to %s; use %s in -folder or -archive." % \
+				(outputs[output], run.filename, output, name_field) )
+		outputs[output] = run.filename
+
+	print( "+ Generating %d plugins with %d job(s)." % (len( runs ), jobs) )
+
+	results = { }
+	with Session( jobs, args.templates ) as session:
+		## the plugin threads mostly wait on the node workers and the disk
+		with ThreadPoolExecutor( max_workers=min( jobs, len( runs ) ) ) as executor:
+			futures = { }
+			for run in runs:
+				futures[executor.submit( batch_plugin, run, session )] = run.filename
+
+			for future in as_completed( futures ):
+				result = future.result()
+				results[futures[future]] = result
+				print( '\n' + '\n'.join( result['log'] ) )
+
+	results = [ results[x.filename] for x in runs ]
+	seconds = time.time() - start
+
+	print( '' )
+	for line in batch_report( results, seconds ):
+		print( line )
+
+	if args.report is not None:
+		with open( args.report, 'w' ) as fp:
+			json.dump( { 'seconds': seconds, 'jobs': jobs,
+						 'plugins': [ dict( [ (k, v) for k, v in x.items() if k != 'log' ] ) for x in results ] },
+					   fp, indent=1 )
+			fp.write( '\n' )
+
+	return (all( [ x['status'] == 'ok' for x in results ] ))
+
+def validate_specs( args, specs ):
+	"""
+	:return: True if every spec is valid.
+	"""
+	from .validate import format_errors, validate_spec
+
+	valid = True
+	for filename in specs:
+		errors = validate_spec( filename, compile_expressions=args.expressions )
+		for line in format_errors( errors ):
+			print( "\t! %s" % line )
+		if errors:
+			print( "!! %d error(s) in %s." % (len( errors ), filename) )
+			valid = False
+		else:
+			print( "++ %s is valid." % filename )
+
+	return (valid)
+
+
+## ----------------------------------------------------------------------
+def main( argv=None ):
+	print( "\n\nnodesmith.py" )
+
+	parser = argparse.ArgumentParser(
+		prog='nodesmith',
+		description='Generate a Maya plugin from an input JSON description.'
+	)
+
+	parser.add_argument( 'specs', metavar='spec', type=str, nargs='+',
+					   help='Spec file(s) or glob patterns; several specs are generated as one batch.' )
+	parser.add_argument( '-folder', metavar='folder', type=str,
+					   help='Output location. {name} is replaced by the spec file name; a batch writes '
+							'each plugin to folder/{name} unless given.', default='.' )
+	parser.add_argument( '-force', action='store_true',
+					   help='Overwrites hand-edited node main files.', default=False )
+	parser.add_argument( '-debug', metavar='debug', type=bool,
+					   help='Enable debugging information.', default=False )
+	parser.add_argument( '-templates', metavar='templates', type=str,
+					   help='Folder of user templates overriding the defaults.', default=None )
+	parser.add_argument( '-jobs', metavar='jobs', type=int,
+					   help='Number of processes generating nodes, shared by every plugin of a batch. '
+							'0 uses every core. Defaults to 1, or every core for a batch.', default=None )
+	parser.add_argument( '-unity', metavar='unity', type=int,
+					   help='Number of unity batches for the node sources; 0 turns unity builds off. '
+							'Overrides the spec.', default=None )
+	parser.add_argument( '-profile', metavar='profile', type=str,
+					   help='Default build profile of the CMake project. Overrides the spec.', default=None )
+	parser.add_argument( '-validate', action='store_true',
+					   help='Check the spec and report every error without generating anything.', default=False )
+	parser.add_argument( '-expressions', action='store_true',
+					   help='With -validate, also compile the node expressions.', default=False )
+	parser.add_argument( '-only', metavar='only', type=str,
+					   help='Comma-separated class names; only these nodes are loaded and generated, '
+							'the plugin-wide files are left as they are.', default=None )
+	parser.add_argument( '-archive', metavar='archive', type=str,
+					   help='Write the whole project to a .zip, .tar or .tar.gz file instead of -folder. '
+							'{name} is replaced as for -folder.', default=None )
+	parser.add_argument( '-watch', action='store_true',
+					   help='Keep running and regenerate the nodes whose spec changed on every save.', default=False )
+	parser.add_argument( '-harness', action='store_true',
+					   help='Also write a headless benchmark of every node_main() to harness/.', default=False )
+	parser.add_argument( '-report', metavar='report', type=str,
+					   help='With several specs, also write the batch report to this JSON file.', default=None )
+	parser.add_argument( '-cmake', metavar='cmake', type=bool,
+					   help='Create a CMakeListst.txt file with the build.', default=True )
+
+	args = parser.parse_args( argv )
+
+	try:
+		specs = expand_specs( args.specs )
+	except CLIException as e:
+		parser.error( str( e ) )
+
+	batch = len( specs ) > 1
+
+	if args.jobs is None:
+		args.jobs = 0 if batch else 1
+
+	import multiprocessing
+	jobs = args.jobs if args.jobs > 0 else multiprocessing.cpu_count()
+
+	if args.validate:
+		if not validate_specs( args, specs ):
+			sys.exit(1)
+		return
+
+	only = None
+	if args.only is not None:
+		only = [ x.strip() for x in args.only.split( ',' ) if x.strip() ]
+
+	if args.watch and (only is not None or args.archive is not None):
+		parser.error( "-watch cannot be combined with -only or -archive" )
+	if args.archive is not None and only is not None:
+		parser.error( "-only cannot be combined with -archive" )
+
+	if batch:
+		if args.watch or only is not None:
+			parser.error( "-watch and -only take a single spec" )
+		if args.archive is not None and name_field not in args.archive:
+			parser.error( "-archive needs %s with several specs" % name_field )
+		if name_field not in args.folder:
+			args.folder = os.path.join( args.folder, name_field )
+
+		from .templates import TemplateException
+
+		try:
+			if not run_batch( args, specs, jobs ):
+				sys.exit(1)
+		except (CLIException, TemplateException) as e:
+			print( "!! %s" % e )
+			sys.exit(1)
+		return
+
+	from .plugin import PluginException
+	from .spec import SpecException, SpecIndex
+	from .templates import TemplateException
+	from .writers import WriterException
+
+	args = spec_args( args, specs[0] )
+
+	try:
+		session = Session( jobs, args.templates )
+	except TemplateException as e:
+		print( "!! %s" % e )
+		sys.exit(1)
+
+	with session:
+		if args.watch:
+			watch_project( args, session )
+			return
+
+		## an archive has no folder to keep the spec index in
+		index = SpecIndex( os.path.dirname( os.path.abspath( args.filename ) ),
+						   args.folder if args.archive is None else None )
+
+		try:
+			plugin = load_plugin( args, only=only, index=index )
+		except (SpecException, PluginException) as e:
+			print( "!! %s" % e )
+			sys.exit(1)
+
+		print("Plugin: %s\n" % plugin.name )
+
+		if args.archive is not None:
+			try:
+				write_archive( args, plugin, session )
+			except (PluginException, WriterException) as e:
+				print( "!! %s" % e )
+				sys.exit(1)
+			print( "++ Project generation complete." )
+			return
+
+		## the plugin-wide files need every node, so a partial run leaves them be
+		if only is not None:
+			print( "\t+ Generating only %s; plugin-wide files are left as they are." % ', '.join( only ) )
+
+		if run_project( args, plugin, session, plugin_files=only is None, index=index )[0]:
+			sys.exit(1)
+
+	print( "++ Project generation complete." )
@@ -17,51 +17,25 @@
 
 #include <algorithm>
 #include <cmath>
-#include <cstdarg>
-#include <iostream>
-#include <map>
-#include <numeric>
-#include <set>
 #include <string>
 #include <vector>
 
-#include <maya/MFnData.h>
+// only what every node uses; each node header adds the Maya headers its
+// plug types need
 #include <maya/MGlobal.h>
 #include <maya/MPxNode.h>
 
-#include <maya/MAngle.h>
-#include <maya/MEulerRotation.h>
-#include <maya/MFloatVector.h>
-#include <maya/MFloatMatrix.h>
 #include <maya/MMatrix.h>
-#include <maya/MPoint.h>
-#include <maya/MPointArray.h>
-#include <maya/MQuaternion.h>
+#include <maya/MObject.h>
+#include <maya/MPlug.h>
+#include <maya/MPlugArray.h>
+#include <maya/MStatus.h>
 #include <maya/MString.h>
 #include <maya/MTypeId.h>
-#include <maya/MVector.h>
-#include <maya/MVectorArray.h>
 
-#include <maya/MArrayDataBuilder.h>
-#include <maya/MArrayDataHandle.h>
 #include <maya/MDataBlock.h>
 #include <maya/MDataHandle.h>
 
-#include <maya/MFnCompoundAttribute.h>
-#include <maya/MFnEnumAttribute.h>
-#include <maya/MFnUnitAttribute.h>
-#include <maya/MFnMatrixAttribute.h>
-#include <maya/MFnMatrixData.h>
-#include <maya/MFnNumericAttribute.h>
-#include <maya/MFnNumericData.h>
-#include <maya/MFnNurbsSurfaceData.h>
-#include <maya/MRampAttribute.h>
-#include <maya/MFnTypedAttribute.h>
-
-#include <maya/MFnNurbsSurface.h>
-
-#include <maya/MThreadUtils.h>
-
 #define PLG_AUTHOR  "{author}"
 #define PLG_VERSION "{version}"
 
@@ -73,5 +47,5 @@
 
 {constants}
 
-#endif
+{helpers}#endif
 
@@ -0,0 +1,159 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+DEFORMER.PY
+
+Generates MPxDeformerNode C++ subclasses, for nodes with "kind":
+"deformer" in the spec. A deformer has inputs like any node but no
+outputs of its own; Maya calls deform() with the points of each
+geometry it deforms. The generated deform() reads all the points at
+once, gathers their painted weights scaled by the envelope into a
+buffer in the same order, runs deform_point(), the deformer's
+node_main(), over the points in chunks across Maya's thread pool,
+blends each point toward its result by its weight and writes them all
+back with one setAllPositions().
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import re
+
+from .expression import Symbol, kPoint, kScalar, plug_kinds
+from .mpxnode import MPxNodeCPP, MPxNodeCPPException
+from .threadsafety import scheduling_values
+
+## ----------------------------------------------------------------------
+
+## attributes every deformer already has, and the names deform_point()
+## uses itself; none of them can be an input
+reserved_names = ( 'envelope', 'input', 'inputGeom', 'outputGeom', 'groupId', 'weightList',
+	'weights', 'point', 'index', 'local_to_world', 'point_indices', 'point_weights', 'weight_by_index' )
+
+## MProfiler instrumentation for deform(), emitted only for profiled nodes
+profile_deform_code = """	MProfilingScope profile_deform(plugin_profiler_category, MProfiler::kColorC_L1,
+			"{class_name}", "deform");
+
+"""
+profile_points_begin_code = """	const int profile_points = MProfiler::eventBegin(plugin_profiler_category, MProfiler::kColorE_L2,
+			"{class_name}", "deform_point");
+"""
+profile_points_end_code = """	MProfiler::eventEnd(profile_points);
+"""
+
+p_indent = re.compile( r'^\t', re.M )
+
+
+## ----------------------------------------------------------------------
+class MPxDeformerCPP(MPxNodeCPP):
+	"""
+	Generator for one deformer node. The plugs, expressions, ramps and
+	scheduling work as in MPxNodeCPP; outputs and memoize do not apply.
+	"""
+
+	kind = 'deformer'
+	registration_type = 'MPxNode::kDeformerNode'
+
+	def add_plug( self, plug, default, is_input, type='float', min=None, max=None, **kwargs ):
+		if not is_input:
+			raise MPxNodeCPPException( "Node %s: a deformer has no outputs besides its deformed geometry (found %s)." % \
+				(self.class_name, plug) )
+		if plug in reserved_names:
+			raise MPxNodeCPPException( "Node %s: input name %s is reserved in deformers." % (self.class_name, plug) )
+
+		return( MPxNodeCPP.add_plug( self, plug, default, is_input, type=type, min=min, max=max, **kwargs ) )
+
+	def required_includes(self):
+		return( sorted( set( MPxNodeCPP.required_includes(self) ).union( [ 'maya/MPxDeformerNode.h',
+				'maya/MItGeometry.h', 'maya/MPointArray.h', 'maya/MPoint.h' ] ) ) )
+
+	def required_helpers(self):
+		result = set( [ 'parallel_for' ] )
+		if self.profile:
+			result.add( 'profiler' )
+		if any( [ x.type == 'ramp' for x in self.inputs ] ):
+			result.add( 'ramp_table' )
+		return( result )
+
+	def is_array_expression(self):
+		"""
+		deform_point() works on one point, so the expression is never
+		element-wise; array inputs are left to raw code.
+		"""
+		return( False )
+
+	def expression_symbols(self, element_wise=False):
+		"""
+		:return: dict of name to expression Symbol: the scalar inputs, the
+			point being deformed, which the expression may assign, and its
+			component index.
+		"""
+		result = {}
+
+		for plug in self.inputs:
+			kind = plug_kinds.get( plug.type, None )
+			if kind is None or plug.array:
+				continue
+			result[plug.name] = Symbol( plug.name, kind )
+
+		result['point'] = Symbol( 'point', kPoint, writable=True )
+		result['index'] = Symbol( 'index', kScalar, code='double(index)' )
+
+		return( result )
+
+	def generate_include(self):
+		if self.scheduling_type is None:
+			self.check_scheduling()
+
+		return( self.templates.render( 'deformer_template.h',
+			class_name=self.class_name,
+			includes=self.generate_includes(),
+			scheduling=scheduling_values[self.scheduling_type],
+			inputs=self.generate_header_attributes( inputs=True ),
+			private_variables=self.generate_private_variables()
+		) )
+
+	def generate_attribute_affects(self):
+		result = [ '\t// every input affects the deformed geometry\n' ]
+		for plug in self.sorted_inputs:
+			result.append( '\tCHECK_MSTATUS_AND_RETURN_IT( attributeAffects({input}, outputGeom) );\n'.format(
+				input=plug.attr_name ) )
+
+		return( ''.join(result) )
+
+	def generate_class(self):
+		profile = dict( profile_deform='', profile_points_begin='', profile_points_end='' )
+		if self.profile:
+			profile = dict(
+				profile_deform=profile_deform_code.format( class_name=self.class_name ),
+				profile_points_begin=profile_points_begin_code.format( class_name=self.class_name ),
+				profile_points_end=profile_points_end_code
+			)
+
+		return( self.templates.render( 'deformer_template.cpp',
+			typeID=self.typeID,
+			header_name=self.class_name,
+			class_name=self.class_name,
+			node_name=self.node_name,
+			static_input_attributes=self.generate_cpp_static_attributes( inputs=True ),
+			constants=self.generate_cpp_constants(),
+			## the collection code is indented for a compute() branch
+			input_collection=p_indent.sub( '', self.generate_cpp_collect_inputs() ),
+			threshold=self.parallel_threshold,
+			attribute_creation_inputs=self.generate_cpp_attrib_creation(True),
+			attribute_affects=self.generate_attribute_affects(),
+			attribute_editor_parameters=self.generate_ae_parameters(),
+			attribute_function_sets=self.generate_attribute_fn_sets(),
+			dependents_dirty=self.generate_cpp_dependents_dirty(),
+			post_constructor=self.generate_cpp_post_constructor(),
+			**profile
+		) )
+
+	def generate_node_main(self):
+		return( self.templates.render( 'deformer_template_main.cpp',
+			header_name=self.class_name,
+			class_name=self.class_name,
+			node_name=self.node_name,
+			expression=self.generate_expression()
+		) )
@@ -0,0 +1,147 @@
+// ----------------------------------------------------------------------
+
+#include "common.h"
+#include "{header_name}.h"
+
+// ----------------------------------------------------------------------
+
+MTypeId {class_name}::id( {typeID} );
+
+// static attribute memory allocation-- inputs
+{static_input_attributes}
+const struct {{
+	MMatrix identity {{}};
+{constants}
+}} {class_name}_SS {{}}; // need to force the initializer in gcc; named per class for unity builds
+
+// ----------------------------------------------------------------------
+/*
+	class method implementations
+*/
+// ----------------------------------------------------------------------
+
+{class_name}::{class_name}()
+{{
+}}
+
+{class_name}::~{class_name}()
+{{
+}}
+
+// ----------------------------------------------------------------------
+MStatus {class_name}::setDependentsDirty( const MPlug &plugBeingDirtied, MPlugArray &affectedPlugs )
+{{
+{dependents_dirty}	return MStatus::kSuccess;
+}}
+
+// ----------------------------------------------------------------------
+void {class_name}::postConstructor()
+{{
+{post_constructor}}}
+
+// ----------------------------------------------------------------------
+MStatus {class_name}::deform( MDataBlock& data, MItGeometry& iter,
+	const MMatrix& localToWorld, unsigned int multiIndex )
+{{
+	MStatus stat;
+	MObject node = thisMObject();
+
+{profile_deform}	const float env = data.inputValue( envelope ).asFloat();
+	if( env == 0.0f )
+		return MS::kSuccess;
+
+	// collect all inputs
+{input_collection}	local_to_world = localToWorld;
+
+	// read every point once, and the component index of each
+	MPointArray points;
+	CHECK_MSTATUS_AND_RETURN_IT( iter.allPositions( points ) );
+	const unsigned int count = points.length();
+	if( count == 0 )
+		return MS::kSuccess;
+
+	// the buffers are members; resize() and assign() keep their capacity
+	// from the last evaluation
+	point_indices.resize( count );
+	unsigned int k = 0;
+	for( iter.reset(); !iter.isDone() && k < count; iter.next() )
+		point_indices[k++] = (unsigned int)iter.index();
+
+	// painted weights are sparse by component index and default to 1;
+	// gathered in point order and scaled by the envelope
+	point_weights.assign( count, env );
+	MArrayDataHandle weight_lists = data.inputArrayValue( weightList, &stat );
+	if( stat && weight_lists.jumpToElement( multiIndex ) ) {{
+		MArrayDataHandle painted( weight_lists.inputValue().child( weights ) );
+		const unsigned int last = *std::max_element( point_indices.begin(), point_indices.end() );
+		weight_by_index.assign( last + 1, 1.0f );
+
+		const unsigned int painted_count = painted.elementCount();
+		for( unsigned int i = 0; i < painted_count; ++i, painted.next() ) {{
+			const unsigned int index = painted.elementIndex();
+			if( index <= last )
+				weight_by_index[index] = painted.inputValue().asFloat();
+		}}
+
+		for( k = 0; k < count; ++k )
+			point_weights[k] = weight_by_index[point_indices[k]] * env;
+	}}
+
+	// deform the points in chunks across the thread pool, blending each
+	// toward its result by its weight; MPointArray keeps them in one block
+	MPoint * __restrict positions = &points[0];
+	const float * __restrict weight = point_weights.data();
+	const unsigned int * __restrict index = point_indices.data();
+
+{profile_points_begin}	parallel_for( count, {threshold}, [=]( size_t begin, size_t end ) {{
+		for( size_t i = begin; i < end; ++i ) {{
+			if( weight[i] == 0.0f )
+				continue;
+			MPoint point = positions[i];
+			deform_point( point, index[i] );
+			positions[i] += ( point - positions[i] ) * weight[i];
+		}}
+	}} );
+{profile_points_end}
+	return iter.setAllPositions( points );
+}}
+
+
+// ----------------------------------------------------------------------
+void* {class_name}::creator()
+{{
+	return new {class_name}();
+}}
+
+
+// ----------------------------------------------------------------------
+MStatus {class_name}::initialize()
+{{
+	MStatus stat;
+
+// attribute function classes
+{attribute_function_sets}
+// input plugs
+{attribute_creation_inputs}
+{attribute_affects}
+	return MS::kSuccess;
+}}
+
+// ----------------------------------------------------------------------
+void {class_name}::aeTemplate() {{
+	const char *msg = R"(
+		global proc AE{node_name}Template(string $nodeName) {{
+			editorTemplate -beginScrollLayout;
+
+				editorTemplate -beginLayout "Parameters" -collapse 0;
+					editorTemplate -addControl "envelope";
+{attribute_editor_parameters}				editorTemplate -endLayout;
+
+				editorTemplate -addExtraControls -collapse 1;
+
+			editorTemplate -endScrollLayout;
+		}}
+	)";
+
+	MGlobal::executeCommand(msg);
+}}
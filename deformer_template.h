@@ -0,0 +1,50 @@
+#ifndef __{class_name}_H
+#define __{class_name}_H
+
+{includes}
+// ----------------------------------------------------------------------
+
+class {class_name} : public MPxDeformerNode
+{{
+private:
+{private_variables}
+	// localToWorld of the geometry being deformed
+	MMatrix local_to_world;
+
+	// deform() buffers, kept between evaluations to reuse their memory:
+	// component index and weight of each point, and the painted weights
+	// by component index
+	std::vector<unsigned int> point_indices;
+	std::vector<float> point_weights;
+	std::vector<float> weight_by_index;
+
+public:
+
+	{class_name}();
+	virtual	~{class_name}();
+
+	static  void* creator();
+	static  MStatus initialize();
+	static  void aeTemplate();
+
+	static  MTypeId id;
+
+	virtual MStatus setDependentsDirty( const MPlug &plugBeingDirtied,
+		MPlugArray &affectedPlugs );
+
+	virtual void postConstructor();
+
+	virtual MStatus deform( MDataBlock& data, MItGeometry& iter,
+		const MMatrix& localToWorld, unsigned int multiIndex );
+
+	virtual SchedulingType schedulingType() const {{ return {scheduling}; }};
+
+	// this is the real deform function, called once per point from
+	// several threads at once
+	void deform_point( MPoint &point, unsigned int index ) const;
+
+	// inputs
+{inputs}
+}};
+
+#endif
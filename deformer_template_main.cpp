@@ -0,0 +1,15 @@
+// ----------------------------------------------------------------------
+
+#include "common.h"
+#include "{header_name}.h"
+
+// ----------------------------------------------------------------------
+// Moves one point, in the local space of its geometry; deform() blends
+// the result by the point's weight and the envelope. Called from several
+// threads at once, so it may only read the node's members.
+
+void {class_name}::deform_point( MPoint &point, unsigned int index ) const
+{{
+	// non-generated code goes here
+	{expression}
+}}
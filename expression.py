@@ -0,0 +1,726 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+EXPRESSION.PY
+
+A small expression language for the 'expression' field of node specs.
+Expressions are parsed to an AST and checked against the node's plug
+types at generation time, constants from the spec are folded, repeated
+subexpressions are hoisted into locals, and the result is emitted as
+C++ for node_main().
+
+Syntax: statements of the form  target = expression  separated by ';'
+or newlines. Targets are output plugs or new local names. Operators are
++ - * / (with the Maya meanings for vectors and matrices, so * between
+two vectors is a dot product), ^ for the cross product, unary -, calls
+and .x/.y/.z component access. A ramp input is called like a function
+of a scalar position, e.g. falloff(distance).
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import math, re
+
+## ----------------------------------------------------------------------
+
+## value kinds the type checker knows about
+kScalar  = 'scalar'
+kVector  = 'vector'
+kFVector = 'fvector'
+kPoint   = 'point'
+kMatrix  = 'matrix'
+kRamp    = 'ramp'      ## only callable, see Compiler.check_call()
+
+## plug type -> value kind
+plug_kinds = {
+	'short'    : kScalar,
+	'float'    : kScalar,
+	'double'   : kScalar,
+	'bool'     : kScalar,
+	'unit'     : kScalar,
+	'angle'    : kScalar,
+	'float3'   : kFVector,
+	'double3'  : kVector,
+	'angle3'   : kVector,
+	'point'    : kPoint,
+	'matrix'   : kMatrix,
+	'ramp'     : kRamp,
+}
+
+## binary operator typing: (op, left, right) -> result
+binary_kinds = {
+	('+', kScalar, kScalar)   : kScalar,
+	('-', kScalar, kScalar)   : kScalar,
+	('*', kScalar, kScalar)   : kScalar,
+	('/', kScalar, kScalar)   : kScalar,
+
+	('+', kVector, kVector)   : kVector,
+	('-', kVector, kVector)   : kVector,
+	('*', kVector, kVector)   : kScalar,
+	('^', kVector, kVector)   : kVector,
+	('*', kVector, kScalar)   : kVector,
+	('*', kScalar, kVector)   : kVector,
+	('/', kVector, kScalar)   : kVector,
+	('*', kVector, kMatrix)   : kVector,
+
+	('+', kFVector, kFVector) : kFVector,
+	('-', kFVector, kFVector) : kFVector,
+	('*', kFVector, kFVector) : kScalar,
+	('^', kFVector, kFVector) : kFVector,
+	('*', kFVector, kScalar)  : kFVector,
+	('*', kScalar, kFVector)  : kFVector,
+	('/', kFVector, kScalar)  : kFVector,
+
+	('+', kPoint, kVector)    : kPoint,
+	('-', kPoint, kVector)    : kPoint,
+	('-', kPoint, kPoint)     : kVector,
+	('*', kPoint, kScalar)    : kPoint,
+	('*', kPoint, kMatrix)    : kPoint,
+
+	('+', kMatrix, kMatrix)   : kMatrix,
+	('*', kMatrix, kMatrix)   : kMatrix,
+	('*', kMatrix, kScalar)   : kMatrix,
+}
+
+## name -> (argument kinds, result kind, C++ format, Python fold or None).
+## A None argument kind accepts any kind; None result means "same as the
+## first argument".
+functions = {
+	'sin'       : ( (kScalar,), kScalar, 'std::sin({0})', math.sin ),
+	'cos'       : ( (kScalar,), kScalar, 'std::cos({0})', math.cos ),
+	'tan'       : ( (kScalar,), kScalar, 'std::tan({0})', math.tan ),
+	'asin'      : ( (kScalar,), kScalar, 'std::asin({0})', math.asin ),
+	'acos'      : ( (kScalar,), kScalar, 'std::acos({0})', math.acos ),
+	'atan'      : ( (kScalar,), kScalar, 'std::atan({0})', math.atan ),
+	'atan2'     : ( (kScalar, kScalar), kScalar, 'std::atan2({0}, {1})', math.atan2 ),
+	'exp'       : ( (kScalar,), kScalar, 'std::exp({0})', math.exp ),
+	'log'       : ( (kScalar,), kScalar, 'std::log({0})', math.log ),
+	'sqrt'      : ( (kScalar,), kScalar, 'std::sqrt({0})', math.sqrt ),
+	'floor'     : ( (kScalar,), kScalar, 'std::floor({0})', math.floor ),
+	'ceil'      : ( (kScalar,), kScalar, 'std::ceil({0})', math.ceil ),
+	'abs'       : ( (kScalar,), kScalar, 'std::abs({0})', abs ),
+	'pow'       : ( (kScalar, kScalar), kScalar, 'std::pow({0}, {1})', math.pow ),
+	'min'       : ( (kScalar, kScalar), kScalar, 'std::fmin({0}, {1})', min ),
+	'max'       : ( (kScalar, kScalar), kScalar, 'std::fmax({0}, {1})', max ),
+	'clamp'     : ( (kScalar, kScalar, kScalar), kScalar, 'std::fmin(std::fmax({0}, {1}), {2})',
+					lambda x, lo, hi: min( max( x, lo ), hi ) ),
+
+	'length'    : ( (None,), kScalar, '{0}.length()', None ),
+	'normal'    : ( (None,), None, '{0}.normal()', None ),
+	'inverse'   : ( (kMatrix,), kMatrix, '{0}.inverse()', None ),
+	'transpose' : ( (kMatrix,), kMatrix, '{0}.transpose()', None ),
+	'vector'    : ( (kScalar, kScalar, kScalar), kVector, 'MVector({0}, {1}, {2})', None ),
+	'fvector'   : ( (kScalar, kScalar, kScalar), kFVector, 'MFloatVector({0}, {1}, {2})', None ),
+	'point'     : ( (kScalar, kScalar, kScalar), kPoint, 'MPoint({0}, {1}, {2})', None ),
+}
+
+## functions rewritten into plain arithmetic before checking, so the
+## result takes part in folding and subexpression elimination
+rewrites = {
+	'RAD2DEG' : 1,
+	'DEG2RAD' : 1,
+	'dot'     : 2,
+	'cross'   : 2,
+	'lerp'    : 3,
+}
+
+## constants always available
+builtin_constants = {
+	'M_PI' : math.pi,
+}
+
+components = ( 'x', 'y', 'z' )
+
+## binding power of each binary operator
+precedence = {
+	'+' : 1,
+	'-' : 1,
+	'*' : 2,
+	'/' : 2,
+	'^' : 2,
+}
+
+p_token = re.compile( r'[ \t\r\f\v]*(?:'
+	r'(?P<number>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)[fF]?|'
+	r'(?P<name>[A-Za-z_]\w*)|'
+	r'(?P<op>[-+*/^(),.=;])|'
+	r'(?P<newline>\n)|'
+	r'(?P<error>\S))' )
+
+
+## ----------------------------------------------------------------------
+class ExpressionException( Exception ):
+	pass
+
+
+## ----------------------------------------------------------------------
+class Symbol( object ):
+	__slots__ = ( 'name', 'kind', 'code', 'writable', 'varying' )
+
+	def __init__( self, name, kind, code=None, writable=False, varying=False ):
+		"""
+		A name an expression can refer to.
+		:param name: Name as written in the expression.
+		:param kind: Value kind, one of the k* constants.
+		:param code: C++ to emit for it. Defaults to the name.
+		:param writable: True for outputs, which may be assigned once.
+		:param varying: True if the value changes per element of an
+			element-wise loop.
+		"""
+		self.name     = name
+		self.kind     = kind
+		self.code     = code if code is not None else name
+		self.writable = writable
+		self.varying  = varying
+
+
+## ----------------------------------------------------------------------
+class Node( object ):
+	"""
+	AST node. op is 'num', 'name', 'neg', 'call', 'member' or a binary
+	operator; args holds the children.
+	"""
+	__slots__ = ( 'op', 'args', 'value', 'kind', 'varying', 'key' )
+
+	def __init__( self, op, args=(), value=None ):
+		self.op      = op
+		self.args    = list( args )
+		self.value   = value
+		self.kind    = None
+		self.varying = False
+		self.key     = None
+
+
+## ----------------------------------------------------------------------
+class Parser( object ):
+
+	def __init__( self, text ):
+		self.text = text
+		self.tokens = self.tokenize( text )
+		self.position = 0
+
+	def error( self, message, token=None ):
+		token = token or self.peek( )
+		column = token[2]
+		line = self.text[:column].count( '\n' ) + 1
+		raise ExpressionException( "line %d, column %d: %s" % \
+			(line, column - self.text.rfind( '\n', 0, column ), message) )
+
+	@staticmethod
+	def tokenize( text ):
+		tokens = [ ]
+		position = 0
+
+		while position < len( text ):
+			match = p_token.match( text, position )
+			if match is None or match.end( ) == position:
+				break
+
+			position = match.end( )
+			kind = match.lastgroup
+			value = match.group( kind )
+
+			if kind == 'newline':
+				kind, value = 'op', ';'
+			tokens.append( (kind, value, match.start( kind )) )
+
+		tokens.append( ('end', None, len( text )) )
+		return (tokens)
+
+	def peek( self ):
+		return (self.tokens[self.position])
+
+	def next( self ):
+		token = self.tokens[self.position]
+		self.position += 1
+		return (token)
+
+	def accept( self, value ):
+		if self.peek( )[0] == 'op' and self.peek( )[1] == value:
+			return (self.next( ))
+		return (None)
+
+	def expect( self, value ):
+		token = self.accept( value )
+		if token is None:
+			self.error( "expected '%s'" % value )
+		return (token)
+
+	def parse( self ):
+		"""
+		:return: list of (target name, value Node, target token) tuples.
+		"""
+		statements = [ ]
+
+		while self.peek( )[0] != 'end':
+			if self.accept( ';' ):
+				continue
+
+			token = self.next( )
+			if token[0] != 'name':
+				self.error( "expected an assignment target", token )
+			self.expect( '=' )
+
+			statements.append( (token[1], self.parse_expression( 0 ), token) )
+
+			if self.peek( )[0] != 'end':
+				self.expect( ';' )
+
+		return (statements)
+
+	def parse_expression( self, level ):
+		left = self.parse_unary( )
+
+		while True:
+			token = self.peek( )
+			if token[0] != 'op' or precedence.get( token[1], 0 ) <= level:
+				return (left)
+
+			self.next( )
+			right = self.parse_expression( precedence[token[1]] )
+			left = Node( token[1], [ left, right ], value=token )
+
+	def parse_unary( self ):
+		token = self.accept( '-' )
+		if token:
+			return (Node( 'neg', [ self.parse_unary( ) ], value=token ))
+		if self.accept( '+' ):
+			return (self.parse_unary( ))
+
+		return (self.parse_postfix( self.parse_primary( ) ))
+
+	def parse_primary( self ):
+		token = self.next( )
+		kind, value = token[0], token[1]
+
+		if kind == 'number':
+			number = float( value ) if re.search( '[.eE]', value ) else int( value )
+			return (Node( 'num', value=number ))
+
+		if kind == 'name':
+			if self.accept( '(' ):
+				args = [ ]
+				if not self.accept( ')' ):
+					args.append( self.parse_expression( 0 ) )
+					while self.accept( ',' ):
+						args.append( self.parse_expression( 0 ) )
+					self.expect( ')' )
+				return (Node( 'call', args, value=token ))
+			return (Node( 'name', value=token ))
+
+		if kind == 'op' and value == '(':
+			result = self.parse_expression( 0 )
+			self.expect( ')' )
+			return (result)
+
+		if kind == 'end':
+			self.error( "unexpected end of expression", token )
+		self.error( "unexpected '%s'" % value, token )
+
+	def parse_postfix( self, node ):
+		while self.accept( '.' ):
+			token = self.next( )
+			if token[0] != 'name' or token[1] not in components:
+				self.error( "expected a component (x, y or z)", token )
+			node = Node( 'member', [ node ], value=token )
+		return (node)
+
+
+## ----------------------------------------------------------------------
+class Compiler( object ):
+
+	def __init__( self, symbols, constants=None, element_wise=False ):
+		"""
+		Standard initializer.
+		:param symbols: dict of name to Symbol for every plug in scope.
+		:param constants: dict of the plugin's constants. Numeric ones are
+			folded into the generated code.
+		:param element_wise: If True, statements run inside an element-wise
+			loop and loop-invariant subexpressions are hoisted out of it.
+		"""
+		self.symbols = dict( symbols )
+		self.element_wise = element_wise
+
+		self.constants = dict( builtin_constants )
+		for name, value in (constants or { }).items( ):
+			self.constants[name] = self.constant_value( value )
+
+		self.reads    = set( )
+		self.writes   = [ ]
+		self.versions = { }
+
+	@staticmethod
+	def constant_value( value ):
+		if isinstance( value, bool ):
+			return (int( value ))
+		if isinstance( value, (int, float) ):
+			return (value)
+		try:
+			text = str( value ).strip( )
+			return (float( text ) if re.search( '[.eE]', text ) else int( text ))
+		except ValueError:
+			return (None)    ## not numeric, cannot be used in expressions
+
+	def error( self, node, message ):
+		token = node.value if isinstance( node.value, tuple ) else None
+		if token is not None:
+			message = "'%s': %s" % (token[1], message)
+		raise ExpressionException( message )
+
+	## -- checking and folding ------------------------------------------
+
+	def rewrite( self, node ):
+		"""
+		Lowers convenience functions to plain arithmetic.
+		"""
+		name = node.value[1]
+		args = node.args
+
+		if len( args ) != rewrites[name]:
+			self.error( node, "expects %d argument(s), got %d" % (rewrites[name], len( args )) )
+
+		if name == 'RAD2DEG':
+			return (Node( '*', [ args[0], Node( 'num', value=180.0 / math.pi ) ] ))
+		if name == 'DEG2RAD':
+			return (Node( '*', [ args[0], Node( 'num', value=math.pi / 180.0 ) ] ))
+		if name == 'dot':
+			return (Node( '*', args, value=node.value ))
+		if name == 'cross':
+			return (Node( '^', args, value=node.value ))
+
+		## lerp(a, b, t) = a + (b - a) * t
+		return (Node( '+', [ args[0], Node( '*', [ Node( '-', [ args[1], args[0] ] ), args[2] ] ) ],
+			value=node.value ))
+
+	def check( self, node, locals ):
+		"""
+		Type checks and constant folds a tree bottom-up.
+		:return: the (possibly replaced) node, with kind and key set.
+		"""
+		if node.op == 'call' and node.value[1] in rewrites:
+			node = self.rewrite( node )
+
+		node.args = [ self.check( x, locals ) for x in node.args ]
+		node.varying = any( x.varying for x in node.args )
+
+		if node.op == 'num':
+			node.kind = kScalar
+			self.check_constant( node, node.value )
+
+		elif node.op == 'name':
+			name = node.value[1]
+
+			if name in locals:
+				node.kind, node.varying = locals[name]
+			elif name in self.symbols:
+				symbol = self.symbols[name]
+				if symbol.kind == kRamp:
+					self.error( node, "a ramp is read by calling it with a position, e.g. %s(x)" % name )
+				node.kind = symbol.kind
+				node.varying = symbol.varying
+				self.reads.add( name )
+			elif name in self.constants:
+				value = self.constants[name]
+				if value is None:
+					self.error( node, "constant is not numeric" )
+				return (self.check( Node( 'num', value=value ), locals ))
+			else:
+				self.error( node, "unknown name" )
+
+		elif node.op == 'neg':
+			operand = node.args[0]
+			if operand.kind == kMatrix:
+				self.error( node, "cannot negate a matrix" )
+			node.kind = operand.kind
+			if operand.op == 'num':
+				return (self.fold( node, -operand.value ))
+
+		elif node.op == 'member':
+			if node.args[0].kind not in (kVector, kFVector, kPoint):
+				self.error( node, "components need a vector or point, got %s" % node.args[0].kind )
+			node.kind = kScalar
+
+		elif node.op == 'call':
+			self.check_call( node )
+			if node.op == 'num':
+				return (self.fold( node, node.value ))
+
+		else:
+			left, right = node.args
+			kind = binary_kinds.get( (node.op, left.kind, right.kind), None )
+			if kind is None:
+				self.error( node, "cannot apply '%s' to %s and %s" % (node.op, left.kind, right.kind) )
+			node.kind = kind
+
+			if left.op == 'num' and right.op == 'num':
+				return (self.fold( node, self.fold_binary( node.op, left.value, right.value ) ))
+
+		node.key = self.key( node )
+		return (node)
+
+	def check_call( self, node ):
+		name = node.value[1]
+
+		symbol = self.symbols.get( name, None )
+		if symbol is not None and symbol.kind == kRamp:
+			if len( node.args ) != 1 or node.args[0].kind != kScalar:
+				self.error( node, "a ramp takes one scalar position" )
+			node.kind = kScalar
+			self.reads.add( name )
+			return
+
+		if not name in functions:
+			self.error( node, "unknown function" )
+
+		kinds, result, _, fold = functions[name]
+		if len( node.args ) != len( kinds ):
+			self.error( node, "expects %d argument(s), got %d" % (len( kinds ), len( node.args )) )
+
+		for index, (expected, arg) in enumerate( zip( kinds, node.args ) ):
+			if expected is None:
+				if arg.kind not in (kVector, kFVector):
+					self.error( node, "argument %d must be a vector, got %s" % (index + 1, arg.kind) )
+			elif arg.kind != expected:
+				self.error( node, "argument %d must be %s, got %s" % (index + 1, expected, arg.kind) )
+
+		node.kind = result or node.args[0].kind
+
+		if fold is not None and all( x.op == 'num' for x in node.args ):
+			try:
+				value = fold( *[ x.value for x in node.args ] )
+			except (ValueError, OverflowError):
+				self.error( node, "cannot be evaluated for these constant arguments" )
+			## the C++ functions all return floating point values
+			node.op, node.args, node.value = 'num', [ ], float( value )
+
+	def check_constant( self, node, value ):
+		"""
+		C++ has no literal for inf or nan, and integers past 64 bits do not
+		fit any literal type, so such constants are errors rather than code
+		that fails to compile.
+		"""
+		if isinstance( value, float ):
+			if math.isinf( value ) or math.isnan( value ):
+				self.error( node, "constant evaluates to %s" % value )
+		elif not -2 ** 63 <= value < 2 ** 63:
+			self.error( node, "constant %d does not fit in a 64-bit integer" % value )
+
+	def fold( self, node, value ):
+		self.check_constant( node, value )
+
+		result = Node( 'num', value=value )
+		result.kind = kScalar
+		result.key = self.key( result )
+		return (result)
+
+	def fold_binary( self, op, left, right ):
+		integers = isinstance( left, int ) and isinstance( right, int )
+
+		if op == '+':
+			return (left + right)
+		if op == '-':
+			return (left - right)
+		if op == '*':
+			return (left * right)
+
+		if right == 0:
+			raise ExpressionException( "division by zero in constant expression" )
+		if integers:
+			## C++ integer division truncates towards zero
+			result = abs( left ) // abs( right )
+			return (result if (left < 0) == (right < 0) else -result)
+		return (float( left ) / right)
+
+	def key( self, node ):
+		"""
+		Structural key used to spot repeated subexpressions. Scalar + and *
+		are commutative, so their operands are put in a fixed order.
+		"""
+		if node.op == 'num':
+			return (('num', repr( node.value )))
+		if node.op == 'name':
+			## an assignment starts a new version of the name, so reads on
+			## either side of it are never merged
+			name = node.value[1]
+			return (('name', name, self.versions.get( name, 0 )))
+
+		keys = [ x.key for x in node.args ]
+		if node.op in ('+', '*') and all( x.kind == kScalar for x in node.args ):
+			keys.sort( )
+
+		extra = node.value[1] if node.op in ('call', 'member') else None
+		return ((node.op, extra) + tuple( keys ))
+
+	## -- emission -------------------------------------------------------
+
+	def emit( self, node, temps ):
+		"""
+		:return: (C++ code, binding level). Atoms bind tightest.
+		"""
+		if node.key in temps:
+			return (temps[node.key], 5)
+
+		if node.op == 'num':
+			value = node.value
+			code = repr( value ) if isinstance( value, float ) else str( value )
+			return (code, 4 if value < 0 else 5)
+
+		if node.op == 'name':
+			name = node.value[1]
+			symbol = self.symbols.get( name, None )
+			return (symbol.code if symbol is not None else name, 5)
+
+		if node.op == 'neg':
+			code, level = self.emit( node.args[0], temps )
+			return ('-' + (code if level >= 5 else '(%s)' % code), 4)
+
+		if node.op == 'member':
+			code, level = self.emit( node.args[0], temps )
+			return ('%s.%s' % (code if level >= 5 else '(%s)' % code, node.value[1]), 5)
+
+		if node.op == 'call':
+			args = [ ]
+			for arg in node.args:
+				code, level = self.emit( arg, temps )
+				args.append( code )
+			symbol = self.symbols.get( node.value[1], None )
+			if symbol is not None and symbol.kind == kRamp:
+				return ('%s(%s)' % (symbol.code, args[0]), 5)
+			## method calls need an atom on the left of the dot
+			if functions[node.value[1]][2].startswith( '{0}.' ):
+				code, level = self.emit( node.args[0], temps )
+				args[0] = code if level >= 5 else '(%s)' % code
+			return (functions[node.value[1]][2].format( *args ), 5)
+
+		level = precedence[node.op]
+		left, left_level = self.emit( node.args[0], temps )
+		right, right_level = self.emit( node.args[1], temps )
+
+		if node.op == '^':
+			## C++ binds ^ looser than everything arithmetic: keep it wrapped
+			left = left if left_level >= 5 else '(%s)' % left
+			right = right if right_level >= 5 else '(%s)' % right
+			return ('(%s ^ %s)' % (left, right), 5)
+
+		## the grouping is kept as parsed, since reassociating floating
+		## point arithmetic would change the results
+		if left_level < level:
+			left = '(%s)' % left
+		if right_level <= level:
+			right = '(%s)' % right
+
+		return ('%s %s %s' % (left, node.op, right), level)
+
+	@staticmethod
+	def atomic( node ):
+		"""
+		True for nodes cheaper to repeat than to keep in a temp.
+		"""
+		return (node.op in ('num', 'name', 'member') or (node.op == 'neg' and node.args[0].op == 'name'))
+
+	def count( self, node, counts ):
+		if self.atomic( node ):
+			return
+
+		counts[node.key] = counts.get( node.key, 0 ) + 1
+		## children of a repeated subexpression are covered by its temp
+		if counts[node.key] == 1:
+			for arg in node.args:
+				self.count( arg, counts )
+
+	def temp( self, node, temps, lines ):
+		code, _ = self.emit( node, temps )
+		name = '_cse%d' % (len( temps ))
+		lines.append( 'const auto %s = %s;' % (name, code) )
+		temps[node.key] = name
+
+	def hoist( self, node, counts, temps, lines, invariant ):
+		"""
+		Emits temps for repeated subexpressions of a tree, innermost first.
+		In element-wise mode the largest loop-invariant subexpressions of
+		each varying one get an invariant temp too, even if used once.
+		"""
+		if node.key in temps:
+			return
+
+		for arg in node.args:
+			self.hoist( arg, counts, temps, lines, invariant )
+
+		if counts.get( node.key, 0 ) > 1:
+			self.temp( node, temps, invariant if self.element_wise and not node.varying else lines )
+
+		elif self.element_wise and node.varying:
+			for arg in node.args:
+				if not arg.varying and not self.atomic( arg ) and arg.key not in temps:
+					self.temp( arg, temps, invariant )
+
+	def compile( self, text ):
+		"""
+		Compiles an expression.
+		:return: (invariant lines, lines). In element-wise mode the invariant
+			lines can be emitted once before the loop; otherwise they are
+			always empty and everything is in lines.
+		"""
+		statements = Parser( text ).parse( )
+		locals = { }
+		assigned = set( )
+		checked = [ ]
+
+		for target, value, token in statements:
+			node = self.check( value, locals )
+
+			if target in assigned:
+				raise ExpressionException( "'%s' is assigned more than once." % target )
+			assigned.add( target )
+
+			symbol = self.symbols.get( target, None )
+			if symbol is not None:
+				if not symbol.writable:
+					raise ExpressionException( "'%s' is an input and cannot be assigned." % target )
+				if symbol.kind != node.kind:
+					raise ExpressionException( "'%s' is %s but is assigned %s." % (target, symbol.kind, node.kind) )
+				self.writes.append( target )
+			elif target in self.constants or target in functions or target in rewrites:
+				raise ExpressionException( "'%s' is a constant or function and cannot be assigned." % target )
+			else:
+				locals[target] = (node.kind, node.varying)
+
+			self.versions[target] = self.versions.get( target, 0 ) + 1
+			checked.append( (target, node, symbol) )
+
+		counts = { }
+		for _, node, _ in checked:
+			self.count( node, counts )
+
+		temps = { }
+		invariant = [ ]
+		lines = [ ]
+
+		for target, node, symbol in checked:
+			self.hoist( node, counts, temps, lines, invariant )
+			code, _ = self.emit( node, temps )
+
+			if symbol is not None:
+				if self.element_wise and not node.varying and not self.atomic( node ):
+					self.temp( node, temps, invariant )
+					code, _ = self.emit( node, temps )
+				lines.append( '%s = %s;' % (symbol.code, code) )
+			elif self.element_wise and not node.varying:
+				invariant.append( 'const auto %s = %s;' % (target, code) )
+			else:
+				lines.append( 'const auto %s = %s;' % (target, code) )
+
+		return (invariant, lines)
+
+
+## ----------------------------------------------------------------------
+def compile_expression( text, symbols, constants=None, element_wise=False ):
+	"""
+	Convenience wrapper around Compiler.
+	:return: (compiler, invariant lines, lines)
+	"""
+	compiler = Compiler( symbols, constants, element_wise )
+	invariant, lines = compiler.compile( text )
+	return (compiler, invariant, lines)
@@ -0,0 +1,473 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+HARNESS.PY
+
+Generates a standalone benchmark for each node's node_main(), built
+without Maya. The node's _main.cpp is compiled against a small shim of
+the Maya value types, inputs are filled with random or recorded values,
+and node_main() is called in a loop to report ns/eval, throughput and a
+checksum of the outputs for regression tests.
+
+The files go to a harness/ folder next to the generated plugin:
+
+	cmake -S harness -B harness/build && cmake --build harness/build
+	harness/build/bench_<Class> [-iterations N] [-elements N] [-seed N] [-inputs file]
+
+Hand-written node code that calls into Maya beyond the value types will
+not build here.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+from .mpxnode import types_mapping_table
+
+## ----------------------------------------------------------------------
+
+harness_folder = 'harness'
+
+## stand-ins for the Maya types node_main() code works with
+shim_code = """// ----------------------------------------------------------------------
+// Headless stand-ins for the Maya value types used by node_main().
+// Generated by nodesmith, do not edit.
+// ----------------------------------------------------------------------
+
+#ifndef __NODESMITH_SHIM_H
+#define __NODESMITH_SHIM_H
+
+#define _USE_MATH_DEFINES
+
+#include <math.h>
+#include <stdint.h>
+#include <stdio.h>
+
+#include <algorithm>
+#include <cmath>
+#include <string>
+#include <vector>
+
+struct MVector {
+	double x, y, z;
+	MVector() : x(0.0), y(0.0), z(0.0) {}
+	MVector(double x_, double y_, double z_) : x(x_), y(y_), z(z_) {}
+	MVector operator+(const MVector &o) const { return MVector(x + o.x, y + o.y, z + o.z); }
+	MVector operator-(const MVector &o) const { return MVector(x - o.x, y - o.y, z - o.z); }
+	MVector operator-() const { return MVector(-x, -y, -z); }
+	MVector operator*(double s) const { return MVector(x * s, y * s, z * s); }
+	MVector operator/(double s) const { return MVector(x / s, y / s, z / s); }
+	double operator*(const MVector &o) const { return x * o.x + y * o.y + z * o.z; }
+	MVector operator^(const MVector &o) const {
+		return MVector(y * o.z - z * o.y, z * o.x - x * o.z, x * o.y - y * o.x);
+	}
+	bool operator==(const MVector &o) const { return x == o.x && y == o.y && z == o.z; }
+	bool operator!=(const MVector &o) const { return !(*this == o); }
+	double length() const { return std::sqrt(x * x + y * y + z * z); }
+	MVector normal() const { const double l = length(); return l > 0.0 ? *this / l : *this; }
+};
+inline MVector operator*(double s, const MVector &v) { return v * s; }
+
+struct MFloatVector {
+	float x, y, z;
+	MFloatVector() : x(0.0f), y(0.0f), z(0.0f) {}
+	MFloatVector(float x_, float y_, float z_) : x(x_), y(y_), z(z_) {}
+	MFloatVector operator+(const MFloatVector &o) const { return MFloatVector(x + o.x, y + o.y, z + o.z); }
+	MFloatVector operator-(const MFloatVector &o) const { return MFloatVector(x - o.x, y - o.y, z - o.z); }
+	MFloatVector operator-() const { return MFloatVector(-x, -y, -z); }
+	MFloatVector operator*(float s) const { return MFloatVector(x * s, y * s, z * s); }
+	MFloatVector operator/(float s) const { return MFloatVector(x / s, y / s, z / s); }
+	float operator*(const MFloatVector &o) const { return x * o.x + y * o.y + z * o.z; }
+	MFloatVector operator^(const MFloatVector &o) const {
+		return MFloatVector(y * o.z - z * o.y, z * o.x - x * o.z, x * o.y - y * o.x);
+	}
+	bool operator==(const MFloatVector &o) const { return x == o.x && y == o.y && z == o.z; }
+	bool operator!=(const MFloatVector &o) const { return !(*this == o); }
+	float length() const { return std::sqrt(x * x + y * y + z * z); }
+	MFloatVector normal() const { const float l = length(); return l > 0.0f ? *this / l : *this; }
+};
+inline MFloatVector operator*(float s, const MFloatVector &v) { return v * s; }
+
+// row-major, row vectors on the left, as in Maya
+struct MMatrix {
+	double matrix[4][4];
+	MMatrix() { for (int r = 0; r < 4; ++r) for (int c = 0; c < 4; ++c) matrix[r][c] = r == c ? 1.0 : 0.0; }
+	double *operator[](unsigned int r) { return matrix[r]; }
+	const double *operator[](unsigned int r) const { return matrix[r]; }
+	double operator()(unsigned int r, unsigned int c) const { return matrix[r][c]; }
+	MMatrix operator+(const MMatrix &o) const {
+		MMatrix m;
+		for (int r = 0; r < 4; ++r) for (int c = 0; c < 4; ++c) m.matrix[r][c] = matrix[r][c] + o.matrix[r][c];
+		return m;
+	}
+	MMatrix operator*(double s) const {
+		MMatrix m;
+		for (int r = 0; r < 4; ++r) for (int c = 0; c < 4; ++c) m.matrix[r][c] = matrix[r][c] * s;
+		return m;
+	}
+	MMatrix operator*(const MMatrix &o) const {
+		MMatrix m;
+		for (int r = 0; r < 4; ++r)
+			for (int c = 0; c < 4; ++c)
+				m.matrix[r][c] = matrix[r][0] * o.matrix[0][c] + matrix[r][1] * o.matrix[1][c]
+					+ matrix[r][2] * o.matrix[2][c] + matrix[r][3] * o.matrix[3][c];
+		return m;
+	}
+	bool operator==(const MMatrix &o) const {
+		for (int r = 0; r < 4; ++r) for (int c = 0; c < 4; ++c) if (matrix[r][c] != o.matrix[r][c]) return false;
+		return true;
+	}
+	bool operator!=(const MMatrix &o) const { return !(*this == o); }
+	MMatrix transpose() const {
+		MMatrix m;
+		for (int r = 0; r < 4; ++r) for (int c = 0; c < 4; ++c) m.matrix[r][c] = matrix[c][r];
+		return m;
+	}
+	MMatrix inverse() const {
+		// Gauss-Jordan with partial pivoting; singular matrices give identity
+		double a[4][8];
+		for (int r = 0; r < 4; ++r)
+			for (int c = 0; c < 4; ++c) { a[r][c] = matrix[r][c]; a[r][c + 4] = r == c ? 1.0 : 0.0; }
+		for (int c = 0; c < 4; ++c) {
+			int pivot = c;
+			for (int r = c + 1; r < 4; ++r) if (std::fabs(a[r][c]) > std::fabs(a[pivot][c])) pivot = r;
+			if (a[pivot][c] == 0.0) return MMatrix();
+			for (int k = 0; k < 8; ++k) std::swap(a[c][k], a[pivot][k]);
+			const double scale = 1.0 / a[c][c];
+			for (int k = 0; k < 8; ++k) a[c][k] *= scale;
+			for (int r = 0; r < 4; ++r) {
+				if (r == c) continue;
+				const double f = a[r][c];
+				for (int k = 0; k < 8; ++k) a[r][k] -= f * a[c][k];
+			}
+		}
+		MMatrix m;
+		for (int r = 0; r < 4; ++r) for (int c = 0; c < 4; ++c) m.matrix[r][c] = a[r][c + 4];
+		return m;
+	}
+	static const MMatrix identity;
+};
+const MMatrix MMatrix::identity;
+
+inline MVector operator*(const MVector &v, const MMatrix &m) {
+	return MVector(v.x * m[0][0] + v.y * m[1][0] + v.z * m[2][0],
+				   v.x * m[0][1] + v.y * m[1][1] + v.z * m[2][1],
+				   v.x * m[0][2] + v.y * m[1][2] + v.z * m[2][2]);
+}
+
+struct MPoint {
+	double x, y, z, w;
+	MPoint() : x(0.0), y(0.0), z(0.0), w(1.0) {}
+	MPoint(double x_, double y_, double z_, double w_ = 1.0) : x(x_), y(y_), z(z_), w(w_) {}
+	MPoint(const MVector &v) : x(v.x), y(v.y), z(v.z), w(1.0) {}
+	MPoint operator+(const MVector &v) const { return MPoint(x + v.x, y + v.y, z + v.z, w); }
+	MPoint operator-(const MVector &v) const { return MPoint(x - v.x, y - v.y, z - v.z, w); }
+	MVector operator-(const MPoint &o) const { return MVector(x - o.x, y - o.y, z - o.z); }
+	MPoint operator-() const { return MPoint(-x, -y, -z, w); }
+	MPoint operator*(double s) const { return MPoint(x * s, y * s, z * s, w); }
+	bool operator==(const MPoint &o) const { return x == o.x && y == o.y && z == o.z && w == o.w; }
+	bool operator!=(const MPoint &o) const { return !(*this == o); }
+	operator MVector() const { return MVector(x, y, z); }
+};
+
+inline MPoint operator*(const MPoint &p, const MMatrix &m) {
+	return MPoint(p.x * m[0][0] + p.y * m[1][0] + p.z * m[2][0] + p.w * m[3][0],
+				  p.x * m[0][1] + p.y * m[1][1] + p.z * m[2][1] + p.w * m[3][1],
+				  p.x * m[0][2] + p.y * m[1][2] + p.z * m[2][2] + p.w * m[3][2],
+				  p.x * m[0][3] + p.y * m[1][3] + p.z * m[2][3] + p.w * m[3][3]);
+}
+
+#define OUT
+
+#define DEG2RAD(degrees)      (degrees * M_PI ) / 180
+#define RAD2DEG(radians)      (radians * 180) / M_PI
+#define LERP(a,b,t)           (a + (b-a) * t)
+
+// the benchmark measures a single thread
+template <typename F>
+inline void parallel_for(size_t count, size_t, const F &fn) {
+	fn((size_t)0, count);
+}
+
+// plugin constants
+"""
+
+## benchmark runner shared by every node
+runner_code = """// ----------------------------------------------------------------------
+// Benchmark runner for node_main(). Generated by nodesmith, do not edit.
+// ----------------------------------------------------------------------
+
+#ifndef __NODESMITH_RUNNER_H
+#define __NODESMITH_RUNNER_H
+
+#include <chrono>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <map>
+#include <sstream>
+
+#if defined(_MSC_VER)
+	#include <intrin.h>
+	#define NODESMITH_CLOBBER(p) _ReadWriteBarrier()
+#else
+	// keeps the compiler from hoisting node_main() out of the timing loop
+	#define NODESMITH_CLOBBER(p) asm volatile("" : : "g"(p) : "memory")
+#endif
+
+struct BenchOptions {
+	long long iterations = 1000000;
+	size_t elements = 1024;
+	uint64_t seed = 1;
+	std::string inputs;
+};
+
+inline BenchOptions parse_options(int argc, char **argv) {
+	BenchOptions options;
+	for (int i = 1; i + 1 < argc; i += 2) {
+		if (!strcmp(argv[i], "-iterations")) options.iterations = atoll(argv[i + 1]);
+		else if (!strcmp(argv[i], "-elements")) options.elements = (size_t)atoll(argv[i + 1]);
+		else if (!strcmp(argv[i], "-seed")) options.seed = (uint64_t)atoll(argv[i + 1]);
+		else if (!strcmp(argv[i], "-inputs")) options.inputs = argv[i + 1];
+		else fprintf(stderr, "unknown option %s\\n", argv[i]);
+	}
+	return options;
+}
+
+// xorshift64*, so runs are reproducible for a given seed
+struct Random {
+	uint64_t state;
+	explicit Random(uint64_t seed) : state(seed ? seed : 1) {}
+	double next() {
+		state ^= state >> 12; state ^= state << 25; state ^= state >> 27;
+		return (double)((state * 2685821657736338717ULL) >> 11) / 9007199254740992.0 * 2.0 - 1.0;
+	}
+};
+
+// recorded inputs: one line per plug, its name followed by its values;
+// vectors take 3 values, points 4 and matrices 16, arrays any number of those
+struct Recorded {
+	std::map< std::string, std::vector<double> > values;
+
+	explicit Recorded(const std::string &path) {
+		if (path.empty()) return;
+		std::ifstream fp(path.c_str());
+		if (!fp) { fprintf(stderr, "cannot read %s\\n", path.c_str()); exit(1); }
+		std::string line;
+		while (std::getline(fp, line)) {
+			std::istringstream in(line);
+			std::string name;
+			double value;
+			if (!(in >> name) || name[0] == '#') continue;
+			std::vector<double> &target = values[name];
+			while (in >> value) target.push_back(value);
+		}
+	}
+
+	const std::vector<double> *find(const char *name) const {
+		std::map< std::string, std::vector<double> >::const_iterator it = values.find(name);
+		return it == values.end() ? 0 : &it->second;
+	}
+};
+
+inline size_t value_size(const MVector &) { return 3; }
+inline size_t value_size(const MFloatVector &) { return 3; }
+inline size_t value_size(const MPoint &) { return 4; }
+inline size_t value_size(const MMatrix &) { return 16; }
+template <typename T> inline size_t value_size(const T &) { return 1; }
+
+inline void set_value(MVector &v, const double *d) { v = MVector(d[0], d[1], d[2]); }
+inline void set_value(MFloatVector &v, const double *d) { v = MFloatVector((float)d[0], (float)d[1], (float)d[2]); }
+inline void set_value(MPoint &v, const double *d) { v = MPoint(d[0], d[1], d[2], d[3]); }
+inline void set_value(MMatrix &v, const double *d) { for (int k = 0; k < 16; ++k) v.matrix[k / 4][k % 4] = d[k]; }
+inline void set_value(bool &v, const double *d) { v = d[0] != 0.0; }
+template <typename T> inline void set_value(T &v, const double *d) { v = (T)d[0]; }
+
+template <typename T>
+inline void random_value(T &v, Random &rng) {
+	double d[16];
+	for (int k = 0; k < 16; ++k) d[k] = rng.next() * 10.0;
+	d[3] = 1.0;
+	set_value(v, d);
+}
+
+template <typename T>
+inline void fill_input(T &v, const char *name, Random &rng, const Recorded &recorded, size_t) {
+	const std::vector<double> *values = recorded.find(name);
+	if (values && values->size() >= value_size(v)) set_value(v, values->data());
+	else random_value(v, rng);
+}
+
+template <typename T>
+inline void fill_input(std::vector<T> &v, const char *name, Random &rng, const Recorded &recorded, size_t elements) {
+	const std::vector<double> *values = recorded.find(name);
+	const size_t size = value_size(T());
+	if (values) {
+		v.resize(values->size() / size);
+		for (size_t i = 0; i < v.size(); ++i) set_value(v[i], values->data() + i * size);
+	} else {
+		v.resize(elements);
+		for (size_t i = 0; i < v.size(); ++i) random_value(v[i], rng);
+	}
+}
+
+inline double checksum(const MVector &v) { return v.x + v.y + v.z; }
+inline double checksum(const MFloatVector &v) { return (double)v.x + v.y + v.z; }
+inline double checksum(const MPoint &v) { return v.x + v.y + v.z + v.w; }
+inline double checksum(const MMatrix &v) { double s = 0.0; for (int k = 0; k < 16; ++k) s += v.matrix[k / 4][k % 4]; return s; }
+template <typename T> inline double checksum(const T &v) { return (double)v; }
+template <typename T> inline double checksum(const std::vector<T> &v) {
+	double s = 0.0;
+	for (size_t i = 0; i < v.size(); ++i) s += checksum(v[i]);
+	return s;
+}
+
+template <typename Node>
+inline double time_node_main(Node &node, long long iterations) {
+	for (long long i = 0; i < iterations / 100 + 1; ++i) {
+		node.node_main();
+		NODESMITH_CLOBBER(&node);
+	}
+
+	const std::chrono::steady_clock::time_point start = std::chrono::steady_clock::now();
+	for (long long i = 0; i < iterations; ++i) {
+		node.node_main();
+		NODESMITH_CLOBBER(&node);
+	}
+	const std::chrono::steady_clock::time_point end = std::chrono::steady_clock::now();
+
+	return std::chrono::duration<double>(end - start).count();
+}
+
+inline void report(const char *name, long long iterations, double seconds, double sum) {
+	printf("%s: %lld evals in %.3f s, %.2f ns/eval, %.3f Mevals/s, checksum %.17g\\n",
+		   name, iterations, seconds, seconds * 1e9 / (double)iterations,
+		   (double)iterations / seconds * 1e-6, sum);
+}
+
+#endif
+"""
+
+## per-node benchmark; compiles the node's _main.cpp as it is on disk
+bench_code = """// ----------------------------------------------------------------------
+// Headless benchmark of {class_name}::node_main(). Generated by nodesmith,
+// do not edit.
+// ----------------------------------------------------------------------
+
+#include "shim.h"
+#include "runner.h"
+
+// stand in for the Maya node: same members, no MPxNode
+#define __COMMON_H
+#define __{class_name}_H
+
+class {class_name}
+{{
+public:
+{private_variables}
+	void node_main(void);
+}};
+
+#include "../{main_file_name}"
+
+int main(int argc, char **argv)
+{{
+	const BenchOptions options = parse_options(argc, argv);
+	const Recorded recorded(options.inputs);
+	Random rng(options.seed);
+
+	{class_name} node;
+{fill_inputs}
+	const double seconds = time_node_main(node, options.iterations);
+
+	double sum = 0.0;
+{checksums}
+	report("{class_name}", options.iterations, seconds, sum);
+	return 0;
+}}
+"""
+
+cmake_code = """cmake_minimum_required( VERSION 3.4 )
+project( {project_name}_harness CXX )
+
+## headless node_main() benchmarks; no Maya needed
+set( CMAKE_CXX_STANDARD 14 )
+set( CMAKE_CXX_STANDARD_REQUIRED ON )
+
+if( NOT CMAKE_BUILD_TYPE )
+	set( CMAKE_BUILD_TYPE Release )
+endif()
+
+{executables}
+## runs every benchmark
+add_custom_target( bench
+{commands}	VERBATIM
+)
+"""
+
+
+## ----------------------------------------------------------------------
+class HarnessException( Exception ):
+	pass
+
+
+## ----------------------------------------------------------------------
+def benchable( node ):
+	"""
+	:return: True if the node is a plain node and every plug has a value
+		type the shim knows; ramps need Maya to sample them, and deformers
+		Maya's geometry.
+	"""
+	return (node.kind == 'node' and all( [ types_mapping_table.get( x.type, None ) is not None and x.type != 'ramp' \
+			for x in node.attributes.values() ] ))
+
+def generate_shim( constants ):
+	return (shim_code + constants + "\n#endif\n")
+
+def generate_bench( node ):
+	fill = [ '\tfill_input(node.{name}, "{name}", rng, recorded, options.elements);\n'.format( name=x.name ) \
+			for x in node.sorted_inputs ]
+	checksums = [ '\tsum += checksum(node.{name});\n'.format( name=x.name ) for x in node.sorted_outputs ]
+
+	return (bench_code.format(
+		class_name=node.class_name,
+		main_file_name=node.main_file_name,
+		private_variables=node.generate_private_variables(),
+		fill_inputs=''.join( fill ),
+		checksums=''.join( checksums )
+	))
+
+def generate_cmake( project_name, class_names ):
+	return (cmake_code.format(
+		project_name=project_name,
+		executables=''.join( [ 'add_executable( bench_{0} bench_{0}.cpp )\n'.format( x ) for x in class_names ] ),
+		commands=''.join( [ '\tCOMMAND bench_{0}\n'.format( x ) for x in class_names ] )
+	))
+
+def generate_harness_files( plugin ):
+	"""
+	Generates the headless benchmark project of a plugin. Nodes with plug
+	types the shim has no value type for are left out.
+	:return: (list of (file name, contents) pairs, list of skipped class names).
+	"""
+	class_names = [ ]
+	skipped = [ ]
+	result = [ ]
+
+	for class_name in sorted( plugin.nodes.keys() ):
+		node = plugin.nodes[class_name]
+		if not benchable( node ):
+			skipped.append( class_name )
+			continue
+
+		class_names.append( class_name )
+		result.append( ('%s/bench_%s.cpp' % (harness_folder, class_name), generate_bench( node )) )
+
+	if not class_names:
+		raise HarnessException( "no node has plugs the harness can fill." )
+
+	result.insert( 0, ('%s/shim.h' % harness_folder, generate_shim( plugin.generate_common_constants() )) )
+	result.insert( 1, ('%s/runner.h' % harness_folder, runner_code) )
+	result.append( ('%s/CMakeLists.txt' % harness_folder, generate_cmake( plugin.name, class_names )) )
+
+	return (result, skipped)
@@ -0,0 +1,256 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+MANIFEST.PY
+
+Keeps track of what a previous run generated so that unchanged nodes
+are not regenerated and unchanged files are not rewritten. Leaving the
+mtimes alone means the build system only recompiles what really moved.
+
+The manifest lives next to the generated files and records a hash of
+each node's spec and of every file written. Files a run no longer
+generates, such as those of a removed node, are deleted unless they
+were edited by hand since, in which case they stay and are forgotten.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import hashlib, json, os
+
+from .writers import DirectoryWriter
+
+## ----------------------------------------------------------------------
+
+manifest_name = '.nodesmith_manifest.json'
+manifest_version = 1
+
+## file statuses returned by Manifest.write()
+kAdded     = 'added'
+kChanged   = 'changed'
+kUnchanged = 'unchanged'
+kKept      = 'kept'
+
+
+## ----------------------------------------------------------------------
+class ManifestException( Exception ):
+	pass
+
+
+## ----------------------------------------------------------------------
+def hash_content( content ):
+	return (hashlib.sha1( content.encode( 'utf-8' ) ).hexdigest( ))
+
+def hash_spec( data ):
+	"""
+	Hashes a JSON-compatible spec fragment independent of key order.
+	"""
+	text = json.dumps( data, sort_keys=True, separators=(',', ':') )
+	return (hash_content( text ))
+
+def generator_fingerprint( template_dir=None ):
+	"""
+	Hashes the generator sources and templates. A change here means every
+	node has to be regenerated, even if its spec did not change.
+	"""
+	digest = hashlib.sha1( )
+	folders = [ os.path.dirname( os.path.abspath( __file__ ) ) ]
+	if template_dir:
+		folders.append( os.path.abspath( template_dir ) )
+
+	for folder in folders:
+		for name in sorted( os.listdir( folder ) ):
+			if not (name.endswith( '.py' ) or '_template' in name):
+				continue
+			path = os.path.join( folder, name )
+			if os.path.isfile( path ):
+				with open( path, 'rb' ) as fp:
+					digest.update( name.encode( 'utf-8' ) )
+					digest.update( fp.read( ) )
+
+	return (digest.hexdigest( ))
+
+
+## ----------------------------------------------------------------------
+class Manifest( object ):
+
+	def __init__( self, folder, generator=None, writer=None ):
+		"""
+		Standard initializer. Loads the previous manifest, if any.
+		:param folder: Output folder the manifest belongs to.
+		:param generator: Fingerprint of the generator; see
+			generator_fingerprint(). If it differs from the stored one,
+			no node is considered up to date.
+		:param writer: writers.OutputWriter the files and the manifest go
+			through; writes straight into the folder if None.
+		"""
+		self.folder    = folder
+		self.path      = os.path.join( folder, manifest_name )
+		self.generator = generator
+		self.writer    = writer if writer is not None else DirectoryWriter( folder )
+
+		self.old_generator = None
+		self.old_nodes     = { }
+		self.old_files     = { }
+
+		self.nodes = { }
+		self.files = { }
+		self.status = { }
+		self.left = [ ]     ## files no longer generated but edited by hand
+
+		self.load( )
+
+	def load( self ):
+		if not os.path.isfile( self.path ):
+			return
+
+		try:
+			with open( self.path, 'r' ) as fp:
+				data = json.load( fp )
+		except (IOError, OSError, ValueError) as e:
+			raise ManifestException( "Unable to read manifest %s: %s" % (self.path, e) )
+
+		if data.get( 'version', None ) != manifest_version:
+			## unknown layout: behave as if there was no manifest at all
+			return
+
+		self.old_generator = data.get( 'generator', None )
+		self.old_nodes     = data.get( 'nodes', { } )
+		self.old_files     = data.get( 'files', { } )
+
+	def save( self ):
+		data = {
+			'version':   manifest_version,
+			'generator': self.generator,
+			'nodes':     self.nodes,
+			'files':     self.files,
+		}
+
+		self.writer.write( manifest_name, json.dumps( data, indent=1, sort_keys=True ) + '\n' )
+
+	def read_hash( self, name ):
+		content = self.writer.read( name )
+		return (hash_content( content ) if content is not None else None)
+
+	def node_current( self, class_name, spec_hash, file_names ):
+		"""
+		True if a node's spec and the generator are unchanged since the last
+		run and its files are still on disk as they were written.
+		"""
+		if spec_hash is None or self.generator is None:
+			return (False)
+
+		if self.generator != self.old_generator:
+			return (False)
+
+		if self.old_nodes.get( class_name, None ) != spec_hash:
+			return (False)
+
+		for name in file_names:
+			recorded = self.old_files.get( name, None )
+			if recorded is None or recorded != self.read_hash( name ):
+				return (False)
+
+		return (True)
+
+	def keep_node( self, class_name, spec_hash, file_names ):
+		"""
+		Carries an up-to-date node over into the new manifest untouched.
+		"""
+		self.nodes[class_name] = spec_hash
+		for name in file_names:
+			self.files[name] = self.old_files[name]
+			self.status[name] = kUnchanged
+
+	def keep_rest( self ):
+		"""
+		Carries every node and file this run did not touch over into the
+		new manifest, for runs that only generate some of the nodes.
+		"""
+		for class_name, spec_hash in self.old_nodes.items( ):
+			self.nodes.setdefault( class_name, spec_hash )
+		for name, digest in self.old_files.items( ):
+			if name not in self.status:
+				self.files.setdefault( name, digest )
+
+	def set_node( self, class_name, spec_hash ):
+		if spec_hash is not None:
+			self.nodes[class_name] = spec_hash
+
+	def write( self, name, content, protect=False, force=False ):
+		"""
+		Writes a generated file unless the same text is already on disk.
+		:param name: Path relative to the output folder.
+		:param content: Generated text.
+		:param protect: If True, an existing file that differs from what the
+			last run wrote is treated as hand-edited and left alone.
+		:param force: Overrides protect.
+		:return: One of kAdded, kChanged, kUnchanged or kKept.
+		"""
+		digest = hash_content( content )
+		existing = self.read_hash( name )
+
+		if existing is None:
+			status = kAdded
+		elif existing == digest:
+			status = kUnchanged
+		elif protect and not force and existing != self.old_files.get( name, None ):
+			## remember what nodesmith last wrote, not the edited file, so
+			## the edits stay protected on later runs too
+			status = kKept
+			digest = self.old_files.get( name, None )
+		else:
+			status = kChanged
+
+		if status in (kAdded, kChanged):
+			self.writer.write( name, content )
+
+		if digest is not None:
+			self.files[name] = digest
+		self.status[name] = status
+
+		return (status)
+
+	def removed_files( self ):
+		"""
+		:return: sorted names of the files the last run wrote and this one
+			did not, apart from those left in place by remove_files().
+		"""
+		return (sorted( set( self.old_files ).difference( self.files ).difference( self.status ).difference( self.left ) ))
+
+	def remove_files( self, force=False ):
+		"""
+		Deletes the files that are no longer generated through the writer.
+		A file edited by hand since it was written is left in place, unless
+		forced, and dropped from the manifest, so it is the user's from now on.
+		"""
+		for name in self.removed_files( ):
+			existing = self.read_hash( name )
+			if existing is None or existing == self.old_files[name] or force:
+				self.writer.remove( name )
+			else:
+				self.left.append( name )
+
+	def summary( self ):
+		"""
+		:return: dict of status name to sorted list of file names, plus the
+			nodes that were added, changed or removed since the last run.
+		"""
+		result = {
+			kAdded: [ ], kChanged: [ ], kUnchanged: [ ], kKept: [ ],
+			'removed': self.removed_files( ),
+			'left':    sorted( self.left ),
+		}
+
+		for name, status in self.status.items( ):
+			result[status].append( name )
+		for names in result.values( ):
+			names.sort( )
+
+		result['nodes_added']   = sorted( set( self.nodes ).difference( self.old_nodes ) )
+		result['nodes_removed'] = sorted( set( self.old_nodes ).difference( self.nodes ) )
+		result['nodes_changed'] = sorted( [ x for x in self.nodes \
+				if x in self.old_nodes and self.nodes[x] != self.old_nodes[x] ] )
+
+		return (result)
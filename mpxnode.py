@@ -1,4 +1,3 @@
-
 ## ----------------------------------------------------------------------
 """
 NODESMITH
@@ -12,7 +11,12 @@ Author: kiki
 """
 ## ----------------------------------------------------------------------
 
-import os, string, sys
+import os, re, string, sys
+from collections import OrderedDict
+
+from .expression import ExpressionException, Symbol, compile_expression, plug_kinds
+from .templates import get_registry
+from .threadsafety import ThreadSafetyException, resolve_scheduling, scan_code, scheduling_values
 
 ## ----------------------------------------------------------------------
 
@@ -48,18 +52,23 @@ types_mapping_table = {
 	'angle'    : 'double',
 	'angle3'   : 'MVector',
 
-	'ramp'     : None,
+	'ramp'     : 'RampTable',
 	'typed'    : None,
 	'compound' : None,
 }
 
+## plug types generate_cpp_attrib_creation() builds, and those of them
+## that can be arrays
+creatable_types = ( 'float', 'angle', 'matrix', 'ramp' )
+array_types = ( 'float', 'angle', 'matrix' )
+
 grab_mapping_table = {
 	'short'    : 'asShort',
 	'float'    : 'asFloat',
 	'float3'   : 'asMFloatVector',
 	'double'   : 'asDouble',
 	'double3'  : 'asMVector',
-	'matrix'   : 'asMMatrix',
+	'matrix'   : 'asMatrix',
 	'point'    : 'asMVector',
 	'bool'     : 'asShort',
 	'unit'     : 'asDouble',
@@ -91,47 +100,566 @@ set_mapping_table = {
 	'compound' : None,
 }
 
+## Maya headers each plug type needs, on top of the ones in common.h
+include_mapping_table = {
+	'short'    : [ 'MFnNumericAttribute', 'MFnNumericData' ],
+	'float'    : [ 'MFnNumericAttribute', 'MFnNumericData' ],
+	'float3'   : [ 'MFnNumericAttribute', 'MFnNumericData', 'MFloatVector' ],
+	'double'   : [ 'MFnNumericAttribute', 'MFnNumericData' ],
+	'double3'  : [ 'MFnNumericAttribute', 'MFnNumericData', 'MVector' ],
+	'matrix'   : [ 'MFnMatrixAttribute', 'MFloatMatrix' ],
+	'point'    : [ 'MFnNumericAttribute', 'MFnNumericData', 'MPoint', 'MVector' ],
+	'bool'     : [ 'MFnNumericAttribute', 'MFnNumericData' ],
+	'unit'     : [ 'MFnUnitAttribute' ],
+
+	'angle'    : [ 'MFnUnitAttribute' ],
+	'angle3'   : [ 'MFnUnitAttribute', 'MVector' ],
+
+	'ramp'     : [ 'MRampAttribute', 'MFloatArray', 'MIntArray' ],
+	'typed'    : [ 'MFnTypedAttribute', 'MFnData' ],
+	'compound' : [ 'MFnCompoundAttribute' ],
+}
+
+## attribute function set declared in initialize() for each plug type
+fn_set_mapping_table = {
+	'short'    : ( 'MFnNumericAttribute', 'nAttr' ),
+	'float'    : ( 'MFnNumericAttribute', 'nAttr' ),
+	'float3'   : ( 'MFnNumericAttribute', 'nAttr' ),
+	'double'   : ( 'MFnNumericAttribute', 'nAttr' ),
+	'double3'  : ( 'MFnNumericAttribute', 'nAttr' ),
+	'matrix'   : ( 'MFnMatrixAttribute',  'mAttr' ),
+	'point'    : ( 'MFnNumericAttribute', 'nAttr' ),
+	'bool'     : ( 'MFnNumericAttribute', 'nAttr' ),
+	'unit'     : ( 'MFnUnitAttribute',    'uAttr' ),
+
+	'angle'    : ( 'MFnUnitAttribute',    'uAttr' ),
+	'angle3'   : ( 'MFnUnitAttribute',    'uAttr' ),
+
+	'typed'    : ( 'MFnTypedAttribute',    'tAttr' ),
+	'compound' : ( 'MFnCompoundAttribute', 'cAttr' ),
+}
+
+## ramp interpolation name -> MRampAttribute constant
+ramp_interpolations = OrderedDict( [
+	( 'none',   'MRampAttribute::kNone' ),
+	( 'linear', 'MRampAttribute::kLinear' ),
+	( 'smooth', 'MRampAttribute::kSmooth' ),
+	( 'spline', 'MRampAttribute::kSpline' ),
+] )
+
+## code for the default wiring, where every input affects every output
+affects_all_code = """	// attributeAffects maps
+	std::map<std::string, MObject *> all_inputs = {{
+{inputs}
+	}};
+
+	std::map<std::string, MObject *> all_outputs = {{
+{outputs}
+	}};
+
+	for (const auto &input_pair : all_inputs) {{
+		for (const auto &output_pair : all_outputs) {{
+			stat = attributeAffects(*input_pair.second, *output_pair.second);
+			if (!stat) {{
+				sprintf(msg, "attributeAffects: %s >> %s",
+						(const char *)input_pair.first.c_str(),
+						(const char *)output_pair.first.c_str());
+				stat.perror(msg); 
+				return stat;
+			}}
+		}}
+	}}
+"""
+
+## compute() body when every output depends on every input
+compute_all_code = """	if( {plug_check} ) {{
+{profile_compute}		// collect all inputs
+{profile_collect_begin}{input_collection}{profile_collect_end}
+		// call external compute function
+{node_main}
+		// set and clean all outputs
+{profile_set_begin}{output_setting}{profile_set_end}		return MS::kSuccess;
+	}}
+"""
+
+## compute() dispatch to the branch of the requested output
+compute_switch_code = """	switch( {class_name}_branch(plug) ) {{
+{branches}	}}
+"""
+
+## compute() branch for one group of outputs sharing the same inputs
+compute_group_code = """	// {output_names}
+	case {branch}: {{
+{profile_compute}		// collect the inputs affecting these outputs
+{profile_collect_begin}{input_collection}{profile_collect_end}
+		// call external compute function
+{node_main}
+		// set and clean these outputs
+{profile_set_begin}{output_setting}{profile_set_end}		return MS::kSuccess;
+	}}
+"""
+
+## compute() branch of each output, looked up in an index built on the
+## first call, when initialize() has created the attributes
+branch_code = """
+// compute() branch handling each output
+static int {class_name}_branch( const MPlug &plug )
+{{
+	static const AttributeIndex index {{
+{entries}	}};
+
+	return index.find( plug );
+}}
+"""
+
+## MProfiler instrumentation for compute(), emitted only for profiled
+## nodes. The category is registered once in plugin_main.cpp.
+profile_compute_code = """		MProfilingScope profile_compute(plugin_profiler_category, MProfiler::kColorC_L1,
+				"{class_name}", "compute");
+"""
+profile_begin_code = """		const int profile_{event} = MProfiler::eventBegin(plugin_profiler_category, MProfiler::{color},
+				"{class_name}", "{label}");
+"""
+profile_end_code = """		MProfiler::eventEnd(profile_{event});
+"""
+
+## node_main() call of a memoized node, skipped while the inputs match
+## the ones of its last run; never skipped on a branch's first compute
+memoize_code = """		// skipped while the inputs match the last run
+{hashes}		if( !{valid} || {changed} ) {{
+{call}{store}			{valid} = true;
+		}}
+"""
+
+## (event, color, label) for each instrumented phase of compute()
+profile_events = (
+	( 'collect', 'kColorA_L2', 'collect inputs' ),
+	( 'main',    'kColorE_L2', 'node_main' ),
+	( 'set',     'kColorB_L2', 'set outputs' ),
+)
+
+## array inputs are gathered into their std::vector member in one pass;
+## resize() keeps the capacity from the last evaluation
+collect_array_code = """		{{
+			MArrayDataHandle ah_{name} = data.inputArrayValue({attr_name});
+			const unsigned int count = ah_{name}.elementCount();
+			{name}.resize(count);
+			for (unsigned int i = 0; i < count; ++i, ah_{name}.next()) {{
+				{name}[i] = ah_{name}.inputValue().{grab_type}();
+			}}
+		}}
+"""
+
+## ramps are resampled into their lookup table only after
+## setDependentsDirty() saw them change
+collect_ramp_code = """		if( {name}.dirty() ) {{
+			MRampAttribute r_{name}( node, {attr_name} );
+			{name}.sample( r_{name} );
+		}}
+"""
+
+## setDependentsDirty() code marking the lookup table of a ramp stale; an
+## edit dirties the ramp's element or one of the element's children
+dependents_dirty_code = """	// ramps resample their lookup table on the next compute()
+	const MObject dirtied = (plugBeingDirtied.isChild() ? plugBeingDirtied.parent() : plugBeingDirtied).attribute();
+{checks}
+
+"""
+
+## postConstructor() code setting the default entries of a ramp
+ramp_defaults_code = """	{{
+		MRampAttribute ramp( thisMObject(), {attr_name} );
+		MFloatArray positions, values;
+		MIntArray interps;
+{entries}		ramp.setRamp( values, positions, interps );
+	}}
+"""
+
+## array outputs are written through a builder sized up front
+set_array_code = """		{{
+			MArrayDataHandle ah_{name} = data.outputArrayValue({attr_name});
+			const unsigned int count = (unsigned int){name}.size();
+			MArrayDataBuilder builder_{name}(&data, {attr_name}, count);
+			for (unsigned int i = 0; i < count; ++i) {{
+				builder_{name}.addElement(i).{set_type}({value});
+			}}
+			ah_{name}.set(builder_{name});
+{clean}		}}
+
+"""
+
+## element count above which element-wise array expressions are split
+## across Maya's thread pool
+default_parallel_threshold = 16384
+
+## code shared by every node that needs it, emitted once into common.h
+helper_code = {
+	'profiler' : """#include <maya/MProfiler.h>
+
+// profiler category of the plugin, registered in initializePlugin()
+extern int plugin_profiler_category;
+""",
+
+	'hash_buffer' : """// 64-bit FNV-1a hash of an array plug's gathered elements, used by
+// memoized nodes to tell whether the array changed since the last compute
+template <typename T>
+inline uint64_t hash_buffer(const std::vector<T> &values) {
+	const unsigned char *bytes = (const unsigned char *)values.data();
+	const size_t size = values.size() * sizeof(T);
+	uint64_t hash = 14695981039346656037ULL ^ (uint64_t)values.size();
+	for (size_t i = 0; i < size; ++i) {
+		hash ^= bytes[i];
+		hash *= 1099511628211ULL;
+	}
+	return hash;
+}
+""",
+
+	'attribute_index' : """#include <unordered_map>
+#include <utility>
+#include <maya/MObjectHandle.h>
+
+// maps attributes to the compute() branch handling them, so compute()
+// finds its branch with one hash lookup instead of testing the plug
+// against every output; a child plug resolves to its parent once
+class AttributeIndex {
+public:
+	AttributeIndex(std::initializer_list< std::pair<MObject, int> > entries) {
+		for (const auto &entry : entries)
+			index_[MObjectHandle(entry.first).hashCode()].push_back(entry);
+	}
+
+	int find(const MObject &attribute) const {
+		const auto it = index_.find(MObjectHandle(attribute).hashCode());
+		if (it == index_.end())
+			return -1;
+		for (const auto &entry : it->second)
+			if (entry.first == attribute)
+				return entry.second;
+		return -1;
+	}
+
+	int find(const MPlug &plug) const {
+		return find(plug.isChild() ? plug.parent().attribute() : plug.attribute());
+	}
+
+private:
+	std::unordered_map< unsigned int, std::vector< std::pair<MObject, int> > > index_;
+};
+""",
+
+	'ramp_table' : """#include <atomic>
+#include <maya/MRampAttribute.h>
+
+// curve ramp sampled into a fixed-resolution lookup table, so node_main()
+// reads it with one interpolated lookup instead of a getValueAtPosition()
+// call per sample. Resampled only after setDependentsDirty() marked it.
+class RampTable {
+public:
+	static const int resolution = 256;
+
+	RampTable() : dirty_(true), version_(0) {
+		std::fill(table_, table_ + resolution + 1, 0.0f);
+	}
+
+	void invalidate() { dirty_ = true; }
+	bool dirty() const { return dirty_; }
+
+	// changes with every resample, for memoized nodes
+	unsigned int version() const { return version_; }
+
+	void sample(MRampAttribute &ramp) {
+		// cleared first, so an edit made while sampling is not lost
+		dirty_ = false;
+		for (int i = 0; i <= resolution; ++i)
+			ramp.getValueAtPosition((float)i / (float)resolution, table_[i]);
+		++version_;
+	}
+
+	// value at position, linearly interpolated; positions outside [0, 1]
+	// read the ends of the ramp
+	float operator()(float position) const {
+		if (!(position > 0.0f))
+			return table_[0];
+		if (position >= 1.0f)
+			return table_[resolution];
+		const float x = position * (float)resolution;
+		const int i = std::min((int)x, resolution - 1);
+		return table_[i] + (table_[i + 1] - table_[i]) * (x - (float)i);
+	}
+
+private:
+	float table_[resolution + 1];
+	std::atomic<bool> dirty_;
+	unsigned int version_;
+};
+""",
+
+	'parallel_for' : """#include <maya/MThreadPool.h>
+#include <maya/MThreadUtils.h>
+
+// runs fn(begin, end) over [0, count) in chunks on Maya's thread pool,
+// or serially when count is below threshold
+template <typename F>
+struct ParallelForTask {
+	const F *fn;
+	size_t begin;
+	size_t end;
+};
+
+template <typename F>
+MThreadRetVal parallel_for_task(void *data) {
+	const ParallelForTask<F> *task = (const ParallelForTask<F> *)data;
+	(*task->fn)(task->begin, task->end);
+	return (MThreadRetVal)0;
+}
+
+template <typename F>
+void parallel_for_region(void *data, MThreadRootTask *root) {
+	std::vector< ParallelForTask<F> > &tasks = *(std::vector< ParallelForTask<F> > *)data;
+	for (size_t k = 0; k < tasks.size(); ++k)
+		MThreadPool::createTask(parallel_for_task<F>, (void *)&tasks[k], root);
+	MThreadPool::executeAndJoin(root);
+}
+
+template <typename F>
+inline void parallel_for(size_t count, size_t threshold, const F &fn) {
+	const size_t threads = (size_t)MThreadUtils::getNumThreads();
+	if (count < threshold || threads < 2 || MThreadPool::init() != MS::kSuccess) {
+		fn((size_t)0, count);
+		return;
+	}
+
+	const size_t chunk = (count + threads - 1) / threads;
+	std::vector< ParallelForTask<F> > tasks;
+	tasks.reserve(threads);
+	for (size_t begin = 0; begin < count; begin += chunk) {
+		ParallelForTask<F> task = { &fn, begin, std::min(begin + chunk, count) };
+		tasks.push_back(task);
+	}
+
+	MThreadPool::newParallelRegion(parallel_for_region<F>, (void *)&tasks);
+	MThreadPool::release();
+}
+""",
+}
+
+## element-wise loop for expressions over array plugs
+array_expression_code = """// element-wise expression over array plugs
+size_t count = {first}.size();
+{counts}{resizes}
+{pointers}{scalars}{invariant}
+parallel_for(count, {threshold}, [=](size_t begin, size_t end) {{
+	for (size_t i = begin; i < end; ++i) {{
+{statements}	}}
+}});
+"""
+
+p_identifier = re.compile( r'(?<![\w.])([A-Za-z_]\w*)' )
+
 ## ----------------------------------------------------------------------
 class MPxNodeCPPException(Exception):
 	pass
 
 
+## ----------------------------------------------------------------------
+def ramp_entries( default ):
+	"""
+	Reads the default of a ramp plug: a list of [position, value] or
+	[position, value, interpolation] entries, e.g. [[0, 0], [1, 1, "smooth"]].
+	Interpolation is linear unless given.
+	:return: list of (position, value, interpolation name) tuples.
+	:raises MPxNodeCPPException: if the default is not such a list.
+	"""
+	if not isinstance( default, list ):
+		raise MPxNodeCPPException( "expected a list of [position, value] entries as the default of a ramp." )
+
+	result = []
+	for entry in default:
+		if not isinstance( entry, list ) or len( entry ) not in (2, 3) or \
+				any( [ isinstance( x, bool ) or not isinstance( x, (int, float) ) for x in entry[:2] ] ):
+			raise MPxNodeCPPException( "ramp entry %s is not [position, value] or [position, value, interpolation]." % \
+				(entry,) )
+
+		interp = entry[2] if len( entry ) == 3 else 'linear'
+		if interp not in ramp_interpolations:
+			raise MPxNodeCPPException( "unknown ramp interpolation %s (expected one of %s)." % \
+				(interp, ', '.join( ramp_interpolations.keys() )) )
+
+		result.append( (entry[0], entry[1], interp) )
+
+	return( result )
+
+
+## ----------------------------------------------------------------------
+class Plug(object):
+	"""
+	Definition of a single node plug. Slotted, since large nodes carry
+	hundreds of these and every generation pass walks all of them.
+	"""
+
+	__slots__ = ( 'name', 'default', 'type', 'is_input', 'min', 'max', 'array',
+				'keyable', 'storable', 'readable', 'writable', 'cached', 'hidden',
+				'short_name', 'attr_name', 'affects' )
+
+	def __init__( self, name, default, is_input, type='float', min=None, max=None,
+					array=None, keyable=None, storable=None, readable=None,
+					writable=None, cached=None, hidden=None, short_name=None,
+					affects=None ):
+		self.name       = name
+		self.default    = default
+		self.type       = type
+		self.is_input   = True if is_input else False
+		self.min        = min
+		self.max        = max
+		self.array      = array
+		self.keyable    = keyable
+		self.storable   = storable
+		self.readable   = readable
+		self.writable   = writable
+		self.cached     = cached
+		self.hidden     = hidden
+		self.short_name = short_name
+		self.affects    = list( affects ) if affects is not None else None
+
+		self.attr_name  = ('i' if is_input else 'o') + name[0].upper() + name[1:]
+
+
 ## ----------------------------------------------------------------------
 class MPxNodeCPP(object):
 
-	def __init__( self, class_name, node_name, typeID, expression="" ):
+	kind = 'node'                 ## spec 'kind' this class generates
+	registration_type = None      ## MPxNode::Type passed to registerNode(), if not the default
+
+	def __init__( self, class_name, node_name, typeID, expression="", template_dir=None ):
 		"""
 		Standard initializer.
 		:param class_name: Name of subclass.
 		:param typeID: MTypeID value. Should be from a registered node block.
 		:param expression: string. For simple nodes, you can drop in the 
 				code here.
+		:param template_dir: Optional folder of user templates that override
+				the ones shipped with nodesmith.
 		"""
 		self.class_name = class_name
 		self.node_name = node_name
 		if not isinstance(typeID, StringTypes):
-			self.typeID = '0x%6x' % typeID    ## converts to hex
+			self.typeID = '0x%06x' % typeID    ## converts to hex
 		else:
 			self.typeID = typeID
-		self.attributes = {}
+		self.attributes = OrderedDict()
 		self.expression = expression
+		self.template_dir = template_dir
+		self.spec_hash = None    ## set by Plugin.from_json for incremental regeneration
+		self.parallel_threshold = default_parallel_threshold
+		self.constants = {}      ## plugin constants, folded into the expression
+		self.code = ""           ## raw C++ pasted into node_main() after the expression
+		self.profile = False     ## wrap compute() in MProfiler events
+		self.memoize = False     ## skip node_main() while the inputs are unchanged
+		self.scheduling = None   ## scheduling name asked for by the spec, if any
+		self.scheduling_type = None   ## set by check_scheduling()
+
+		self._index = None
+
+	@property
+	def templates(self):
+		return( get_registry(self.template_dir) )
+
+	def build_index(self):
+		"""
+		Builds the plug orderings the generators walk: declaration order and
+		alphabetical order, each split into inputs and outputs. Cached until
+		the next add_plug().
+		"""
+		if self._index is None:
+			plugs = list( self.attributes.values() )
+			ordered = sorted( plugs, key=lambda x: x.name )
+
+			self._index = {
+				'inputs':         [ x for x in plugs if x.is_input ],
+				'outputs':        [ x for x in plugs if not x.is_input ],
+				'sorted':         ordered,
+				'sorted_inputs':  [ x for x in ordered if x.is_input ],
+				'sorted_outputs': [ x for x in ordered if not x.is_input ],
+			}
+
+		return( self._index )
 
 	@property
 	def sorted_attributes(self):
 		"""
 		Sometimes it's useful to have the attribute names
-		in sorted order, so this sorts and re-pairs for
+		in sorted order, so this returns them pre-paired for
 		quick looping.
 
-		:return: zip() of alpabetically-sorted name:data pairs
+		:return: list of alpabetically-sorted (name, Plug) pairs
+		"""
+		return( [ (x.name, x) for x in self.build_index()['sorted'] ] )
+
+	@property
+	def inputs(self):
+		""" :return: input Plugs in declaration order. """
+		return( self.build_index()['inputs'] )
+
+	@property
+	def outputs(self):
+		""" :return: output Plugs in declaration order. """
+		return( self.build_index()['outputs'] )
+
+	@property
+	def sorted_inputs(self):
+		""" :return: input Plugs sorted by name. """
+		return( self.build_index()['sorted_inputs'] )
+
+	@property
+	def sorted_outputs(self):
+		""" :return: output Plugs sorted by name. """
+		return( self.build_index()['sorted_outputs'] )
+
+	@property
+	def sparse_affects(self):
+		""" :return: True if any output declares which inputs affect it. """
+		return( any( x.affects is not None for x in self.outputs ) )
+
+	def affecting_inputs(self, output):
+		"""
+		:return: sorted list of the input Plugs affecting an output Plug.
+		"""
+		if output.affects is None:
+			return( self.sorted_inputs )
+
+		names = set( output.affects )
+		result = [ x for x in self.sorted_inputs if x.name in names ]
+
+		if len( result ) != len( names ):
+			unknown = names.difference( [ x.name for x in result ] )
+			raise MPxNodeCPPException( "Output %s.%s: 'affects' names unknown input(s) %s." % \
+				(self.class_name, output.name, ', '.join( sorted(unknown) )) )
+
+		return( result )
+
+	def affects_groups(self):
 		"""
-		names = sorted( self.attributes.keys() )
-		all_data = [ self.attributes[x] for x in names ]
-		return( zip(names, all_data) )
+		Groups outputs that are affected by the same inputs, so compute()
+		can handle each group in one branch.
+		:return: list of (inputs, outputs) pairs of sorted Plug lists, ordered
+			by the first output name in each group.
+		"""
+		groups = OrderedDict()
+
+		for output in self.sorted_outputs:
+			inputs = self.affecting_inputs( output )
+			key = tuple( x.name for x in inputs )
+			if not key in groups:
+				groups[key] = ( inputs, [ ] )
+			groups[key][1].append( output )
+
+		return( list( groups.values() ) )
 
 	def add_plug( self, plug, default, is_input, type='float', min=None, max=None, 
 					array=None, keyable=None, storable=None, readable=None, 
-					writable=None, cached=None, hidden=None, short_name=None ):
+					writable=None, cached=None, hidden=None, short_name=None,
+					affects=None ):
 		"""
 		Adds a definition for a node plug.
 		:param plug: The name of the plug.
@@ -153,33 +681,27 @@ class MPxNodeCPP(object):
 			box or in the AE.
 		:param short_name: If not None, specifies the short name of the plug.
 			If None, the long name will also be used as the short name.
-		:return: No return value
+		:param affects: Outputs only. If not None, the names of the inputs that
+			affect this output; the rest are neither wired nor read when it is
+			computed. If None, every input affects it.
+		:return: The new Plug.
 		"""
 
 		if not type in types_mapping_table:
 			raise MPxNodeCPPException( "Invalid plug type %s." % type )
 
-		attr_name = 'i' if is_input else 'o'
-		attr_name += plug[0].upper() + plug[1:]
-
-		attribute_data = {
-			"default":    default,
-			"type":       type,
-			"is_input":   True if is_input else False,
-			"min":        min,
-			"max":        max,
-			"array":      array,
-			"keyable":    keyable,
-			"storable":   storable,
-			"readable":   readable,
-			"writable":   writable,
-			"cached":     cached,
-			"hidden":     hidden,
-			"short_name": short_name,
-			"attr_name":  attr_name,
-		}
-
-		self.attributes[plug] = attribute_data
+		if is_input and affects is not None:
+			raise MPxNodeCPPException( "Input %s.%s cannot declare 'affects'." % (self.class_name, plug) )
+
+		result = Plug( plug, default, is_input, type=type, min=min, max=max,
+				array=array, keyable=keyable, storable=storable, readable=readable,
+				writable=writable, cached=cached, hidden=hidden, short_name=short_name,
+				affects=affects )
+
+		self.attributes[plug] = result
+		self._index = None
+
+		return( result )
 
 	def add_input_plug(self, plug, default, type='float', min=None, max=None, array=False,
 					keyable=True, storable=None, cached=None,
@@ -191,27 +713,19 @@ class MPxNodeCPP(object):
 
 	def add_output_plug( self, plug, default, type='float', min=None, max=None, array=False,
 						keyable=False, storable=None, cached=None,
-						hidden=None, short_name=None ):
+						hidden=None, short_name=None, affects=None ):
 
 		return (self.add_plug( plug, default, False, type=type, min=min, max=max, array=array,
 			   storable=storable, readable=True, writable=False, cached=cached,
-			   hidden=hidden, short_name=short_name ))
+			   hidden=hidden, short_name=short_name, affects=affects ))
 
 	def generate_header_attributes(self, inputs=False ):
-		result = ""
-		for name, data in self.attributes.items():
-			if data['is_input'] is inputs:
-				result += "\tstatic MObject %s;\n" % (data['attr_name'])
-		return(result)
+		plugs = self.inputs if inputs else self.outputs
+		return( ''.join( [ "\tstatic MObject %s;\n" % x.attr_name for x in plugs ] ) )
 
 	def generate_cpp_static_attributes(self, inputs=False ):
-		result = ""
-
-		for name, data in self.attributes.items():
-			if data['is_input'] is inputs:
-				result += "MObject %s::%s;\n" % (self.class_name, data['attr_name'])
-
-		return(result)
+		plugs = self.inputs if inputs else self.outputs
+		return( ''.join( [ "MObject %s::%s;\n" % (self.class_name, x.attr_name) for x in plugs ] ) )
 
 	def generate_cpp_constants(self):
 		result = ""
@@ -219,18 +733,80 @@ class MPxNodeCPP(object):
 		return (result)
 
 	def generate_private_variables(self):
-		result = ""
+		result = []
+
+		## value-initialized: with sparse affects node_main() also reads the
+		## inputs a branch did not collect, which stay zero until another
+		## branch does
+		for plug in self.attributes.values():
+			variable_type = types_mapping_table[plug.type]
+			if plug.array:
+				variable_type = 'std::vector<%s>' % variable_type
+
+			result.append( '\t{variable_type} {name} {{}};\n'.format( 
+				variable_type=variable_type, name=plug.name
+			) )
+
+		if self.memoize:
+			result.append( '\n\t// inputs of the last node_main() run\n' )
+			for plug in self.sorted_inputs:
+				if plug.array:
+					result.append( '\tuint64_t hash_{name} {{}};\n\tuint64_t prev_hash_{name} {{}};\n'.format( name=plug.name ) )
+				elif plug.type == 'ramp':
+					result.append( '\tunsigned int prev_{name} {{}};\n'.format( name=plug.name ) )
+				else:
+					result.append( '\t{variable_type} prev_{name} {{}};\n'.format(
+						variable_type=types_mapping_table[plug.type], name=plug.name ) )
 
-		for name, data in self.attributes.items():
-			default, aType, is_input, aMin, aMax, array, keyable, storable, readable, \
-				writable, cached, hidden, short_name, attr_name = self.extract_attribute_data( data )
+			## set once a compute() branch has run node_main(); until then
+			## the inputs it reads were never recorded
+			if self.sparse_affects:
+				result.append( '\tbool memo_valid[{count}] {{}};\n'.format( count=len( self.affects_groups() ) ) )
+			else:
+				result.append( '\tbool memo_valid {false};\n' )
 
-			if not array:
-				result += '\t{variable_type} {name};\n'.format( 
-					variable_type=types_mapping_table[data['type']], name=name
-				)
+		return( ''.join(result) )
 
-		return(result)
+	def required_includes(self):
+		"""
+		Works out the headers this node needs beyond common.h from its plug
+		types, so a translation unit only parses what it uses.
+		:return: sorted list of header names, as in #include <...>.
+		"""
+		maya = set()
+		for plug in self.attributes.values():
+			maya.update( include_mapping_table.get( plug.type, [] ) )
+			if plug.array:
+				maya.update( [ 'MArrayDataHandle', 'MArrayDataBuilder' ] )
+
+		## values the expression can build from scalars
+		names = set( p_identifier.findall( self.expression ) )
+		for name, header in [ ('vector', 'MVector'), ('fvector', 'MFloatVector'), ('point', 'MPoint') ]:
+			if name in names:
+				maya.add( header )
+
+		std = set()
+		if not self.sparse_affects and self.inputs and self.outputs:
+			std.add( 'map' )
+
+		return( sorted( std ) + sorted( [ 'maya/%s.h' % x for x in maya ] ) )
+
+	def generate_includes(self):
+		return( ''.join( [ '#include <%s>\n' % x for x in self.required_includes() ] ) )
+
+	def generate_attribute_fn_sets(self):
+		"""
+		Declares the attribute function sets initialize() uses.
+		"""
+		fn_sets = sorted( set( [ fn_set_mapping_table[x.type] for x in self.attributes.values() \
+				if x.type in fn_set_mapping_table ] ) )
+
+		result = [ '\t{0:<20} {1};\n'.format( mfn, name ) for mfn, name in fn_sets ]
+
+		if any( [ x.type == 'matrix' for x in self.attributes.values() ] ):
+			result.append( '\n\tMFloatMatrix         identity;\n\tidentity.setToIdentity();\n' )
+
+		return( ''.join(result) )
 
 	def generate_include(self):
 		"""
@@ -238,11 +814,13 @@ class MPxNodeCPP(object):
 		:return: The string for the header file all constructed.
 		"""
 
-		with open( os.sep.join( [os.path.dirname( __file__ ), 'mpxnode_template.h'] ), 'r' ) as fp:
-			template = fp.read()
+		if self.scheduling_type is None:
+			self.check_scheduling()
 
-		result = template.format(
+		result = self.templates.render( 'mpxnode_template.h',
 			class_name=self.class_name,
+			includes=self.generate_includes(),
+			scheduling=scheduling_values[self.scheduling_type],
 			inputs=self.generate_header_attributes( inputs=True ),
 			outputs=self.generate_header_attributes( inputs=False ),
 			private_variables=self.generate_private_variables()
@@ -250,210 +828,376 @@ class MPxNodeCPP(object):
 
 		return( result )
 
-	def generate_cpp_plug_check(self, inputs=False):
-		result = None
-
-		for name, data in self.attributes.items():
-			if data['is_input'] is inputs:
-				if result is None:
-					result = "\t\t   "
-				else:
-					result += "\t\t|| "
-				result += "plug == {attr_name} || plug.parent() == {attr_name}\n".format( attr_name=data['attr_name'] )
+	def branch_groups(self):
+		"""
+		:return: list of the sorted outputs each compute() branch handles,
+			in branch order; one branch for all of them without sparse
+			affects.
+		"""
+		if not self.sparse_affects:
+			return( [ self.sorted_outputs ] if self.outputs else [] )
 
-		return(result)
+		return( [ outputs for _, outputs in self.affects_groups() ] )
 
-	def extract_attribute_data(self, data):
-		default    = data.get('default', None)
-		aType      = data.get('type', None)
-		is_input   = data.get('is_input', None)
-		aMin       = data.get('min', None)
-		aMax       = data.get('max', None)
-		array      = data.get('array', None)
-		keyable    = data.get('keyable', True if is_input else False)
-		storable   = data.get('storable', True if is_input else False)
-		readable   = data.get('readable', False if is_input else True)
-		writable   = data.get('writable', True if is_input else False)
-		cached     = data.get('cached', True if is_input else False)
-		hidden     = data.get('hidden', None)
-		short_name = data.get('short_name', None)
-		attr_name  = data.get('attr_name', None)
-
-		return( default, aType, is_input, aMin, aMax, array, keyable, storable,
-				readable, writable, cached, hidden, short_name, attr_name )
-
-	def generate_cpp_collect_inputs(self):
-		result = ""
+	def generate_cpp_branch_index(self):
+		"""
+		Generates the <class>_branch() function compute() dispatches on.
+		"""
+		entries = []
+		for branch, outputs in enumerate( self.branch_groups() ):
+			for plug in outputs:
+				entries.append( '\t\t{{ {class_name}::{attr_name}, {branch} }},\n'.format(
+					class_name=self.class_name, attr_name=plug.attr_name, branch=branch ) )
 
-		for name, data in self.sorted_attributes:
+		if not entries:
+			return( '' )
 
-			default, aType, is_input, aMin, aMax, array, keyable, storable, \
-				readable, writable, cached, hidden, short_name, attr_name = self.extract_attribute_data( data )
+		return( branch_code.format( class_name=self.class_name, entries=''.join(entries) ) )
 
-			if is_input is True:
-				if not array:
-					result += "\t\t{name} = data.inputValue({attr_name}).{grab_type}();\n".format(
-						name=name,
-						attr_name=attr_name,
-						grab_type = grab_mapping_table[aType]
-					)
+	def generate_cpp_plug_check(self):
+		"""
+		:return: C++ condition that holds if compute() was asked for one of
+			the node's outputs.
+		"""
+		if not self.outputs:
+			return( 'false' )
+
+		return( '%s_branch(plug) >= 0' % self.class_name )
+
+	def generate_cpp_collect_inputs(self, plugs=None):
+		result = []
+
+		for plug in (self.sorted_inputs if plugs is None else plugs):
+			if plug.type == 'ramp':
+				result.append( collect_ramp_code.format( name=plug.name, attr_name=plug.attr_name ) )
+			elif not plug.array:
+				result.append( "\t\t{name} = data.inputValue({attr_name}).{grab_type}();\n".format(
+					name=plug.name,
+					attr_name=plug.attr_name,
+					grab_type = grab_mapping_table[plug.type]
+				) )
+			else:
+				result.append( collect_array_code.format(
+					name=plug.name,
+					attr_name=plug.attr_name,
+					grab_type = grab_mapping_table[plug.type]
+				) )
+
+		return( ''.join(result) )
+
+	def generate_cpp_set_outputs(self, plugs=None, clean=False):
+		result = []
+
+		for plug in (self.sorted_outputs if plugs is None else plugs):
+			if not plug.array:
+				code = "\t\tMDataHandle h_{name} = data.outputValue({attr_name});\n"
+				if plug.type == 'angle':
+					code += "\t\th_{name}.{set_type}(RAD2DEG({name}));\n"
 				else:
-					raise NotImplementedError( "array plugs not implemented for value collection yet." )
+					code += "\t\th_{name}.{set_type}({name});\n"
+				if clean:
+					code += "\t\th_{name}.setClean();\n"
+				code += "\n"
+
+				result.append( code.format(
+					name=plug.name,
+					attr_name=plug.attr_name,
+					set_type=set_mapping_table[plug.type]
+				) )
+			else:
+				value = '{name}[i]'.format( name=plug.name )
+				if plug.type == 'angle':
+					value = 'RAD2DEG(%s)' % value
+
+				result.append( set_array_code.format(
+					name=plug.name,
+					attr_name=plug.attr_name,
+					set_type=set_mapping_table[plug.type],
+					value=value,
+					clean='\t\t\tah_{name}.setAllClean();\n'.format( name=plug.name ) if clean else ''
+				) )
+
+		return( ''.join(result) )
 
-		return (result)
+	def generate_set_all_clean(self):
+		"""
+		Generates set_all_clean(), kept for hand-written code; the generated
+		compute() cleans each output through the handle it set it with.
+		"""
+		result = []
 
-	def generate_cpp_set_outputs(self):
-		result = ""
+		for plug in self.sorted_outputs:
+			if not plug.array:
+				result.append( "\tdata.outputValue({attr_name}).setClean();\n".format( attr_name=plug.attr_name ) )
+			else:
+				result.append( "\tdata.outputArrayValue({attr_name}).setAllClean();\n".format( attr_name=plug.attr_name ) )
 
-		for name, data in self.sorted_attributes:
-
-			default, aType, is_input, aMin, aMax, array, keyable, storable, \
-				readable, writable, cached, hidden, short_name, attr_name = self.extract_attribute_data( data )
-
-			if is_input is not True:
-				if not array:
-					code = "\t\tMDataHandle h_{name} = data.outputValue({attr_name});\n"
-					if aType == 'angle':
-						code += "\t\th_{name}.{set_type}(RAD2DEG({name}));\n\n"
-					else:
-						code += "\t\th_{name}.{set_type}({name});\n\n"
-
-					code  = code.format(
-						name=name,
-						attr_name=attr_name,
-						set_type=set_mapping_table[aType]
-					)
-					result += code
-				else:
-					raise NotImplementedError( "array plugs not implemented for setting yet." )
+		return( ''.join(result) )
 
-		return (result)
+	def generate_cpp_attrib_creation(self, is_input):
+		result = []
+
+		for plug in (self.sorted_inputs if is_input else self.sorted_outputs):
+			name = plug.name
+			short_name = plug.short_name if plug.short_name else name
+			mfn = 'nAttr'
+
+			if plug.type == 'ramp':
+				## ramps are compound arrays created in one call and take no
+				## function set settings
+				if not plug.is_input or plug.array:
+					raise MPxNodeCPPException( "Node %s: ramp %s can only be a single input." % \
+						(self.class_name, name) )
+				result.append( '\t{attr_name} = MRampAttribute::createCurveRamp( "{name}", "{short_name}" );\n'.format(
+					attr_name=plug.attr_name, name=name, short_name=short_name ) )
+				result.append( '\tCHECK_MSTATUS_AND_RETURN_IT( addAttribute({attr_name}) );\n\n'.format(
+					attr_name=plug.attr_name ) )
+				continue
+
+			if plug.type == 'float':
+				create = '\t{attr_name} = {mfn}.create( "{name}", "{short_name}", MFnNumericData::kFloat, {default} );\n'
+
+			elif plug.type == "angle":
+				mfn = 'uAttr'
+				create = '\t{attr_name} = {mfn}.create( "{name}", "{short_name}", MFnUnitAttribute::kAngle, {default} );\n'
+
+			elif plug.type == 'matrix':
+				mfn = 'mAttr'
+				create = '\t{attr_name} = {mfn}.create( "{name}", "{short_name}" );\n'
+				create += '\t\t{mfn}.setDefault( identity );\n'
+
+			else:
+				raise NotImplementedError( "Plugs of %s type are not yet implemented." % plug.type )
+
+			result.append( create.format(
+				attr_name=plug.attr_name,
+				mfn=mfn,
+				name=name,
+				short_name=short_name,
+				default=plug.default
+			) )
+
+			result.append( '\t\t{mfn}.setStorable({value});\n'.format( mfn=mfn, value='true' if plug.storable else 'false' ) )
+			result.append( '\t\t{mfn}.setKeyable({value});\n'.format(  mfn=mfn, value='true' if plug.keyable else 'false' ) )
+			result.append( '\t\t{mfn}.setReadable({value});\n'.format( mfn=mfn, value='true' if plug.readable else 'false' ) )
+			result.append( '\t\t{mfn}.setWritable({value});\n'.format( mfn=mfn, value='true' if plug.writable else 'false' ) )
+
+			if plug.array:
+				result.append( '\t\t{mfn}.setArray( true );\n'.format( mfn=mfn ) )
+				if not plug.is_input:
+					result.append( '\t\t{mfn}.setUsesArrayDataBuilder( true );\n'.format( mfn=mfn ) )
+
+			if plug.min is not None:
+				result.append( '\t\t{mfn}.setMin( {min} );\n'.format( mfn=mfn, min=plug.min ) )
+
+			if plug.max is not None:
+				result.append( '\t\t{mfn}.setMax( {max} );\n'.format( mfn=mfn, max=plug.max ) )
+
+			if plug.cached is True:
+				result.append( '\t\t{mfn}.setCached( true );\n'.format( mfn=mfn ) )
+
+			if plug.hidden is True:
+				result.append( '\t\t{mfn}.setHidden( true );\n'.format( mfn=mfn ) )
+
+			## final check
+			result.append( '\tCHECK_MSTATUS_AND_RETURN_IT( addAttribute({attr_name}) );\n\n'.format( attr_name=plug.attr_name ) )
+
+		return( ''.join(result) )
 
-	def generate_set_all_clean(self):
-		result = ""
+	def generate_attribute_creation_affects(self, inputs):
+		## shouldn't matter if this is sorted or not
+		plugs = self.inputs if inputs else self.outputs
 
-		for name, data in self.sorted_attributes:
+		## joining also eats the last comma
+		return( ',\n'.join( [ '\t\t{{ "{name}", & {attr_name} }}'.format( name=x.name, attr_name=x.attr_name ) \
+				for x in plugs ] ) )
 
-			default, aType, is_input, aMin, aMax, array, keyable, storable, \
-				readable, writable, cached, hidden, short_name, attr_name = self.extract_attribute_data( data )
+	def generate_attribute_affects(self):
+		"""
+		Generates the attributeAffects() wiring for initialize(): every input
+		to every output by default, or only the declared pairs if any output
+		lists the inputs affecting it.
+		"""
+		if not self.sparse_affects:
+			return( affects_all_code.format(
+				inputs=self.generate_attribute_creation_affects(True),
+				outputs=self.generate_attribute_creation_affects(False)
+			) )
 
-			if is_input is not True:
-				if not array:
-					result += "\tdata.outputValue({attr_name}).setClean();\n".format( attr_name=attr_name )
-				else:
-					raise NotImplementedError( "array plugs not implemented for all clean." )
+		result = [ '\t// attributeAffects, as declared per output\n' ]
+		for output in self.sorted_outputs:
+			for plug in self.affecting_inputs( output ):
+				result.append( '\tCHECK_MSTATUS_AND_RETURN_IT( attributeAffects({input}, {output}) );\n'.format(
+					input=plug.attr_name, output=output.attr_name ) )
 
-		return (result)
+		return( ''.join(result) )
 
-	def generate_cpp_attrib_creation(self, is_input):
-		result = ""
+	def generate_cpp_profile(self):
+		"""
+		Generates the MProfiler fields of a compute() branch: a scope over
+		the whole branch plus an event per phase, so the Evaluation Toolkit
+		shows data block access apart from node_main(). All empty when
+		profiling is off.
+		:return: dict of compute template field to code.
+		"""
+		result = { 'profile_compute': '' }
 
-		keys = sorted( self.attributes.keys() )
-		data = [ self.attributes[x] for x in keys ]
-
-		for name, data in zip( keys, data ):
-			if data['is_input'] is is_input:
-
-				## for ease of use I'm extracting everything here
-				default, aType, is_input, aMin, aMax, array, keyable, storable, readable, \
-					writable, cached, hidden, short_name, attr_name = self.extract_attribute_data( data )
-
-				mfn = 'nAttr'
-
-				if aType == 'float':
-					create = '\t{attr_name} = {mfn}.create( "{name}", "{short_name}", MFnNumericData::kFloat, {default} );\n'
-					create = create.format(
-						attr_name=attr_name,
-						mfn=mfn,
-						name=name,
-						short_name=short_name if short_name else name,
-						default=default
-					)
-
-					result += create
-
-				elif aType == "angle":
-					mfn = 'uAttr'
-					create = '\t{attr_name} = {mfn}.create( "{name}", "{short_name}", MFnUnitAttribute::kAngle, {default} );\n'
-					create = create.format(
-						attr_name=attr_name,
-						mfn=mfn,
-						name=name,
-						short_name=short_name if short_name else name,
-						default=default
-					)
-
-					result += create
-
-				elif aType == 'matrix':
-					mfn = 'mAttr'
-					create = '\t{attr_name} = {mfn}.create( "{name}", "{short_name}" );\n'
-					create = create.format(
-						attr_name=attr_name,
-						mfn=mfn,
-						name=name,
-						short_name=short_name if short_name else name,
-					)
-
-					create += '\t\t{mfn}.setDefault( identity );\n'.format(mfn=mfn)
-
-					result += create
+		for event, color, label in profile_events:
+			result['profile_%s_begin' % event] = ''
+			result['profile_%s_end' % event] = ''
 
-				else:
-					raise NotImplementedError( "Plugs of %s type are not yet implemented." % aType )
+			if self.profile:
+				result['profile_%s_begin' % event] = profile_begin_code.format(
+					event=event, color=color, class_name=self.class_name, label=label )
+				result['profile_%s_end' % event] = profile_end_code.format( event=event )
 
-				result += '\t\t{mfn}.setStorable({value});\n'.format( mfn=mfn, value='true' if storable else 'false' )
-				result += '\t\t{mfn}.setKeyable({value});\n'.format(  mfn=mfn, value='true' if keyable else 'false' )
-				result += '\t\t{mfn}.setReadable({value});\n'.format( mfn=mfn, value='true' if readable else 'false' )
-				result += '\t\t{mfn}.setWritable({value});\n'.format( mfn=mfn, value='true' if writable else 'false' )
+		if self.profile:
+			result['profile_compute'] = profile_compute_code.format( class_name=self.class_name )
 
-				if array:
-					result += '\t\t{mfn}.setArray( true );\n'.format( mfn=mfn )
-					if is_input:
-						result += '\t\t{mfn}.setUsesArrayDataBuilder( true );\n'.format( mfn=mfn )
+		return( result )
 
-				if aMin is not None:
-					result += '\t\t{mfn}.setMin( {min} );\n'.format( mfn=mfn, min=aMin )
+	def generate_cpp_node_main_call(self, inputs, profile, branch=None):
+		"""
+		Generates the node_main() call of a compute() branch. Memoized nodes
+		compare the inputs just collected against the ones of the last run,
+		arrays by hash, and only call node_main() if any changed or the
+		branch never ran; the outputs are set and cleaned either way.
+
+		A branch only compares and records the inputs it collects. The
+		recorded values are shared by the branches: node_main() sets every
+		output, so whichever branch ran it last, the outputs match the
+		recorded inputs. An input's member only changes when a branch
+		collects it, and that branch then either records it or found it
+		unchanged, so the members node_main() reads always match the
+		recorded values.
+		:param inputs: Inputs collected by the branch.
+		:param profile: Fields from generate_cpp_profile().
+		:param branch: Index of the branch with sparse affects, else None.
+		"""
+		call = profile['profile_main_begin'] + '\t\tnode_main();\n' + profile['profile_main_end']
+		if not self.memoize:
+			return( call )
+
+		## ramps compare the version of their lookup table
+		changed = [ ('hash_{name} != prev_hash_{name}' if x.array else
+				'{name}.version() != prev_{name}' if x.type == 'ramp' else '{name} != prev_{name}').format(
+				name=x.name ) for x in inputs ]
+		store = [ ('\t\t\tprev_hash_{name} = hash_{name};\n' if x.array else
+				'\t\t\tprev_{name} = {name}.version();\n' if x.type == 'ramp' else '\t\t\tprev_{name} = {name};\n').format(
+				name=x.name ) for x in inputs ]
+
+		return( memoize_code.format(
+			hashes=''.join( [ '\t\thash_{name} = hash_buffer({name});\n'.format( name=x.name ) \
+					for x in inputs if x.array ] ),
+			changed='\n\t\t\t|| '.join( changed ) if changed else 'false',
+			call=''.join( [ '\t' + x for x in call.splitlines( True ) ] ),
+			store=''.join( store ),
+			valid='memo_valid' if branch is None else 'memo_valid[%d]' % branch
+		) )
+
+	def generate_cpp_compute(self):
+		"""
+		Generates the body of compute(). With sparse affects there is one
+		branch per group of outputs sharing the same inputs, which only reads
+		those inputs and only sets and cleans those outputs. The branch is
+		looked up once per call through <class>_branch(), and every output
+		handle is fetched once and cleaned through itself.
+		"""
+		profile = self.generate_cpp_profile()
+
+		if not self.sparse_affects:
+			return( compute_all_code.format(
+				plug_check=self.generate_cpp_plug_check(),
+				input_collection=self.generate_cpp_collect_inputs(),
+				output_setting=self.generate_cpp_set_outputs( clean=True ),
+				node_main=self.generate_cpp_node_main_call( self.sorted_inputs, profile ),
+				**profile
+			) )
+
+		result = []
+		for branch, (inputs, outputs) in enumerate( self.affects_groups() ):
+			result.append( compute_group_code.format(
+				output_names=', '.join( [ x.name for x in outputs ] ),
+				branch=branch,
+				input_collection=self.generate_cpp_collect_inputs( inputs ),
+				output_setting=self.generate_cpp_set_outputs( outputs, clean=True ),
+				node_main=self.generate_cpp_node_main_call( inputs, profile, branch ),
+				**profile
+			) )
+
+		return( compute_switch_code.format( class_name=self.class_name, branches='\n'.join(result) ) )
+
+	def check_scheduling(self, main_code=None):
+		"""
+		Scans the node's code for thread-unsafe patterns and settles its
+		scheduling type: the spec's choice if given, otherwise the least
+		restrictive type the scan allows.
+		:param main_code: Contents of an existing, possibly hand-edited,
+			_main.cpp. Without one the node's raw code is scanned; what the
+			expression compiles to only touches the node's own members.
+		:return: list of warning messages.
+		:raises MPxNodeCPPException: if the spec's scheduling is unknown.
+		"""
+		constants = list( self.constants.keys() )
+		findings = scan_code( main_code if main_code is not None else self.code, constants )
 
-				if aMax is not None:
-					result += '\t\t{mfn}.setMax( {max} );\n'.format( mfn=mfn, max=aMax )
+		try:
+			self.scheduling_type, warnings = resolve_scheduling( self.scheduling, findings )
+		except ThreadSafetyException as e:
+			raise MPxNodeCPPException( "Node %s: %s" % (self.class_name, e) )
 
-				if cached is True:
-					result += '\t\t{mfn}.setCached( true );\n'.format( mfn=mfn )
+		return( warnings )
 
-				if hidden is True:
-					result += '\t\t{mfn}.setHidden( true );\n'.format( mfn=mfn )
+	def generate_ae_parameters(self):
+		ae_types = { 'float', 'angle', 'short', 'double' }
 
-				## final check
-				result += '\tCHECK_MSTATUS_AND_RETURN_IT( addAttribute({attr_name}) );\n\n'.format( attr_name=attr_name )
+		result = []
+		for plug in self.sorted_inputs:
+			if plug.type in ae_types:
+				result.append( ('\t' * 5) + 'editorTemplate -addControl "{name}";\n'.format( name=plug.name ) )
+			elif plug.type == 'ramp':
+				result.append( ('\t' * 5) + 'AEaddRampControl($nodeName + ".{name}");\n'.format( name=plug.name ) )
 
-		return (result)
+		return( ''.join(result) )
 
-	def generate_attribute_creation_affects(self, inputs):
-		result = ""
+	def generate_cpp_dependents_dirty(self):
+		"""
+		Generates the part of setDependentsDirty() that marks the lookup
+		tables of the node's ramps stale.
+		"""
+		ramps = [ x for x in self.sorted_inputs if x.type == 'ramp' ]
+		if not ramps:
+			return( '' )
 
-		## shouldn't matter if this is sorted or not
-		for name, data in self.attributes.items():
-			is_input = data.get('is_input', None)
-			if is_input == inputs:
-				result += '\t\t{{ "{name}", & {attr_name} }},\n'.format( name=name, attr_name=data['attr_name'] )
+		checks = [ '\tif( dirtied == {attr_name} )\n\t\t{name}.invalidate();'.format(
+				attr_name=x.attr_name, name=x.name ) for x in ramps ]
 
-		## eat the last comma
-		result = result.rpartition(",\n")[0]
+		return( dependents_dirty_code.format( checks='\n\telse '.join( checks ) ) )
 
-		return (result)
+	def generate_cpp_post_constructor(self):
+		"""
+		Generates the postConstructor() body, which sets the default entries
+		of the node's ramps.
+		"""
+		result = []
 
-	def generate_ae_parameters(self):
-		result = ""
-		ae_types = { 'float', 'angle', 'short', 'double' }
+		for plug in self.sorted_inputs:
+			if plug.type != 'ramp':
+				continue
 
-		for name, data in self.sorted_attributes:
-			is_input = data.get('is_input', None)
-			if is_input:
-				if data['type'] in ae_types:
-					result += ('\t' * 5) + 'editorTemplate -addControl "{name}";\n'.format( name=name )
+			try:
+				entries = ramp_entries( plug.default )
+			except MPxNodeCPPException as e:
+				raise MPxNodeCPPException( "Node %s: input %s: %s" % (self.class_name, plug.name, e) )
 
-		return(result)
+			result.append( ramp_defaults_code.format(
+				attr_name=plug.attr_name,
+				entries=''.join( [ '\t\tpositions.append( {0}f ); values.append( {1}f ); interps.append( {2} );\n'.format(
+						float( position ), float( value ), ramp_interpolations[interp] ) \
+						for position, value, interp in entries ] )
+			) )
+
+		return( ''.join(result) )
 
 	def generate_class(self):
 		"""
@@ -461,16 +1205,16 @@ class MPxNodeCPP(object):
 		:return: The string for the C++ class file all constructed.
 		"""
 
-		with open( os.sep.join( [os.path.dirname( __file__ ), 'mpxnode_template.cpp'] ), 'r' ) as fp:
-			template = fp.read( )
-
-		result = template.format(
+		result = self.templates.render( 'mpxnode_template.cpp',
 			typeID=self.typeID,
 			header_name=self.class_name,
 			class_name=self.class_name,
 			node_name=self.node_name,
 			static_input_attributes=self.generate_cpp_static_attributes( inputs=True ),
-			static_output_attributes=self.generate_cpp_static_attributes( inputs=False ),
+			## compute() dispatches through the branch index, so it goes with
+			## the outputs it indexes
+			static_output_attributes=self.generate_cpp_static_attributes( inputs=False ) + \
+				self.generate_cpp_branch_index(),
 			constants=self.generate_cpp_constants(),
 			plug_check=self.generate_cpp_plug_check(),
 			input_collection=self.generate_cpp_collect_inputs(),
@@ -480,12 +1224,151 @@ class MPxNodeCPP(object):
 			attribute_creation_outputs=self.generate_cpp_attrib_creation(False),
 			attribute_creation_affects_inputs=self.generate_attribute_creation_affects(True),
 			attribute_creation_affects_outputs=self.generate_attribute_creation_affects(False),
+			attribute_affects=self.generate_attribute_affects(),
+			compute=self.generate_cpp_compute(),
 			attribute_editor_parameters=self.generate_ae_parameters(),
-			set_all_clean=self.generate_set_all_clean()
+			attribute_function_sets=self.generate_attribute_fn_sets(),
+			set_all_clean=self.generate_set_all_clean(),
+			dependents_dirty=self.generate_cpp_dependents_dirty(),
+			post_constructor=self.generate_cpp_post_constructor()
 		)
 
 		return(result)
 
+	@property
+	def file_names(self):
+		"""
+		:return: list of the header, class and main file names, in that order.
+		"""
+		return( [ '%s.h' % self.class_name, '%s.cpp' % self.class_name,
+				'%s_main.cpp' % self.class_name ] )
+
+	@property
+	def main_file_name(self):
+		return( '%s_main.cpp' % self.class_name )
+
+	def generate_files(self):
+		"""
+		Generates every file for the node.
+		:return: list of (file name, contents) pairs, in file_names order.
+		"""
+		contents = [ self.generate_include(), self.generate_class(), self.generate_node_main() ]
+		return( list( zip(self.file_names, contents) ) )
+
+	def is_array_expression(self):
+		"""
+		:return: True if the expression refers to any array plug, in which
+			case it is compiled to an element-wise loop.
+		"""
+		names = set( p_identifier.findall( self.expression ) )
+		return( any( x.array and x.name in names for x in self.attributes.values() ) )
+
+	def required_helpers(self):
+		"""
+		:return: set of helper_code names the generated code depends on.
+		"""
+		result = set()
+		if self.is_array_expression():
+			result.add( 'parallel_for' )
+		if self.profile:
+			result.add( 'profiler' )
+		if self.memoize and any( [ x.array for x in self.inputs ] ):
+			result.add( 'hash_buffer' )
+		if self.outputs:
+			result.add( 'attribute_index' )
+		if any( [ x.type == 'ramp' for x in self.inputs ] ):
+			result.add( 'ramp_table' )
+		return( result )
+
+	def expression_symbols(self, element_wise=False):
+		"""
+		:return: dict of plug name to expression Symbol. In element-wise
+			mode array plugs read through their loop pointers and scalar
+			inputs through their local copies.
+		"""
+		result = {}
+
+		for plug in self.attributes.values():
+			kind = plug_kinds.get( plug.type, None )
+			if kind is None:
+				continue
+
+			code = None
+			if element_wise:
+				## ramps are looked up through a pointer, as the loop copies
+				## what it captures
+				code = ('p_%s[i]' if plug.array else '(*s_%s)' if plug.type == 'ramp' else 's_%s') % plug.name
+
+			result[plug.name] = Symbol( plug.name, kind, code=code,
+				writable=not plug.is_input, varying=element_wise and bool(plug.array) )
+
+		return( result )
+
+	def compile_expression(self, element_wise=False):
+		"""
+		Compiles the expression, turning its errors into node errors.
+		:return: (compiler, invariant lines, lines); see expression.Compiler.
+		"""
+		try:
+			return( compile_expression( self.expression, self.expression_symbols( element_wise ),
+					self.constants, element_wise ) )
+		except ExpressionException as e:
+			raise MPxNodeCPPException( "Node %s: bad expression: %s" % (self.class_name, e) )
+
+	def generate_array_expression(self):
+		"""
+		Compiles an expression over array plugs into an element-wise loop
+		over the gathered buffers. Array plugs are read through __restrict
+		pointers so the compiler can vectorize the loop; scalar inputs are
+		copied to locals first, and loop-invariant subexpressions computed
+		before the loop. The loop is split across Maya's thread pool once
+		the element count reaches parallel_threshold.
+		"""
+		compiler, invariant, lines = self.compile_expression( element_wise=True )
+
+		outputs = sorted( [ self.attributes[x] for x in compiler.writes ], key=lambda x: x.name )
+		for plug in outputs:
+			if not plug.array:
+				raise MPxNodeCPPException( "Node %s: element-wise expression assigns scalar output %s." % \
+					(self.class_name, plug.name) )
+
+		arrays  = [ x for x in self.sorted_inputs if x.array and x.name in compiler.reads ]
+		scalars = [ x for x in self.sorted_inputs if not x.array and x.name in compiler.reads ]
+
+		if not arrays:
+			raise MPxNodeCPPException( "Node %s: element-wise expression reads no array input." % self.class_name )
+
+		return( array_expression_code.format(
+			first=arrays[0].name,
+			counts=''.join( [ 'count = std::min(count, {name}.size());\n'.format( name=x.name ) for x in arrays[1:] ] ),
+			resizes=''.join( [ '{name}.resize(count);\n'.format( name=x.name ) for x in outputs ] ),
+			pointers=''.join( [ '{const}{type} * __restrict p_{name} = {name}.data();\n'.format(
+					const='const ' if x.is_input else '', type=types_mapping_table[x.type], name=x.name ) \
+					for x in arrays + outputs ] ),
+			scalars=''.join( [ ('const {type} *s_{name} = &{name};\n' if x.type == 'ramp' else 'const {type} s_{name} = {name};\n').format(
+					type=types_mapping_table[x.type], name=x.name ) for x in scalars ] ),
+			invariant=''.join( [ '%s\n' % x for x in invariant ] ),
+			threshold=self.parallel_threshold,
+			statements=''.join( [ '\t\t%s\n' % x for x in lines ] ),
+		) )
+
+	def generate_expression(self):
+		"""
+		Generates the node_main() body from the expression and any raw code.
+		"""
+		if self.is_array_expression():
+			result = self.generate_array_expression()
+		else:
+			_, invariant, lines = self.compile_expression()
+			result = ''.join( [ '%s\n' % x for x in invariant + lines ] )
+
+		if self.code:
+			result += self.code.rstrip() + '\n'
+
+		## the template indents the first line; blank lines stay blank
+		lines = result.split( '\n' )
+		return( lines[0] + ''.join( [ '\n\t' + x if x else '\n' for x in lines[1:] ] ) )
+
 	def generate_node_main(self):
 		"""
 		Generates the C++ file for the actual compute function. This is left
@@ -493,14 +1376,11 @@ class MPxNodeCPP(object):
 		:return: The string for the C++ class file all constructed.
 		"""
 
-		with open( os.sep.join( [os.path.dirname( __file__ ), 'mpxnode_template_main.cpp'] ), 'r' ) as fp:
-			template = fp.read( )
-
-		result = template.format(
+		result = self.templates.render( 'mpxnode_template_main.cpp',
 			header_name=self.class_name,
 			class_name=self.class_name,
 			node_name=self.node_name,
-			expression=self.expression
+			expression=self.generate_expression()
 		)
 
 		return(result)
@@ -516,6 +1396,3 @@ if __name__ == "__main__":
 
 	print( inst.generate_include() )
 	print( inst.generate_class_main() )
-
-
-
@@ -16,7 +16,7 @@ MTypeId {class_name}::id( {typeID} );
 const struct {{
 	MMatrix identity {{}};
 {constants}
-}} SS {{}}; // need to force the initializer in gcc
+}} {class_name}_SS {{}}; // need to force the initializer in gcc; named per class for unity builds
 
 // ----------------------------------------------------------------------
 /*
@@ -35,7 +35,7 @@ const struct {{
 // ----------------------------------------------------------------------
 MStatus {class_name}::setDependentsDirty( const MPlug &plugBeingDirtied, MPlugArray &affectedPlugs )
 {{
-	/*
+{dependents_dirty}	/*
 	// example usage
 	MObject mob = plugBeingDirtied.attribute();
 	if (mob == iOutputCount)
@@ -47,6 +47,11 @@ MStatus {class_name}::setDependentsDirty( const MPlug &plugBeingDirtied, MPlugAr
 	return MStatus::kSuccess;
 }}
 
+// ----------------------------------------------------------------------
+void {class_name}::postConstructor()
+{{
+{post_constructor}}}
+
 // ----------------------------------------------------------------------
 inline void {class_name}::set_all_clean(MDataBlock& data)
 {{
@@ -58,21 +63,7 @@ MStatus {class_name}::compute( const MPlug& plug, MDataBlock& data )
 	MStatus stat;
 	MObject node = thisMObject();
 
-	bool plug_check {{
-{plug_check}	}};
-
-	if( plug_check ) {{
-		// collect all inputs
-{input_collection}
-		// call external compute function
-		node_main();
-
-		// set all outputs
-{output_setting}
-		set_all_clean(data);
-		return MS::kSuccess;
-	}}
-
+{compute}
 	return MS::kUnknownParameter;
 }}
 
@@ -91,43 +82,12 @@ MStatus {class_name}::initialize()
 	char msg[1024];
 
 // attribute function classes
-	MFnEnumAttribute     eAttr;
-	MFnUnitAttribute     uAttr;
-	MFnTypedAttribute    tAttr;
-	MFnNumericAttribute  nAttr;
-	MRampAttribute       rAttr;
-	MFnCompoundAttribute cAttr;
-
-	MFnMatrixAttribute   mAttr;
-	MFloatMatrix         identity;
-	identity.setToIdentity();
-
+{attribute_function_sets}
 // input plugs
 {attribute_creation_inputs}
 // output plugs
 {attribute_creation_outputs}
-	// attributeAffects maps
-	std::map<std::string, MObject *> all_inputs = {{
-{attribute_creation_affects_inputs}
-	}};
-
-	std::map<std::string, MObject *> all_outputs = {{
-{attribute_creation_affects_outputs}
-	}};
-
-	for (const auto &input_pair : all_inputs) {{
-		for (const auto &output_pair : all_outputs) {{
-			stat = attributeAffects(*input_pair.second, *output_pair.second);
-			if (!stat) {{
-				sprintf(msg, "attributeAffects: %s >> %s",
-						(const char *)input_pair.first.c_str(),
-						(const char *)output_pair.first.c_str());
-				stat.perror(msg); 
-				return stat;
-			}}
-		}}
-	}}
-
+{attribute_affects}
 	return MS::kSuccess;
 }}
 
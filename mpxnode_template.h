@@ -1,6 +1,7 @@
 #ifndef __{class_name}_H
 #define __{class_name}_H
 
+{includes}
 // ----------------------------------------------------------------------
 
 class {class_name} : public MPxNode
@@ -21,9 +22,11 @@ public:
 	virtual MStatus setDependentsDirty( const MPlug &plugBeingDirtied,
 		MPlugArray &affectedPlugs );
 
+	virtual void postConstructor();
+
 	virtual MStatus compute( const MPlug& plug, MDataBlock& data );
 
-	virtual SchedulingType schedulingType() const {{ return kParallel; }};
+	virtual SchedulingType schedulingType() const {{ return {scheduling}; }};
 
 	inline void set_all_clean(MDataBlock& data);
 
@@ -15,7 +15,13 @@ Author: kiki
 import json, os, re, string, sys
 from collections import OrderedDict
 
-from .mpxnode import MPxNodeCPP
+from .buildprofiles import BuildProfileException, generate_cmake_profiles, resolve_profiles
+from .manifest import hash_spec
+from .deformer import MPxDeformerCPP
+from .mpxnode import MPxNodeCPP, MPxNodeCPPException, default_parallel_threshold, helper_code
+from .spec import SpecException, load_spec
+from .templates import get_registry
+from .threadsafety import scheduling_names, scheduling_values
 
 
 ## ----------------------------------------------------------------------
@@ -24,6 +30,64 @@ class PluginException( Exception ):
 	pass
 
 
+## ----------------------------------------------------------------------
+
+## generator class of each node 'kind' of the spec
+node_kinds = OrderedDict( [
+	( 'node',     MPxNodeCPP ),
+	( 'deformer', MPxDeformerCPP ),
+] )
+
+
+## common.h is precompiled once and reused by every translation unit
+precompiled_header_code = """
+## precompiled common.h, shared by every source file
+if( COMMAND target_precompile_headers )
+	target_precompile_headers( {project_name} PRIVATE common.h )
+endif()
+"""
+
+unity_batch_code = """
+// ----------------------------------------------------------------------
+// unity batch {index} of {count}: node classes compiled as one translation
+// unit. Generated by nodesmith, do not edit.
+// ----------------------------------------------------------------------
+
+#include "common.h"
+
+{includes}"""
+
+
+## ----------------------------------------------------------------------
+
+def generate_node_files( node, main_code=None ):
+	"""
+	Settles the scheduling type of one node and generates every file for
+	it. Lives at module level so that it can be handed to a process pool,
+	which then also does the scan of the node's code.
+	:param main_code: Contents of the node's hand-edited _main.cpp, if
+		any; see MPxNodeCPP.check_scheduling().
+	:return: (files, warnings, error). files is a list of (name, contents)
+		pairs, warnings a list of messages of the scan and error is None,
+		or files and warnings are None and error is a message.
+	"""
+	try:
+		warnings = node.check_scheduling( main_code )
+		return (node.generate_files( ), warnings, None)
+	except Exception as e:
+		return (None, None, '%s: %s' % (type( e ).__name__, e))
+
+
+def check_count( key, value, class_name=None ):
+	"""
+	:raises PluginException: unless value is a non-negative integer.
+	"""
+	if isinstance( value, bool ) or not isinstance( value, int ) or value < 0:
+		where = "Node %s: " % class_name if class_name is not None else ""
+		raise PluginException( "%sMalformed JSON: '%s' should be a non-negative integer (found %r)." % \
+			(where, key, value) )
+
+
 ## ----------------------------------------------------------------------
 
 class Plugin( object ):
@@ -31,7 +95,7 @@ class Plugin( object ):
 				win_lib_path=None, win_include_path=None,
 				mac_lib_path=None, mac_include_path=None,
 				lin_lib_path=None, lin_include_path=None,
-				constants=None ):
+				constants=None, template_dir=None ):
 		self.name                = name
 		self.author              = author
 		self.version             = version
@@ -39,21 +103,46 @@ class Plugin( object ):
 		self.win_include_path    = win_include_path or 'C:/Program Files/Autodesk/maya2016/include'
 		self.mac_lib_path        = mac_lib_path or '/Applications/Autodesk/maya2016/Maya.app/Contents/MacOS'
 		self.mac_include_path    = mac_include_path or '/Applications/Autodesk/maya2016/include'
-		self.lin_lib_path        = lin_lib_path or 'UNSUPPORTED'
-		self.lin_include_path    = lin_include_path or  'UNSUPPORTED'
+		self.lin_lib_path        = lin_lib_path or '/usr/autodesk/maya2016/lib'
+		self.lin_include_path    = lin_include_path or '/usr/autodesk/maya2016/include'
 		self.constants           = constants
 		self.install_destination = None
+		self.template_dir        = template_dir
+		self.parallel_threshold  = default_parallel_threshold
+		self.profile             = False
+		self.unity_batches       = 0    ## 0 compiles every node source on its own
+		self.build_profiles, self.build_profile = resolve_profiles( )
+		self.settings_hash       = None ## hash of the spec minus its nodes, set by from_json
+		self.spec_hashes         = { }  ## class name -> hash of the node's spec, set by from_json
 
 		self.nodes = OrderedDict()
 
 		if filename is not None:
-			with open( filename, "r" ) as fp:
-				data = json.load( fp )
-				self.from_json( data )
-
-	def from_json( self, data ):
+			try:
+				data = load_spec( filename )
+			except SpecException as e:
+				raise PluginException( str( e ) )
+			self.from_json( data )
+
+	@property
+	def templates( self ):
+		return (get_registry( self.template_dir ))
+
+	def from_json( self, data, previous=None ):
+		"""
+		Builds the plugin and its nodes from a spec.
+		:param data: Spec as loaded from JSON; left unchanged.
+		:param previous: Optional Plugin loaded from an earlier version of
+			the spec. If the plugin settings are the same, its nodes whose
+			spec did not change are reused instead of being built again.
+		"""
 		p_typeID = re.compile( '0x([0-9A-Fa-f]{6})$' )
 
+		self.settings_hash = hash_spec( dict( [ (k, v) for k, v in data.items( ) if k != 'nodes' ] ) )
+		self.spec_hashes = { }
+		if previous is not None and previous.settings_hash != self.settings_hash:
+			previous = None
+
 		base_attrs = [
 			"name", "author", "version"
 		]
@@ -65,10 +154,13 @@ class Plugin( object ):
 
 		for attr in  ['win_lib_path', 'win_include_path', 'mac_lib_path', 
 			'mac_include_path', 'lin_lib_path', 'lin_include_path',
-			'install_destination']:
+			'install_destination', 'parallel_threshold', 'profile', 'unity_batches']:
 			if attr in data:
 				self.__setattr__( attr, data[attr] )
 
+		for attr in ['parallel_threshold', 'unity_batches']:
+			check_count( attr, getattr( self, attr ) )
+
 		if 'constants' in data:
 			constants = data['constants']
 			if isinstance( constants, dict ):
@@ -78,19 +170,54 @@ class Plugin( object ):
 		else:
 			self.constants = { }
 
+		if 'build' in data:
+			if not isinstance( data['build'], dict ):
+				raise PluginException( "Malformed JSON: 'build' is not a dictionary." )
+			try:
+				self.build_profiles, self.build_profile = resolve_profiles( data['build'] )
+			except BuildProfileException as e:
+				raise PluginException( "Malformed JSON: build: %s" % e )
+
 		if 'nodes' in data:
 			nodes = data['nodes']
 			if not isinstance( nodes, dict ):
-				raise PluginException( "Malformed JSON: 'constants' is not a dictionary." )
+				raise PluginException( "Malformed JSON: 'nodes' is not a dictionary." )
 
 			for name, node_data in data['nodes'].items( ):
+				spec_hash = hash_spec( node_data )
+				self.spec_hashes[name] = spec_hash
+
+				if previous is not None and previous.spec_hashes.get( name, None ) == spec_hash:
+					self.nodes[name] = previous.nodes[name]
+					continue
+
+				node_data = dict( node_data )    ## popped below; leave the caller's spec alone
 				node_name = node_data.pop( 'node_name', None )
 				typeID = node_data.pop( 'id', None )
 				expression = node_data.pop( 'expression', '' )
+				code = node_data.pop( 'code', '' )
+				parallel_threshold = node_data.pop( 'parallel_threshold', self.parallel_threshold )
+				profile = node_data.pop( 'profile', self.profile )
+				memoize = node_data.pop( 'memoize', False )
+				scheduling = node_data.pop( 'scheduling', None )
+				kind = node_data.pop( 'kind', 'node' )
 
 				if node_name is None:
 					raise PluginException( "Node %s: expected 'node_name' but found none." % name )
 
+				check_count( 'parallel_threshold', parallel_threshold, name )
+
+				if scheduling is not None and scheduling not in scheduling_values:
+					raise PluginException( "Node %s: unknown scheduling '%s' (expected one of %s)." % \
+						(name, scheduling, ', '.join( scheduling_names )) )
+
+				if kind not in node_kinds:
+					raise PluginException( "Node %s: unknown kind '%s' (expected one of %s)." % \
+						(name, kind, ', '.join( node_kinds.keys( ) )) )
+
+				if memoize and kind != 'node':
+					raise PluginException( "Node %s: memoize is only supported by kind 'node'." % name )
+
 				if typeID is None:
 					raise PluginException( "Node %s: expected 'id' but found none." % name )
 				else:
@@ -100,12 +227,14 @@ class Plugin( object ):
 					else:
 						typeID = eval( typeID )
 
-				if expression.endswith(';'):
-					expression = expression[:-1]
-				
-				expression = ';\n\t'.join( expression.split(';') ) + ';\n'
-
-				node = self.add_node( name, node_name, typeID, node_data, expression )
+				node = self.add_node( name, node_name, typeID, node_data, expression, kind )
+				node.spec_hash = spec_hash
+				node.parallel_threshold = parallel_threshold
+				node.constants = self.constants
+				node.code = code
+				node.profile = bool( profile )
+				node.memoize = bool( memoize )
+				node.scheduling = scheduling
 
 	def to_json( self ):
 		##!FIXME: This
@@ -119,9 +248,10 @@ class Plugin( object ):
 			"nodes":             { }
 		}
 
-	def add_node( self, class_name, node_name, typeID, data, expression ):
+	def add_node( self, class_name, node_name, typeID, data, expression, kind='node' ):
 		# print("\t+ Adding node %s..." % class_name)
-		node = MPxNodeCPP( class_name, node_name, typeID, expression )
+		node = node_kinds[kind]( class_name, node_name, typeID, expression,
+						template_dir=self.template_dir )
 
 		inputs = data.pop( 'inputs', None )
 		outputs = data.pop( 'outputs', { } )
@@ -133,19 +263,105 @@ class Plugin( object ):
 			raise PluginException( "Malformed JSON: node %s missing 'outputs'." % class_name )
 
 		for plug, inp_data in inputs.items( ):
+			inp_data = dict( inp_data )
 			default = inp_data.pop( 'default', None )
 			if default is None:
 				raise PluginException( "Malformed JSON: input %s.%s has no 'default' value." % (class_name, plug) )
-			node.add_input_plug( plug, default, **inp_data )
+			try:
+				node.add_input_plug( plug, default, **inp_data )
+			except MPxNodeCPPException as e:
+				raise PluginException( str( e ) )
 
 		for plug, outp_data in outputs.items( ):
+			outp_data = dict( outp_data )
 			default = outp_data.pop( 'default', None )
 			if default is None:
 				raise PluginException( "Malformed JSON: output %s.%s has no 'default' value." % (class_name, plug) )
-			node.add_output_plug( plug, default, **outp_data )
+			try:
+				node.add_output_plug( plug, default, **outp_data )
+			except MPxNodeCPPException as e:
+				raise PluginException( str( e ) )
 
 		self.nodes[class_name] = node
 
+		return (node)
+
+	def generate_nodes( self, nodes=None, jobs=1, pool=None, main_code=None ):
+		"""
+		Generates the files for a list of nodes, optionally across a pool of
+		worker processes. Results are yielded in node order whatever the
+		number of jobs, so the output is deterministic.
+		:param nodes: list of MPxNodeCPP instances. Defaults to every node.
+		:param jobs: Number of worker processes. 1 generates in-process.
+		:param pool: Optional process pool to generate in instead of one of
+			its own, e.g. one shared by the plugins of a batch run; jobs
+			should then be its number of workers.
+		:param main_code: Optional dict of class name to the contents of the
+			node's hand-edited _main.cpp, which is scanned instead of its code.
+		:return: generator of (node, files, warnings, error) tuples; see
+			generate_node_files().
+		"""
+		if nodes is None:
+			nodes = list( self.nodes.values( ) )
+
+		main_code = main_code or { }
+		main_codes = [ main_code.get( x.class_name, None ) for x in nodes ]
+
+		if len( nodes ) < 2 or (pool is None and jobs <= 1):
+			for node, code in zip( nodes, main_codes ):
+				files, warnings, error = generate_node_files( node, code )
+				yield node, files, warnings, error
+			return
+
+		## a few chunks per worker keeps the pickling overhead down while
+		## still balancing nodes of different sizes
+		chunksize = max( 1, len( nodes ) // (max( jobs, 1 ) * 4) )
+
+		if pool is not None:
+			results = pool.map( generate_node_files, nodes, main_codes, chunksize=chunksize )
+			for node, (files, warnings, error) in zip( nodes, results ):
+				yield node, files, warnings, error
+			return
+
+		from concurrent.futures import ProcessPoolExecutor
+
+		with ProcessPoolExecutor( max_workers=jobs ) as pool:
+			results = pool.map( generate_node_files, nodes, main_codes, chunksize=chunksize )
+			for node, (files, warnings, error) in zip( nodes, results ):
+				yield node, files, warnings, error
+
+	def generate_all( self, jobs=1, cmake=True, pool=None ):
+		"""
+		Generates the whole project without touching the filesystem. Node
+		files are yielded as soon as their node is done, so a writer can
+		work through them while the rest is generated.
+		:param jobs: Number of worker processes for the nodes.
+		:param pool: Optional shared process pool; see generate_nodes().
+		:param cmake: If True, CMakeLists.txt is included.
+		:return: generator of (relative path, contents) pairs; dict() of it
+			maps every path to its contents.
+		:raises PluginException: after the other files, if any node failed.
+		"""
+		yield ('common.h', self.generate_common_header( ))
+		yield ('plugin_main.cpp', self.generate_plugin_cpp( ))
+
+		failed = [ ]
+		for node, files, warnings, error in self.generate_nodes( jobs=jobs, pool=pool ):
+			if error is not None:
+				failed.append( '%s (%s)' % (node.class_name, error) )
+				continue
+			for item in files:
+				yield item
+
+		for item in self.generate_unity_files( ):
+			yield item
+
+		if cmake:
+			yield ('CMakeLists.txt', self.generate_plugin_cmake( ))
+
+		if failed:
+			raise PluginException( "Generation failed for node(s): %s" % ', '.join( failed ) )
+
 	def add_constant( self, name, value ):
 		self.constaints
 
@@ -157,16 +373,22 @@ class Plugin( object ):
 
 		return (result)
 
-	def generate_common_header( self ):
-		result = ""
+	def generate_common_helpers( self ):
+		"""
+		Emits the shared helper code needed by at least one node.
+		"""
+		needed = set( )
+		for node in self.nodes.values( ):
+			needed.update( node.required_helpers( ) )
 
-		with open( os.sep.join( [os.path.dirname( __file__ ), 'common_template.h'] ), 'r' ) as fp:
-			template = fp.read( )
+		return (''.join( [ helper_code[x] + '\n' for x in sorted( needed ) ] ))
 
-		result = template.format(
+	def generate_common_header( self ):
+		result = self.templates.render( 'common_template.h',
 			author=self.author,
 			version=self.version,
-			constants=self.generate_common_constants( )
+			constants=self.generate_common_constants( ),
+			helpers=self.generate_common_helpers( )
 		)
 
 		return (result)
@@ -182,7 +404,7 @@ class Plugin( object ):
 		for class_name in sorted( self.nodes.keys( ) ):
 			node_inst = self.nodes[class_name]
 			code = '\tstat = plugin.registerNode( "{node_name}", {class_name}::id,\n' \
-				   '\t\t\t{class_name}::creator, {class_name}::initialize );\n' \
+				   '\t\t\t{class_name}::creator, {class_name}::initialize{node_type} );\n' \
 				   '\tif (!stat) {{\n\t\tstat.perror("{class_name} registerNode");\n' \
 				   '\t\treturn stat;\n\t}}\n' \
 				   '\t{class_name}::aeTemplate();\n\n'
@@ -191,7 +413,8 @@ class Plugin( object ):
 			## should be caught above on JSON load
 			result += code.format(
 				class_name=class_name,
-				node_name=node_inst.node_name
+				node_name=node_inst.node_name,
+				node_type=', ' + node_inst.registration_type if node_inst.registration_type else ''
 			)
 
 		return (result)
@@ -214,49 +437,105 @@ class Plugin( object ):
 
 		return (result)
 
-	def generate_plugin_cpp( self ):
-		result = ""
+	def generate_profiler_category( self ):
+		"""
+		Generates the declaration, registration and removal of the plugin's
+		MProfiler category, if any node is profiled.
+		:return: (declaration, registration, deregistration) code.
+		"""
+		if not any( [ x.profile for x in self.nodes.values( ) ] ):
+			return ('', '', '')
+
+		declaration = '\nint plugin_profiler_category = -1;\n'
+		registration = '\tplugin_profiler_category = MProfiler::addCategory( "{name}",\n' \
+					   '\t\t\t"Generated nodes of {name}" );\n\n'
+		deregistration = '\tMProfiler::removeCategory( "{name}" );\n'
 
-		with open( os.sep.join( [os.path.dirname( __file__ ), 'plugin_main_template.cpp'] ), 'r' ) as fp:
-			template = fp.read( )
+		return (declaration, registration.format( name=self.name ), deregistration.format( name=self.name ))
 
-		result = template.format(
+	def generate_plugin_cpp( self ):
+		declaration, registration, deregistration = self.generate_profiler_category( )
+
+		result = self.templates.render( 'plugin_main_template.cpp',
 			author=self.author,
 			version=self.version,
 			node_header_includes=self.generate_node_header_includes( ),
 			plugin_registration=self.generate_plugin_registration( ),
-			plugin_deregistration=self.generate_plugin_deregistration( )
+			plugin_deregistration=self.generate_plugin_deregistration( ),
+			profiler_declaration=declaration,
+			profiler_registration=registration,
+			profiler_deregistration=deregistration
 		)
 
 		return (result)
 
-	def generate_plugin_cmake( self ):
-		result = ""
+	def unity_batch_names( self ):
+		return (['unity_%d.cpp' % x for x in range( self.unity_batches )])
+
+	def unity_partition( self ):
+		"""
+		Splits the sorted class names into contiguous chunks, one per unity
+		batch, whose sizes differ by one node at most. Adding or removing a
+		node rebuilds its own batch, and the batches after it whose first or
+		last node moves over by one.
+		:return: list of lists of class names, one per batch.
+		"""
+		names = sorted( self.nodes.keys( ) )
+		count = self.unity_batches
+		return ([ names[len( names ) * x // count:len( names ) * (x + 1) // count] for x in range( count ) ])
+
+	def generate_unity_files( self ):
+		"""
+		Generates the unity batches, each including the class sources of
+		its nodes. The _main.cpp files are left out and stay separate
+		translation units, so editing one only rebuilds that file.
+		:return: list of (file name, contents) pairs; empty if unity builds
+			are off.
+		"""
+		if not self.unity_batches:
+			return ([ ])
+
+		result = [ ]
+		for index, (name, batch) in enumerate( zip( self.unity_batch_names( ), self.unity_partition( ) ) ):
+			result.append( (name, unity_batch_code.format(
+				index=index + 1,
+				count=self.unity_batches,
+				includes=''.join( [ '#include "%s.cpp"\n' % x for x in batch ] )
+			)) )
 
-		with open( os.sep.join( [os.path.dirname( __file__ ), 'CMakeLists_template.txt'] ), 'r' ) as fp:
-			template = fp.read( )
+		return (result)
 
-		if not template[-1] == '\n':
-			template += '\n'
+	def generate_plugin_cmake( self ):
+		if self.unity_batches:
+			class_sources = self.unity_batch_names( )
+		else:
+			class_sources = [x+'.cpp' for x in self.nodes.keys()]
 
 		data = {
 			'project_name':self.name,
 			'source_files':' '.join( ['plugin_main.cpp'] + \
-					[x+'.cpp' for x in self.nodes.keys()]+ \
+					class_sources + \
 					[x+'_main.cpp' for x in self.nodes.keys()]),
 			'win_include_path':self.win_include_path,
 			'win_lib_path':self.win_lib_path,
 			'mac_include_path':self.mac_include_path,
 			'mac_lib_path':self.mac_lib_path,
-			# 'lin_include_path'=self.lin_include_path,
-			# 'lin_lib_path'=self.lin_lib_path,
+			'precompiled_header':precompiled_header_code.format( project_name=self.name ) \
+					if self.unity_batches else '',
+			'build_profiles':generate_cmake_profiles( self.name, self.build_profiles, self.build_profile ),
+			'lin_include_path':self.lin_include_path,
+			'lin_lib_path':self.lin_lib_path,
 		}
 
-		if self.install_destination:
-			cmake_install_destination = self.install_destination
-			template += "install( TARGETS {project_name} DESTINATION {install_destination} )\n"
-			data.update( {'install_destination':cmake_install_destination} )
+		result = self.templates.render( 'CMakeLists_template.txt', **data )
+
+		if not result.endswith( '\n' ):
+			result += '\n'
 
-		result = template.format( **data )
+		if self.install_destination:
+			result += "install( TARGETS {project_name} DESTINATION {install_destination} )\n".format(
+				project_name=self.name,
+				install_destination=self.install_destination
+			)
 
 		return (result)
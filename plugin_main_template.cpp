@@ -2,14 +2,14 @@
 #include "common.h"
 {node_header_includes}
 #include <maya/MFnPlugin.h>
-
+{profiler_declaration}
 // ----------------------------------------------------------------------
 PLUGIN_EXPORT MStatus initializePlugin( MObject obj )
 {{
 	MStatus stat;
 	MFnPlugin plugin( obj, "{author}", "{version}", "Any");
 
-{plugin_registration}
+{profiler_registration}{plugin_registration}
 	return stat;
 }}
 
@@ -20,7 +20,7 @@ PLUGIN_EXPORT MStatus uninitializePlugin( MObject obj)
 	MStatus stat;
 	MFnPlugin plugin(obj);
 
-{plugin_deregistration}
+{plugin_deregistration}{profiler_deregistration}
 	return stat;
 }}
 
@@ -0,0 +1,277 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+SPEC.PY
+
+Loads plugin specs that are split over several files. Besides its own
+'nodes', a root spec can list node files to include, as paths or glob
+patterns relative to the root spec; a folder includes every .json file
+in it:
+
+	{
+		"name": "rigging", "author": "kiki", "version": "1.0",
+		"include": [ "nodes/*.json", "extra/TwistNode.json" ]
+	}
+
+A node file holds the object that would otherwise go under 'nodes' and
+is named after the node's class, e.g. nodes/TwistNode.json.
+
+Node files are only parsed when one of their nodes is built. Type IDs
+and node names are checked for duplicates through an index that caches
+them per file by modification time and size, so only files that changed
+since the last run are read for it. The index is kept in the output
+folder next to the manifest, so the spec folder is never written to.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import glob, json, os, re
+
+## ----------------------------------------------------------------------
+
+index_name = '.nodesmith_index.json'
+index_version = 1
+
+p_typeID = re.compile( '0x([0-9A-Fa-f]{6})$' )
+
+
+## ----------------------------------------------------------------------
+class SpecException( Exception ):
+	pass
+
+
+## ----------------------------------------------------------------------
+def read_json( path ):
+	try:
+		with open( path, 'r' ) as fp:
+			return (json.load( fp ))
+	except (IOError, OSError, ValueError) as e:
+		raise SpecException( "Unable to read %s: %s" % (path, e) )
+
+def find_includes( root, patterns ):
+	"""
+	:return: sorted list of (class name, path relative to root) of the node
+		files the include patterns match.
+	"""
+	if not isinstance( patterns, list ):
+		raise SpecException( "Malformed JSON: 'include' is not a list." )
+
+	result = { }
+	for pattern in patterns:
+		path = os.path.join( root, pattern )
+		if os.path.isdir( path ):
+			path = os.path.join( path, '*.json' )
+
+		matches = glob.glob( path )
+		if not matches and not glob.has_magic( pattern ):
+			raise SpecException( "Included file %s does not exist." % pattern )
+
+		for match in matches:
+			class_name = os.path.splitext( os.path.basename( match ) )[0]
+			relative = os.path.relpath( match, root ).replace( os.sep, '/' )
+			if class_name in result and result[class_name] != relative:
+				raise SpecException( "Node %s is included from both %s and %s." % \
+					(class_name, result[class_name], relative) )
+			result[class_name] = relative
+
+	return (sorted( result.items() ))
+
+def type_id_key( typeID ):
+	"""
+	Normalizes a type ID for comparison, so 0x00ABCD and 0x00abcd collide.
+	"""
+	if isinstance( typeID, str ) and p_typeID.match( typeID ):
+		return (typeID.lower())
+	return (typeID)
+
+
+## ----------------------------------------------------------------------
+class SpecIndex( object ):
+	"""
+	Type ID and node name of every included node file, cached by the
+	file's modification time and size.
+	"""
+
+	def __init__( self, root, folder=None ):
+		"""
+		:param root: Folder of the root spec.
+		:param folder: Output folder the index is kept in; if None, it only
+			lives as long as this object.
+		"""
+		self.root    = os.path.abspath( root )
+		self.path    = os.path.join( folder, index_name ) if folder is not None else None
+		self.entries = { }
+		self.loaded  = { }     ## path -> (mtime, size, data) of the files parsed so far
+		self.dirty   = False
+
+		self.load( )
+
+	def load( self ):
+		if self.path is None or not os.path.isfile( self.path ):
+			return
+
+		try:
+			with open( self.path, 'r' ) as fp:
+				data = json.load( fp )
+		except (IOError, OSError, ValueError):
+			## the index is only a cache, so rebuild it
+			return
+
+		## the entries are relative to the spec they were made for
+		if data.get( 'version', None ) == index_version and data.get( 'root', None ) == self.root:
+			self.entries = data.get( 'files', { } )
+
+	def save( self, writer ):
+		"""
+		Writes the index, if it changed, through the writer of the output
+		folder, so it is only updated along with the files of a run.
+		:param writer: writers.OutputWriter of the output folder.
+		"""
+		if not self.dirty or self.path is None:
+			return
+
+		writer.write( index_name, json.dumps( { 'version': index_version, 'root': self.root, 'files': self.entries },
+			indent=1, sort_keys=True ) + '\n' )
+
+		self.dirty = False
+
+	def read( self, path ):
+		"""
+		Parses a JSON file, again only once it changed. The result is shared
+		between calls, so it must not be modified.
+		"""
+		try:
+			stat = os.stat( path )
+		except OSError as e:
+			raise SpecException( "Unable to read %s: %s" % (path, e) )
+
+		cached = self.loaded.get( path, None )
+		if cached is None or cached[0] != stat.st_mtime or cached[1] != stat.st_size:
+			cached = ( stat.st_mtime, stat.st_size, read_json( path ) )
+			self.loaded[path] = cached
+
+		return (cached[2])
+
+	def node_data( self, relative ):
+		data = self.read( os.path.join( self.root, relative ) )
+		if not isinstance( data, dict ):
+			raise SpecException( "Malformed JSON: %s does not hold a node object." % relative )
+		return (data)
+
+	def entry( self, relative ):
+		"""
+		:return: dict with the 'id' and 'node_name' of a node file, parsing
+			it only if it changed since it was indexed.
+		"""
+		stat = os.stat( os.path.join( self.root, relative ) )
+		entry = self.entries.get( relative, None )
+
+		if entry is None or entry['mtime'] != stat.st_mtime or entry['size'] != stat.st_size:
+			data = self.node_data( relative )
+			entry = {
+				'mtime':     stat.st_mtime,
+				'size':      stat.st_size,
+				'id':        data.get( 'id', None ),
+				'node_name': data.get( 'node_name', None ),
+			}
+			self.entries[relative] = entry
+			self.dirty = True
+
+		return (entry)
+
+	def prune( self, names ):
+		"""
+		Drops the entries of files no longer included.
+		"""
+		for relative in set( self.entries ).difference( names ):
+			del self.entries[relative]
+			self.dirty = True
+
+
+## ----------------------------------------------------------------------
+def check_unique( nodes ):
+	"""
+	:param nodes: list of (class name, type ID, node name, where).
+	:raises SpecException: listing every type ID or node name in use by
+		more than one node.
+	"""
+	errors = [ ]
+
+	for field, label in (1, 'type ID'), (2, 'node name'):
+		seen = { }
+		for node in nodes:
+			key = type_id_key( node[field] ) if field == 1 else node[field]
+			if key is None:
+				continue
+			seen.setdefault( key, [ ] ).append( '%s (%s)' % (node[0], node[3]) )
+
+		for key in sorted( seen, key=str ):
+			if len( seen[key] ) > 1:
+				errors.append( "%s %s is used by %s." % (label, node_value( key ), ', '.join( seen[key] )) )
+
+	if errors:
+		raise SpecException( '\n'.join( errors ) )
+
+def node_value( key ):
+	return (key if isinstance( key, str ) else json.dumps( key ))
+
+def load_spec( filename, only=None, index=None ):
+	"""
+	Reads a root spec and the node files it includes.
+	:param filename: Path of the root spec.
+	:param only: Optional list of class names; only these nodes are
+		loaded. Every included file is still indexed for the type ID and
+		node name checks.
+	:param index: Optional SpecIndex of the root spec to reuse, so files
+		unchanged since it was saved or last used are not parsed again.
+	:return: the spec as Plugin.from_json() expects it, with every loaded
+		node under 'nodes' and 'include' removed.
+	"""
+	root = os.path.dirname( os.path.abspath( filename ) )
+	if index is None:
+		index = SpecIndex( root )
+
+	data = index.read( os.path.abspath( filename ) )
+	if not isinstance( data, dict ):
+		raise SpecException( "Malformed JSON: %s does not hold a plugin object." % filename )
+
+	nodes = data.get( 'nodes', { } )
+	if not isinstance( nodes, dict ):
+		raise SpecException( "Malformed JSON: 'nodes' is not a dictionary." )
+
+	includes = find_includes( root, data.get( 'include', [ ] ) )
+
+	index.prune( [ x[1] for x in includes ] )
+
+	known = [ ]
+	for class_name, node_data in nodes.items( ):
+		if isinstance( node_data, dict ):
+			known.append( (class_name, node_data.get( 'id', None ), node_data.get( 'node_name', None ),
+						   os.path.basename( filename )) )
+
+	for class_name, relative in includes:
+		if class_name in nodes:
+			raise SpecException( "Node %s is both in %s and included from %s." % \
+				(class_name, os.path.basename( filename ), relative) )
+		entry = index.entry( relative )
+		known.append( (class_name, entry['id'], entry['node_name'], relative) )
+
+	check_unique( known )
+
+	if only is not None:
+		missing = set( only ).difference( [ x[0] for x in known ] )
+		if missing:
+			raise SpecException( "Unknown node(s): %s" % ', '.join( sorted( missing ) ) )
+
+	wanted = set( only ) if only is not None else None
+
+	result = dict( data )
+	result.pop( 'include', None )
+	result['nodes'] = dict( [ (k, v) for k, v in nodes.items( ) if wanted is None or k in wanted ] )
+	for class_name, relative in includes:
+		if wanted is None or class_name in wanted:
+			result['nodes'][class_name] = index.node_data( relative )
+
+	return (result)
@@ -0,0 +1,114 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+STUB_SDK.PY
+
+Writes a stub Maya SDK for a generated project: an empty header for
+every <maya/...> include the sources use, and empty OpenMaya,
+OpenMayaAnim and Foundation libraries. Pointing LIN_INCLUDE_PATH and
+LIN_LIB_PATH at it lets the generated CMake project configure and
+generate on a Linux box without Maya, e.g. on CI:
+
+	python stub_sdk.py <project folder> <sdk folder>
+	cmake -G Ninja -DLIN_INCLUDE_PATH=<sdk>/include -DLIN_LIB_PATH=<sdk>/lib <project folder>
+
+The headers are empty, so this checks the build setup, not the code.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+## ----------------------------------------------------------------------
+
+p_maya_include = re.compile( r'#include\s*[<"]maya/(\w+\.h)[>"]' )
+
+stub_libraries = [ 'libOpenMaya.so', 'libOpenMayaAnim.so', 'libFoundation.so' ]
+
+stub_header = '// stub header written by nodesmith\n'
+
+
+## ----------------------------------------------------------------------
+def find_maya_headers( folder ):
+	"""
+	:return: sorted list of the Maya header names the project includes.
+	"""
+	result = set()
+
+	for name in os.listdir( folder ):
+		if not name.endswith( ('.h', '.cpp') ):
+			continue
+		with open( os.path.join( folder, name ), 'r' ) as fp:
+			result.update( p_maya_include.findall( fp.read() ) )
+
+	return (sorted( result ))
+
+def write_library( path ):
+	"""
+	Builds an empty shared library if a C compiler is around, so the
+	project also links; otherwise leaves an empty file, which is enough
+	for CMake to configure.
+	"""
+	try:
+		subprocess.check_call( [ 'cc', '-shared', '-fPIC', '-o', path, '-x', 'c', os.devnull ],
+							   stdout=subprocess.PIPE, stderr=subprocess.PIPE )
+		return
+	except (OSError, subprocess.CalledProcessError):
+		pass
+
+	with open( path, 'w' ):
+		pass
+
+def write_stub_sdk( project, folder, header=stub_header ):
+	"""
+	:param header: Text of every stub header. The default is empty of
+		declarations; pass e.g. an #include of a header declaring the
+		Maya types to also compile the code.
+	:return: sorted list of the Maya header names written.
+	"""
+	include = os.path.join( folder, 'include', 'maya' )
+	lib = os.path.join( folder, 'lib' )
+
+	for path in include, lib:
+		if not os.path.isdir( path ):
+			os.makedirs( path )
+
+	headers = find_maya_headers( project )
+	for name in headers:
+		with open( os.path.join( include, name ), 'w' ) as fp:
+			fp.write( header )
+
+	for name in stub_libraries:
+		write_library( os.path.join( lib, name ) )
+
+	return (headers)
+
+
+## ----------------------------------------------------------------------
+
+def main():
+	parser = argparse.ArgumentParser(
+		description='Write a stub Maya SDK for building a generated project without Maya.'
+	)
+	parser.add_argument( 'project', type=str, help='Folder of the generated project.' )
+	parser.add_argument( 'folder', type=str, help='Where to write the stub SDK.' )
+
+	args = parser.parse_args()
+
+	headers = write_stub_sdk( args.project, args.folder )
+
+	print( "+ Wrote %d stub headers and %d libraries to '%s'." % (len( headers ), len( stub_libraries ), args.folder) )
+	print( "  cmake -DLIN_INCLUDE_PATH=%s -DLIN_LIB_PATH=%s %s" % (
+		os.path.join( os.path.abspath( args.folder ), 'include' ),
+		os.path.join( os.path.abspath( args.folder ), 'lib' ),
+		os.path.abspath( args.project ) ) )
+
+
+if __name__ == "__main__":
+	main()
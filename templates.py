@@ -0,0 +1,201 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TEMPLATES.PY
+
+Template registry for the code generators. Each template file is read
+and checked once per process and then reused for every node and plugin
+generated afterwards.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, string, threading
+
+## ----------------------------------------------------------------------
+
+default_template_dir = os.path.dirname( os.path.abspath( __file__ ) )
+
+## placeholder names each generator supplies to its template. A template
+## may leave any of these out, but may not ask for anything else.
+template_fields = {
+	'mpxnode_template.h' : (
+		'class_name', 'inputs', 'outputs', 'private_variables', 'scheduling',
+		'includes',
+	),
+	'mpxnode_template.cpp' : (
+		'typeID', 'header_name', 'class_name', 'node_name',
+		'static_input_attributes', 'static_output_attributes', 'constants',
+		'plug_check', 'input_collection', 'output_setting',
+		'attribute_creation', 'attribute_creation_inputs',
+		'attribute_creation_outputs', 'attribute_creation_affects_inputs',
+		'attribute_creation_affects_outputs', 'attribute_editor_parameters',
+		'set_all_clean', 'compute', 'attribute_affects', 'attribute_function_sets',
+		'dependents_dirty', 'post_constructor',
+	),
+	'mpxnode_template_main.cpp' : (
+		'header_name', 'class_name', 'node_name', 'expression',
+	),
+	'deformer_template.h' : (
+		'class_name', 'inputs', 'private_variables', 'scheduling', 'includes',
+	),
+	'deformer_template.cpp' : (
+		'typeID', 'header_name', 'class_name', 'node_name',
+		'static_input_attributes', 'constants', 'input_collection', 'threshold',
+		'attribute_creation_inputs', 'attribute_affects', 'attribute_editor_parameters',
+		'attribute_function_sets', 'dependents_dirty', 'post_constructor',
+		'profile_deform', 'profile_points_begin', 'profile_points_end',
+	),
+	'deformer_template_main.cpp' : (
+		'header_name', 'class_name', 'node_name', 'expression',
+	),
+	'common_template.h' : (
+		'author', 'version', 'constants', 'helpers',
+	),
+	'plugin_main_template.cpp' : (
+		'author', 'version', 'node_header_includes', 'plugin_registration',
+		'plugin_deregistration', 'profiler_declaration', 'profiler_registration',
+		'profiler_deregistration',
+	),
+	'CMakeLists_template.txt' : (
+		'project_name', 'source_files', 'win_include_path', 'win_lib_path',
+		'mac_include_path', 'mac_lib_path', 'lin_include_path', 'lin_lib_path',
+		'precompiled_header', 'build_profiles',
+	),
+}
+
+
+## ----------------------------------------------------------------------
+class TemplateException( Exception ):
+	pass
+
+
+## ----------------------------------------------------------------------
+class Template( object ):
+
+	def __init__( self, name, path, text ):
+		"""
+		A loaded and checked template.
+		:param name: Template file name, used as the registry key.
+		:param path: Full path the template was read from.
+		:param text: Template contents in str.format() syntax.
+		"""
+		self.name   = name
+		self.path   = path
+		self.text   = text
+		self.fields = self.parse_fields( text, path )
+
+	@staticmethod
+	def parse_fields( text, path ):
+		"""
+		Collects the placeholder names used by a template.
+		:return: set of field names, without attribute or index access.
+		"""
+		fields = set()
+
+		try:
+			for _, field, _, _ in string.Formatter().parse( text ):
+				if field is None:
+					continue
+				fields.add( field.split('.')[0].split('[')[0] )
+		except ValueError as e:
+			raise TemplateException( "Malformed template %s: %s" % (path, e) )
+
+		return (fields)
+
+	def check( self, supplied ):
+		"""
+		Checks the template's placeholders against what the generator
+		supplies, so a bad template fails on load rather than mid-run.
+		"""
+		unknown = self.fields.difference( supplied )
+		if unknown:
+			raise TemplateException( "Template %s uses unknown placeholder(s): %s" % \
+				(self.path, ', '.join( sorted(unknown) )) )
+
+	def render( self, **values ):
+		return (self.text.format( **values ))
+
+
+## ----------------------------------------------------------------------
+class TemplateRegistry( object ):
+
+	def __init__( self, template_dir=None ):
+		"""
+		Standard initializer.
+		:param template_dir: Optional user template folder. Templates found
+			there override the ones shipped with nodesmith; anything
+			missing falls back to the defaults.
+		"""
+		self.template_dir = os.path.abspath( template_dir ) if template_dir else None
+		self.templates = { }
+
+	def find( self, name ):
+		if self.template_dir is not None:
+			path = os.path.join( self.template_dir, name )
+			if os.path.isfile( path ):
+				return (path)
+
+		return (os.path.join( default_template_dir, name ))
+
+	def load( self, name ):
+		path = self.find( name )
+
+		try:
+			with open( path, 'r' ) as fp:
+				text = fp.read( )
+		except (IOError, OSError) as e:
+			raise TemplateException( "Unable to read template %s: %s" % (path, e) )
+
+		template = Template( name, path, text )
+		template.check( template_fields.get( name, () ) )
+
+		return (template)
+
+	def get( self, name ):
+		template = self.templates.get( name, None )
+
+		if template is None:
+			template = self.load( name )
+			self.templates[name] = template
+
+		return (template)
+
+	def render( self, name, **values ):
+		return (self.get( name ).render( **values ))
+
+	def preload( self ):
+		"""
+		Loads every template the generators use up front, e.g. before
+		worker processes are forked so they all inherit the loaded copies.
+		"""
+		for name in sorted( template_fields ):
+			self.get( name )
+
+	def clear( self ):
+		self.templates.clear( )
+
+
+## ----------------------------------------------------------------------
+
+_registries = { }
+_registries_lock = threading.Lock( )
+
+def get_registry( template_dir=None ):
+	"""
+	Returns the shared registry for a template folder, creating it on
+	first use. None selects the templates shipped with nodesmith.
+	"""
+	key = os.path.abspath( template_dir ) if template_dir else None
+
+	## batch runs generate several plugins from threads
+	with _registries_lock:
+		registry = _registries.get( key, None )
+
+		if registry is None:
+			registry = TemplateRegistry( key )
+			_registries[key] = registry
+
+	return (registry)
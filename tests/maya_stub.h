@@ -0,0 +1,368 @@
+// ----------------------------------------------------------------------
+// Declarations of the Maya API types the generated code uses, for
+// syntax checks of generated projects in the tests. Every Maya header of
+// the stub SDK the tests write includes this file. Nothing here behaves
+// like Maya; it only has to compile.
+// ----------------------------------------------------------------------
+
+#ifndef __NODESMITH_MAYA_STUB_H
+#define __NODESMITH_MAYA_STUB_H
+
+#include <cmath>
+#include <cstddef>
+#include <string>
+
+#define PLUGIN_EXPORT extern "C"
+#define CHECK_MSTATUS_AND_RETURN_IT(x) do { MStatus _s = (x); if (!_s) return _s; } while (0)
+#define CHECK_MSTATUS(x) (x)
+
+// ----------------------------------------------------------------------
+// basics
+
+class MString {
+public:
+	MString() {}
+	MString(const char *) {}
+	const char *asChar() const { return ""; }
+};
+
+class MStatus {
+public:
+	enum MStatusCode { kSuccess, kFailure, kUnknownParameter };
+	MStatus() {}
+	MStatus(MStatusCode) {}
+	operator bool() const { return true; }
+	bool operator!() const { return false; }
+	void perror(const char *) const {}
+};
+typedef MStatus MS;
+
+class MObject {
+public:
+	bool operator==(const MObject &) const { return true; }
+	bool operator!=(const MObject &) const { return false; }
+	bool isNull() const { return false; }
+};
+
+class MObjectHandle {
+public:
+	MObjectHandle(const MObject &) {}
+	unsigned int hashCode() const { return 0; }
+};
+
+class MTypeId {
+public:
+	MTypeId(unsigned int) {}
+};
+
+// ----------------------------------------------------------------------
+// value types
+
+class MVector {
+public:
+	double x, y, z;
+	MVector() : x(0), y(0), z(0) {}
+	MVector(double a, double b, double c) : x(a), y(b), z(c) {}
+	MVector operator+(const MVector &) const { return *this; }
+	MVector operator-(const MVector &) const { return *this; }
+	MVector operator-() const { return *this; }
+	MVector operator*(double) const { return *this; }
+	MVector operator/(double) const { return *this; }
+	double operator*(const MVector &) const { return 0; }
+	MVector operator^(const MVector &) const { return *this; }
+	bool operator!=(const MVector &) const { return false; }
+	double length() const { return 0; }
+	MVector normal() const { return *this; }
+};
+inline MVector operator*(double, const MVector &v) { return v; }
+
+class MFloatVector {
+public:
+	float x, y, z;
+	MFloatVector() : x(0), y(0), z(0) {}
+	MFloatVector(float a, float b, float c) : x(a), y(b), z(c) {}
+	MFloatVector operator+(const MFloatVector &) const { return *this; }
+	MFloatVector operator-(const MFloatVector &) const { return *this; }
+	MFloatVector operator-() const { return *this; }
+	MFloatVector operator*(float) const { return *this; }
+	MFloatVector operator/(float) const { return *this; }
+	float operator*(const MFloatVector &) const { return 0; }
+	MFloatVector operator^(const MFloatVector &) const { return *this; }
+	bool operator!=(const MFloatVector &) const { return false; }
+	float length() const { return 0; }
+	MFloatVector normal() const { return *this; }
+};
+inline MFloatVector operator*(float, const MFloatVector &v) { return v; }
+
+class MMatrix {
+public:
+	double m[4][4];
+	MMatrix operator+(const MMatrix &) const { return *this; }
+	MMatrix operator*(const MMatrix &) const { return *this; }
+	MMatrix operator*(double) const { return *this; }
+	bool operator==(const MMatrix &) const { return true; }
+	bool operator!=(const MMatrix &) const { return false; }
+	MMatrix inverse() const { return *this; }
+	MMatrix transpose() const { return *this; }
+	double *operator[](unsigned int r) { return m[r]; }
+	const double *operator[](unsigned int r) const { return m[r]; }
+};
+inline MVector operator*(const MVector &v, const MMatrix &) { return v; }
+
+class MFloatMatrix {
+public:
+	void setToIdentity() {}
+};
+
+class MPoint {
+public:
+	double x, y, z, w;
+	MPoint() : x(0), y(0), z(0), w(1) {}
+	MPoint(double a, double b, double c, double d = 1) : x(a), y(b), z(c), w(d) {}
+	MPoint(const MVector &v) : x(v.x), y(v.y), z(v.z), w(1) {}
+	MPoint operator+(const MVector &) const { return *this; }
+	MPoint operator+(const MPoint &) const { return *this; }
+	MPoint operator-(const MVector &) const { return *this; }
+	MVector operator-(const MPoint &) const { return MVector(); }
+	MPoint operator*(double) const { return *this; }
+	MPoint operator/(double) const { return *this; }
+	MPoint &operator+=(const MVector &) { return *this; }
+	bool operator!=(const MPoint &) const { return false; }
+};
+inline MPoint operator*(const MPoint &p, const MMatrix &) { return p; }
+inline MPoint operator*(double, const MPoint &p) { return p; }
+
+class MPointArray {
+public:
+	unsigned int length() const { return 0; }
+	MPoint &operator[](unsigned int) { static MPoint p; return p; }
+	const MPoint &operator[](unsigned int) const { static MPoint p; return p; }
+};
+
+class MFloatArray {
+public:
+	unsigned int length() const { return 0; }
+	float operator[](unsigned int) const { return 0; }
+	void append(float) {}
+};
+
+class MIntArray {
+public:
+	unsigned int length() const { return 0; }
+	void append(int) {}
+};
+
+// ----------------------------------------------------------------------
+// plugs and data
+
+class MPlug {
+public:
+	bool operator==(const MObject &) const { return false; }
+	bool operator!=(const MObject &) const { return true; }
+	MObject attribute(MStatus * = 0) const { return MObject(); }
+	bool isChild() const { return false; }
+	MPlug parent() const { return *this; }
+};
+
+class MPlugArray {
+public:
+	void append(const MPlug &) {}
+};
+
+class MDataHandle {
+public:
+	short asShort() const { return 0; }
+	float asFloat() const { return 0; }
+	double asDouble() const { return 0; }
+	bool asBool() const { return false; }
+	int asInt() const { return 0; }
+	MFloatVector &asFloatVector() { static MFloatVector v; return v; }
+	MVector &asVector() { static MVector v; return v; }
+	const MMatrix &asMatrix() const { static MMatrix m; return m; }
+	void setFloat(float) {}
+	void setDouble(double) {}
+	void setShort(short) {}
+	void setBool(bool) {}
+	void setMFloatVector(const MFloatVector &) {}
+	void setMVector(const MVector &) {}
+	void setMMatrix(const MMatrix &) {}
+	void set(const MMatrix &) {}
+	void set(const MVector &) {}
+	void set(const MFloatVector &) {}
+	void set(double) {}
+	void set(float) {}
+	void setClean() {}
+	MDataHandle child(const MObject &) { return *this; }
+};
+
+class MDataBlock;
+
+class MArrayDataBuilder {
+public:
+	MArrayDataBuilder(MDataBlock *, const MObject &, unsigned int, MStatus * = 0) {}
+	MDataHandle addElement(unsigned int, MStatus * = 0) { return MDataHandle(); }
+};
+
+class MArrayDataHandle {
+public:
+	MArrayDataHandle() {}
+	MArrayDataHandle(const MDataHandle &) {}
+	unsigned int elementCount(MStatus * = 0) { return 0; }
+	unsigned int elementIndex(MStatus * = 0) { return 0; }
+	MStatus jumpToElement(unsigned int) { return MS::kSuccess; }
+	MStatus next() { return MS::kSuccess; }
+	MDataHandle inputValue(MStatus * = 0) { return MDataHandle(); }
+	MStatus set(MArrayDataBuilder &) { return MS::kSuccess; }
+	MStatus setAllClean() { return MS::kSuccess; }
+};
+
+class MDataBlock {
+public:
+	MDataHandle inputValue(const MObject &, MStatus * = 0) { return MDataHandle(); }
+	MDataHandle outputValue(const MObject &, MStatus * = 0) { return MDataHandle(); }
+	MArrayDataHandle inputArrayValue(const MObject &, MStatus * = 0) { return MArrayDataHandle(); }
+	MArrayDataHandle outputArrayValue(const MObject &, MStatus * = 0) { return MArrayDataHandle(); }
+	MStatus setClean(const MObject &) { return MS::kSuccess; }
+};
+
+// ----------------------------------------------------------------------
+// nodes
+
+class MPxNode {
+public:
+	enum SchedulingType { kParallel, kSerial, kGloballySerial, kUntrusted };
+	enum Type { kDependNode, kDeformerNode };
+	virtual ~MPxNode() {}
+	virtual MStatus compute(const MPlug &, MDataBlock &) { return MS::kSuccess; }
+	virtual MStatus setDependentsDirty(const MPlug &, MPlugArray &) { return MS::kSuccess; }
+	virtual SchedulingType schedulingType() const { return kParallel; }
+	virtual void postConstructor() {}
+	MObject thisMObject() const { return MObject(); }
+	static MStatus addAttribute(const MObject &) { return MS::kSuccess; }
+	static MStatus attributeAffects(const MObject &, const MObject &) { return MS::kSuccess; }
+};
+
+class MItGeometry {
+public:
+	MStatus allPositions(MPointArray &) { return MS::kSuccess; }
+	MStatus setAllPositions(const MPointArray &) { return MS::kSuccess; }
+	MStatus reset() { return MS::kSuccess; }
+	bool isDone() const { return true; }
+	MStatus next() { return MS::kSuccess; }
+	int index() const { return 0; }
+};
+
+class MPxGeometryFilter : public MPxNode {
+public:
+	static MObject envelope, input, inputGeom, outputGeom, groupId;
+	virtual MStatus deform(MDataBlock &, MItGeometry &, const MMatrix &, unsigned int) { return MS::kSuccess; }
+};
+
+class MPxDeformerNode : public MPxGeometryFilter {
+public:
+	static MObject weightList, weights;
+};
+
+// ----------------------------------------------------------------------
+// attributes
+
+class MFnAttribute {
+public:
+	MStatus setStorable(bool) { return MS::kSuccess; }
+	MStatus setKeyable(bool) { return MS::kSuccess; }
+	MStatus setReadable(bool) { return MS::kSuccess; }
+	MStatus setWritable(bool) { return MS::kSuccess; }
+	MStatus setArray(bool) { return MS::kSuccess; }
+	MStatus setUsesArrayDataBuilder(bool) { return MS::kSuccess; }
+	MStatus setCached(bool) { return MS::kSuccess; }
+	MStatus setHidden(bool) { return MS::kSuccess; }
+	MStatus setMin(double) { return MS::kSuccess; }
+	MStatus setMax(double) { return MS::kSuccess; }
+};
+
+class MFnNumericData {
+public:
+	enum Type { kFloat, kDouble, kShort, kBoolean, k3Float, k3Double, kInt };
+};
+
+class MFnNumericAttribute : public MFnAttribute {
+public:
+	MObject create(const MString &, const MString &, MFnNumericData::Type, double = 0, MStatus * = 0) { return MObject(); }
+};
+
+class MFnUnitAttribute : public MFnAttribute {
+public:
+	enum Type { kAngle, kDistance, kTime };
+	MObject create(const MString &, const MString &, Type, double = 0, MStatus * = 0) { return MObject(); }
+};
+
+class MFnMatrixAttribute : public MFnAttribute {
+public:
+	enum Type { kFloat, kDouble };
+	MObject create(const MString &, const MString &, Type = kDouble, MStatus * = 0) { return MObject(); }
+	MStatus setDefault(const MFloatMatrix &) { return MS::kSuccess; }
+	MStatus setDefault(const MMatrix &) { return MS::kSuccess; }
+};
+
+class MRampAttribute {
+public:
+	enum { kNone, kLinear, kSmooth, kSpline };
+	MRampAttribute(const MObject &, const MObject &, MStatus * = 0) {}
+	static MObject createCurveRamp(const MString &, const MString &, MStatus * = 0) { return MObject(); }
+	void getValueAtPosition(float, float &, MStatus * = 0) {}
+	void setRamp(const MFloatArray &, const MFloatArray &, const MIntArray &, MStatus * = 0) {}
+};
+
+// ----------------------------------------------------------------------
+// plugin, threads and profiling
+
+class MGlobal {
+public:
+	static MStatus executeCommand(const MString &, bool = false, bool = false) { return MS::kSuccess; }
+};
+
+class MFnPlugin {
+public:
+	MFnPlugin(MObject &, const char * = 0, const char * = 0, const char * = 0) {}
+	MStatus registerNode(const MString &, const MTypeId &, void *(*)(), MStatus (*)(),
+		MPxNode::Type = MPxNode::kDependNode) { return MS::kSuccess; }
+	MStatus deregisterNode(const MTypeId &) { return MS::kSuccess; }
+};
+
+typedef void *MThreadRetVal;
+class MThreadRootTask;
+typedef MThreadRetVal (*MThreadFunc)(void *);
+typedef void (*MThreadParallelRegionFunc)(void *, MThreadRootTask *);
+
+class MThreadPool {
+public:
+	static MStatus init() { return MS::kSuccess; }
+	static void release() {}
+	static MStatus newParallelRegion(MThreadParallelRegionFunc, void *) { return MS::kSuccess; }
+	static MStatus createTask(MThreadFunc, void *, MThreadRootTask *) { return MS::kSuccess; }
+	static void executeAndJoin(MThreadRootTask *) {}
+};
+
+class MThreadUtils {
+public:
+	static int getNumThreads() { return 1; }
+};
+
+class MProfiler {
+public:
+	enum ProfilingColor {
+		kColorA_L1, kColorB_L1, kColorC_L1, kColorD_L1, kColorE_L1,
+		kColorA_L2, kColorB_L2, kColorC_L2, kColorD_L2, kColorE_L2,
+	};
+	static int addCategory(const char *, const char * = 0) { return 0; }
+	static void removeCategory(const char *) {}
+	static int eventBegin(int, ProfilingColor, const char *, const char * = 0) { return 0; }
+	static void eventEnd(int) {}
+};
+
+class MProfilingScope {
+public:
+	MProfilingScope(int, MProfiler::ProfilingColor, const char *, const char * = 0) {}
+};
+
+#endif
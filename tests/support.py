@@ -0,0 +1,202 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/SUPPORT.PY
+
+Helpers shared by the tests: makes the checkout importable as the
+nodesmith package, builds plugins from spec dictionaries, writes their
+projects and compiles generated sources against a stub Maya SDK whose
+headers all include maya_stub.h.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import contextlib, io, json, os, subprocess, sys
+
+## ----------------------------------------------------------------------
+
+tests_folder = os.path.dirname( os.path.abspath( __file__ ) )
+root_folder = os.path.dirname( tests_folder )
+
+maya_stub = os.path.join( tests_folder, 'maya_stub.h' )
+
+
+## ----------------------------------------------------------------------
+def import_nodesmith():
+	"""
+	The checkout is the package itself, so it is registered under its
+	package name unless nodesmith is installed.
+	"""
+	if 'nodesmith' in sys.modules:
+		return
+
+	import importlib.util
+
+	spec = importlib.util.spec_from_file_location( 'nodesmith', os.path.join( root_folder, '__init__.py' ),
+		submodule_search_locations=[ root_folder ] )
+	module = importlib.util.module_from_spec( spec )
+	sys.modules['nodesmith'] = module
+	spec.loader.exec_module( module )
+
+import_nodesmith()
+
+
+## ----------------------------------------------------------------------
+def find_program( *names ):
+	"""
+	:return: path of the first of the programs found on PATH, or None.
+	"""
+	for name in names:
+		if not name:
+			continue
+		if os.path.isabs( name ):
+			if os.access( name, os.X_OK ):
+				return (name)
+			continue
+		for folder in os.environ.get( 'PATH', '' ).split( os.pathsep ):
+			path = os.path.join( folder, name )
+			if os.path.isfile( path ) and os.access( path, os.X_OK ):
+				return (path)
+	return (None)
+
+def find_compiler():
+	"""
+	:return: path of a C++ compiler, or None.
+	"""
+	return (find_program( os.environ.get( 'CXX', '' ), 'c++', 'g++', 'clang++' ))
+
+compiler = find_compiler()
+cmake = find_program( 'cmake' )
+ninja = find_program( 'ninja' )
+
+def make_plugin( nodes, constants=None ):
+	"""
+	:param nodes: dict of class name to node spec.
+	:return: Plugin built from a spec holding the nodes.
+	"""
+	from nodesmith.plugin import Plugin
+
+	data = { 'name': 'tests', 'author': 'tests', 'version': '1.0', 'nodes': nodes }
+	if constants is not None:
+		data['constants'] = constants
+
+	plugin = Plugin()
+	plugin.from_json( data )
+	return (plugin)
+
+def write_project( plugin, folder, harness=False ):
+	"""
+	Writes the whole project, and the benchmark harness if asked, to a
+	folder.
+	"""
+	from nodesmith.harness import generate_harness_files
+	from nodesmith.writers import DirectoryWriter
+
+	with DirectoryWriter( folder ) as writer:
+		writer.write_all( plugin.generate_all( ) )
+		if harness:
+			writer.write_all( generate_harness_files( plugin )[0] )
+
+def write_sdk( project, folder ):
+	"""
+	Writes a stub SDK for a project whose headers declare the Maya types.
+	:return: the SDK's include folder.
+	"""
+	from nodesmith.stub_sdk import write_stub_sdk
+
+	write_stub_sdk( project, folder, header='#include "%s"\n' % maya_stub.replace( os.sep, '/' ) )
+	return (os.path.join( folder, 'include' ))
+
+def compile_source( path, include=None, output=None ):
+	"""
+	Compiles one source file; only checks the syntax unless output is
+	given.
+	:return: (return code, compiler output).
+	"""
+	command = [ compiler, '-std=c++14', '-Wall', '-Wno-unused', '-o' if output else '-fsyntax-only' ]
+	if output:
+		command.append( output )
+	if include:
+		command.append( '-I' + include )
+	command.append( path )
+
+	process = subprocess.Popen( command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+		cwd=os.path.dirname( path ) )
+	text = process.communicate( )[0].decode( 'utf-8', 'replace' )
+	return (process.returncode, text)
+
+def write_spec( folder, nodes, name='plugin.json', **settings ):
+	"""
+	Writes a plugin spec holding the nodes, plus any root settings.
+	:return: path of the spec.
+	"""
+	data = { 'name': 'tests', 'author': 'tests', 'version': '1.0', 'nodes': nodes }
+	data.update( settings )
+
+	path = os.path.join( folder, name )
+	if not os.path.isdir( os.path.dirname( path ) ):
+		os.makedirs( os.path.dirname( path ) )
+	with open( path, 'w' ) as fp:
+		json.dump( data, fp, indent=1, sort_keys=True )
+	return (path)
+
+def run_cli( *argv ):
+	"""
+	Runs the command line in this process.
+	:return: (exit code, printed output).
+	"""
+	from nodesmith.cli import main
+
+	output = io.StringIO( )
+	code = 0
+	with contextlib.redirect_stdout( output ):
+		try:
+			main( list( argv ) )
+		except SystemExit as e:
+			code = e.code
+	return (code, output.getvalue( ))
+
+def read_folder( folder ):
+	"""
+	:return: dict of path relative to the folder to the bytes of every file
+		in it.
+	"""
+	result = { }
+	for root, _, names in os.walk( folder ):
+		for name in names:
+			path = os.path.join( root, name )
+			with open( path, 'rb' ) as fp:
+				result[os.path.relpath( path, folder ).replace( os.sep, '/' )] = fp.read( )
+	return (result)
+
+def run_cmake( *args, **kwargs ):
+	"""
+	Runs cmake, with Ninja as the generator when configuring and Ninja is
+	installed.
+	:param env: Optional environment.
+	:return: (return code, cmake output).
+	"""
+	command = [ cmake ] + list( args )
+	if ninja and '-S' in args:
+		command[1:1] = [ '-G', 'Ninja' ]
+
+	process = subprocess.Popen( command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+		env=kwargs.get( 'env', None ) )
+	text = process.communicate( )[0].decode( 'utf-8', 'replace' )
+	return (process.returncode, text)
+
+def build_project( project, sdk, build, *options, **kwargs ):
+	"""
+	Configures a generated project against a stub SDK and builds it.
+	:param env: Optional environment.
+	:return: (return code, cmake output) of the step that failed, or of
+		the build.
+	"""
+	code, text = run_cmake( '-S', project, '-B', build,
+		'-DLIN_INCLUDE_PATH=' + os.path.join( sdk, 'include' ), '-DLIN_LIB_PATH=' + os.path.join( sdk, 'lib' ),
+		*options, **kwargs )
+	if code != 0:
+		return (code, text)
+	return (run_cmake( '--build', build, **kwargs ))
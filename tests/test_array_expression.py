@@ -0,0 +1,77 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_ARRAY_EXPRESSION.PY
+
+Element-wise expressions over array plugs: one loop over __restrict
+buffers, split across the thread pool above the threshold.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, shutil, tempfile, unittest
+
+import support
+
+from nodesmith.plugin import PluginException
+
+## ----------------------------------------------------------------------
+
+def node_spec( type_id, expression, **settings ):
+	result = {
+		'node_name': 'n%s' % type_id, 'id': type_id, 'expression': expression,
+		'inputs': { 'a': { 'default': 0.0, 'array': True }, 'b': { 'default': 0.0, 'array': True },
+			'scale': { 'default': 1.0 } },
+		'outputs': { 'out': { 'default': 0.0, 'array': True }, 'total': { 'default': 0.0 } },
+	}
+	result.update( settings )
+	return (result)
+
+
+## ----------------------------------------------------------------------
+class ArrayExpressionTest( unittest.TestCase ):
+
+	def generate( self, nodes, **settings ):
+		return (dict( support.make_plugin( nodes, **settings ).generate_all( ) ))
+
+	def test_loop( self ):
+		files = self.generate( { 'Arr': node_spec( '0x00D801', 'out = a * b * (scale + 1)', parallel_threshold=64 ) } )
+		code = files['Arr_main.cpp']
+
+		self.assertIn( 'size_t count = a.size();\n\tcount = std::min(count, b.size());', code )
+		self.assertIn( 'out.resize(count);', code )
+		self.assertIn( 'const float * __restrict p_a = a.data();', code )
+		self.assertIn( 'float * __restrict p_out = out.data();', code )
+		self.assertIn( 'const float s_scale = scale;', code )
+		self.assertIn( 'parallel_for(count, 64, ', code )
+
+		## the scalar part is invariant, so it is computed once before the loop
+		loop = code[code.index( 'parallel_for' ):]
+		self.assertNotIn( 's_scale + 1', loop )
+		self.assertIn( 's_scale + 1', code[:code.index( 'parallel_for' )] )
+
+	def test_bad_expressions( self ):
+		for expression in 'total = a * 2', 'out = scale * 2':
+			with self.assertRaises( PluginException ):
+				self.generate( { 'Arr': node_spec( '0x00D802', expression ) } )
+
+	@unittest.skipIf( support.compiler is None, "no C++ compiler" )
+	def test_compiles( self ):
+		folder = tempfile.mkdtemp( )
+		try:
+			project = os.path.join( folder, 'project' )
+			support.write_project( support.make_plugin( { 'Arr': node_spec( '0x00D803', 'out = a * b + scale' ) } ),
+				project )
+			include = support.write_sdk( project, os.path.join( folder, 'sdk' ) )
+
+			for name in 'Arr.cpp', 'Arr_main.cpp':
+				code, output = support.compile_source( os.path.join( project, name ), include )
+				self.assertEqual( code, 0, "%s does not compile:\n%s" % (name, output) )
+		finally:
+			shutil.rmtree( folder, ignore_errors=True )
+
+
+if __name__ == '__main__':
+	unittest.main( )
@@ -0,0 +1,107 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_BATCH.PY
+
+Batch runs: several specs generated in one invocation, each to a folder
+of its own, with a combined report.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import json, os, shutil, tempfile, unittest
+
+import support
+
+from nodesmith.cli import CLIException, expand_specs
+
+## ----------------------------------------------------------------------
+
+def node( index ):
+	return ({
+		'node_name': 'node%d' % index, 'id': '0x00E0%02X' % index, 'expression': 'out = a * %d' % index,
+		'inputs': { 'a': { 'default': 0.0 } }, 'outputs': { 'out': { 'default': 0.0 } },
+	})
+
+
+## ----------------------------------------------------------------------
+class BatchTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.folder = tempfile.mkdtemp( )
+		self.specs = os.path.join( self.folder, 'specs' )
+		self.output = os.path.join( self.folder, 'out' )
+
+		support.write_spec( self.specs, { 'Alpha': node( 1 ) }, name='alpha.json' )
+		support.write_spec( self.specs, { 'Beta': node( 2 ), 'Gamma': node( 3 ) }, name='beta.json' )
+
+	def tearDown( self ):
+		shutil.rmtree( self.folder, ignore_errors=True )
+
+	def spec( self, name ):
+		return (os.path.join( self.specs, name ))
+
+	def test_expand_specs( self ):
+		self.assertEqual( expand_specs( [ self.spec( 'beta.json' ), self.spec( '*.json' ) ] ),
+			[ self.spec( 'beta.json' ), self.spec( 'alpha.json' ) ] )
+
+		for pattern in self.spec( 'missing.json' ), self.spec( '*.txt' ):
+			with self.assertRaises( CLIException ):
+				expand_specs( [ pattern ] )
+
+	def test_batch( self ):
+		report = os.path.join( self.folder, 'report.json' )
+		code, text = support.run_cli( self.spec( '*.json' ), '-folder', self.output, '-jobs', '2', '-report', report )
+		self.assertEqual( code, 0, text )
+
+		self.assertIn( '2 plugin(s)', text )
+		self.assertTrue( os.path.isfile( os.path.join( self.output, 'alpha', 'Alpha.cpp' ) ) )
+		self.assertTrue( os.path.isfile( os.path.join( self.output, 'beta', 'Gamma.cpp' ) ) )
+
+		with open( report, 'r' ) as fp:
+			data = json.load( fp )
+		self.assertEqual( [ (x['spec'], x['status'], x['nodes']) for x in data['plugins'] ],
+			[ (self.spec( 'alpha.json' ), 'ok', 1), (self.spec( 'beta.json' ), 'ok', 2) ] )
+
+	def test_matches_single_runs( self ):
+		code, text = support.run_cli( self.spec( 'alpha.json' ), self.spec( 'beta.json' ),
+			'-folder', os.path.join( self.output, 'batch', '{name}' ) )
+		self.assertEqual( code, 0, text )
+
+		for name in 'alpha', 'beta':
+			single = os.path.join( self.output, 'single', name )
+			code, text = support.run_cli( self.spec( name + '.json' ), '-folder', single )
+			self.assertEqual( code, 0, text )
+			self.assertTrue( support.read_folder( single ) == support.read_folder( os.path.join( self.output, 'batch', name ) ),
+				name )
+
+	def test_broken_spec_does_not_stop_the_batch( self ):
+		with open( self.spec( 'broken.json' ), 'w' ) as fp:
+			fp.write( '{ "name": ' )
+
+		report = os.path.join( self.folder, 'report.json' )
+		code, text = support.run_cli( self.spec( '*.json' ), '-folder', self.output, '-report', report )
+
+		self.assertEqual( code, 1 )
+		self.assertIn( '1 failed', text )
+		self.assertTrue( os.path.isfile( os.path.join( self.output, 'alpha', 'Alpha.cpp' ) ) )
+		self.assertTrue( os.path.isfile( os.path.join( self.output, 'beta', 'Beta.cpp' ) ) )
+
+		with open( report, 'r' ) as fp:
+			statuses = [ x['status'] for x in json.load( fp )['plugins'] ]
+		self.assertEqual( statuses, [ 'ok', 'ok', 'error' ] )
+
+	def test_outputs_must_differ( self ):
+		other = os.path.join( self.folder, 'other' )
+		support.write_spec( other, { 'Delta': node( 4 ) }, name='alpha.json' )
+
+		code, text = support.run_cli( self.spec( 'alpha.json' ), os.path.join( other, 'alpha.json' ),
+			'-folder', self.output )
+		self.assertEqual( code, 1 )
+		self.assertIn( 'would both be written', text )
+
+
+if __name__ == '__main__':
+	unittest.main( )
@@ -0,0 +1,116 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_BUILDPROFILES.PY
+
+Build profiles: the profile table built from a spec's 'build' object and
+the compiler flags each profile writes to CMakeLists.txt.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import unittest
+
+import support
+
+from nodesmith.buildprofiles import BuildProfileException, builtin_profiles, gcc_flags, msvc_flags, resolve_profiles
+from nodesmith.plugin import Plugin, PluginException
+
+## ----------------------------------------------------------------------
+class ResolveTest( unittest.TestCase ):
+
+	def test_builtin( self ):
+		profiles, default = resolve_profiles( )
+
+		self.assertEqual( list( profiles ), list( builtin_profiles ) )
+		self.assertEqual( default, 'release' )
+		self.assertEqual( profiles['debug']['optimize'], 0 )
+		self.assertFalse( profiles['release']['lto'] )
+
+	def test_custom( self ):
+		profiles, default = resolve_profiles( { 'profile': 'ship', 'arch': 'avx2', 'profiles': {
+			'ship': { 'base': 'release-lto', 'fast_math': True },
+			'debug': { 'arch': None },
+		} } )
+
+		self.assertEqual( default, 'ship' )
+		self.assertTrue( profiles['ship']['lto'] )
+		self.assertTrue( profiles['ship']['fast_math'] )
+		self.assertEqual( profiles['ship']['arch'], 'avx2' )
+		self.assertEqual( profiles['release']['arch'], 'avx2' )
+
+		## overriding a builtin profile starts from it
+		self.assertEqual( profiles['debug']['optimize'], 0 )
+		self.assertIsNone( profiles['debug']['arch'] )
+
+	def test_errors( self ):
+		for data in [
+			{ 'bogus': 1 },
+			{ 'profile': 'nope' },
+			{ 'profiles': [ ] },
+			{ 'profiles': { 'x': { 'base': 'nope' } } },
+			{ 'profiles': { 'x': { 'inline': True } } },
+			{ 'profiles': { 'x': { 'optimize': 4 } } },
+			{ 'profiles': { 'x': { 'pgo': 'train' } } },
+			{ 'profiles': { 'x': { 'optimize': True } } },
+			{ 'profiles': { 'x': { 'lto': 'yes' } } },
+			{ 'profiles': { 'x': { 'debug': 1 } } },
+			{ 'fast_math': 'true' },
+			{ 'arch': 'native -fplugin=evil.so' },
+			{ 'arch': 'x86-64 )\nexecute_process( COMMAND rm' },
+			{ 'arch': '-mavx' },
+			{ 'arch': 2 },
+		]:
+			with self.assertRaises( BuildProfileException, msg=str( data ) ):
+				resolve_profiles( data )
+
+	def test_march_names( self ):
+		for arch in 'x86-64-v3', 'skylake-avx512', 'armv8.2-a+crypto':
+			profiles = resolve_profiles( { 'arch': arch } )[0]
+			self.assertIn( '-march=%s' % arch, gcc_flags( profiles['release'] )[0] )
+
+	def test_plugin_reports_errors( self ):
+		data = { 'name': 'tests', 'author': 'tests', 'version': '1.0', 'nodes': { }, 'build': { 'profile': 'nope' } }
+		with self.assertRaises( PluginException ):
+			Plugin( ).from_json( data )
+
+
+## ----------------------------------------------------------------------
+class FlagsTest( unittest.TestCase ):
+
+	def test_gcc( self ):
+		profiles = resolve_profiles( { 'arch': 'avx2', 'fast_math': True } )[0]
+
+		compile_flags, link_flags = gcc_flags( profiles['release-lto'] )
+		self.assertEqual( compile_flags, [ '-O3', '-g', '-mavx2', '-mfma', '-ffast-math', '-flto' ] )
+		self.assertEqual( link_flags, [ '-flto' ] )
+
+		compile_flags, link_flags = gcc_flags( profiles['pgo-instrument'] )
+		self.assertIn( '-fprofile-generate=${NODESMITH_PGO_DIR}', compile_flags )
+		self.assertIn( '-fprofile-generate=${NODESMITH_PGO_DIR}', link_flags )
+
+	def test_msvc( self ):
+		profiles = resolve_profiles( { 'arch': 'avx2' } )[0]
+
+		self.assertEqual( msvc_flags( profiles['debug'] ), ([ '/Od', '/Zi', '/arch:AVX2', '/fp:precise' ], [ ]) )
+		self.assertEqual( msvc_flags( profiles['release-lto'] ),
+			([ '/O2', '/Ob2', '/Zi', '/arch:AVX2', '/fp:precise', '/GL' ], [ '/LTCG' ]) )
+
+		link_flags = msvc_flags( profiles['pgo-use'] )[1]
+		self.assertIn( '/USEPROFILE:PGD=${NODESMITH_PGO_DIR}/${PROJECT_NAME}.pgd', link_flags )
+
+	def test_cmake( self ):
+		plugin = support.make_plugin( { } )
+		plugin.build_profiles, plugin.build_profile = resolve_profiles( { 'profile': 'debug' } )
+		cmake = dict( plugin.generate_all( ) )['CMakeLists.txt']
+
+		self.assertIn( 'set( NODESMITH_PROFILE "debug" CACHE STRING', cmake )
+		self.assertIn( 'if( NODESMITH_PROFILE STREQUAL "debug" )', cmake )
+		self.assertIn( 'elseif( NODESMITH_PROFILE STREQUAL "pgo-use" )', cmake )
+		self.assertIn( 'target_compile_options( tests PRIVATE -O3 -g -flto )', cmake )
+
+
+if __name__ == '__main__':
+	unittest.main( )
@@ -0,0 +1,84 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_CMAKE.PY
+
+Linux CMake project: configures and builds against the stub SDK, through
+ccache when it is found.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, shutil, stat, sys, tempfile, unittest
+
+import support
+
+## ----------------------------------------------------------------------
+
+## stands in for ccache: records each compile, then runs it
+fake_ccache = """#!/bin/sh
+echo "$@" >> "%s"
+exec "$@"
+"""
+
+nodes = {
+	'Gain': {
+		'node_name': 'gain', 'id': '0x00D401',
+		'expression': 'out = a * b',
+		'inputs': { 'a': { 'default': 1.0 }, 'b': { 'default': 2.0 } },
+		'outputs': { 'out': { 'default': 0.0 } },
+	},
+}
+
+
+## ----------------------------------------------------------------------
+@unittest.skipIf( not sys.platform.startswith( 'linux' ), "Linux only" )
+@unittest.skipIf( support.cmake is None or support.compiler is None, "no cmake or C++ compiler" )
+class CMakeTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.folder = tempfile.mkdtemp( )
+		self.project = os.path.join( self.folder, 'project' )
+		self.build = os.path.join( self.folder, 'build' )
+
+		support.write_project( support.make_plugin( nodes ), self.project )
+		self.sdk = os.path.join( self.folder, 'sdk' )
+		support.write_sdk( self.project, self.sdk )
+
+		## a ccache that only this test's PATH finds
+		bin_folder = os.path.join( self.folder, 'bin' )
+		os.makedirs( bin_folder )
+		self.ccache_log = os.path.join( self.folder, 'ccache.log' )
+		launcher = os.path.join( bin_folder, 'ccache' )
+		with open( launcher, 'w' ) as fp:
+			fp.write( fake_ccache % self.ccache_log )
+		os.chmod( launcher, os.stat( launcher ).st_mode | stat.S_IEXEC )
+
+		self.env = dict( os.environ, PATH=bin_folder + os.pathsep + os.environ.get( 'PATH', '' ),
+			CXX=support.compiler )
+
+	def tearDown( self ):
+		shutil.rmtree( self.folder, ignore_errors=True )
+
+	def build_project( self, *options ):
+		code, output = support.build_project( self.project, self.sdk, self.build, *options, env=self.env )
+		self.assertEqual( code, 0, output )
+
+	def test_builds_through_ccache( self ):
+		self.build_project( )
+
+		self.assertTrue( os.path.isfile( os.path.join( self.project, 'tests.so' ) ) )
+		with open( self.ccache_log, 'r' ) as fp:
+			self.assertIn( 'Gain.cpp', fp.read( ) )
+
+	def test_ccache_can_be_turned_off( self ):
+		self.build_project( '-DUSE_CCACHE=OFF' )
+
+		self.assertTrue( os.path.isfile( os.path.join( self.project, 'tests.so' ) ) )
+		self.assertFalse( os.path.exists( self.ccache_log ) )
+
+
+if __name__ == '__main__':
+	unittest.main( )
@@ -0,0 +1,109 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_DEFORMER.PY
+
+Deformer nodes: deform() reading every point once and running
+deform_point() over them in chunks, and deformers compiling against the
+stub.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, shutil, tempfile, unittest
+
+import support
+
+from nodesmith.plugin import PluginException
+
+## ----------------------------------------------------------------------
+
+nodes = {
+	'Push': {
+		'kind': 'deformer', 'node_name': 'push', 'id': '0x00E301',
+		'expression': 'point = point * (1 + amount * falloff(index / 100))',
+		'inputs': { 'amount': { 'default': 1.0 }, 'falloff': { 'type': 'ramp', 'default': [ [ 0, 1 ] ] } },
+	},
+	'Jiggle': {
+		'kind': 'deformer', 'node_name': 'jiggle', 'id': '0x00E302', 'profile': True,
+		'scheduling': 'globally_serial', 'parallel_threshold': 64,
+		'code': 'point.x += offset;',
+		'inputs': { 'offset': { 'default': 0.0 } },
+	},
+	'Gain': {
+		'node_name': 'gain', 'id': '0x00E303', 'expression': 'out = a * 2',
+		'inputs': { 'a': { 'default': 0.0 } }, 'outputs': { 'out': { 'default': 0.0 } },
+	},
+}
+
+def deformer( **settings ):
+	node = { 'kind': 'deformer', 'node_name': 'bad', 'id': '0x00E304', 'code': '',
+		'inputs': { 'amount': { 'default': 0.0 } } }
+	node.update( settings )
+	return ({ 'Bad': node })
+
+
+## ----------------------------------------------------------------------
+class DeformerTest( unittest.TestCase ):
+
+	@classmethod
+	def setUpClass( cls ):
+		cls.plugin = support.make_plugin( nodes )
+		cls.files = dict( cls.plugin.generate_all( ) )
+
+	def deform( self, name ):
+		code = self.files[name + '.cpp']
+		return (code[code.index( '::deform(' ):code.index( '::creator(' )])
+
+	def test_deform( self ):
+		deform = self.deform( 'Push' )
+
+		self.assertEqual( deform.count( 'iter.allPositions( points )' ), 1 )
+		self.assertEqual( deform.count( 'iter.setAllPositions( points )' ), 1 )
+		self.assertIn( 'parallel_for( count, 16384, [=]( size_t begin, size_t end ) {', deform )
+		self.assertIn( 'deform_point( point, index[i] );', deform )
+		self.assertNotIn( 'MProfil', deform )
+
+		self.assertIn( 'parallel_for( count, 64,', self.deform( 'Jiggle' ) )
+		self.assertIn( 'MProfilingScope profile_deform(', self.deform( 'Jiggle' ) )
+
+	def test_registration( self ):
+		main = self.files['plugin_main.cpp']
+		self.assertIn( 'Push::creator, Push::initialize, MPxNode::kDeformerNode );', main )
+		self.assertIn( 'Gain::creator, Gain::initialize );', main )
+
+		self.assertIn( 'class Push : public MPxDeformerNode', self.files['Push.h'] )
+		self.assertIn( 'return kGloballySerial;', self.files['Jiggle.h'] )
+
+	def test_point_expression( self ):
+		main = self.files['Push_main.cpp']
+		self.assertIn( 'void Push::deform_point( MPoint &point, unsigned int index ) const', main )
+		self.assertIn( 'point = point * (1 + amount * falloff(double(index) / 100));', main )
+
+	def test_errors( self ):
+		for settings in [ { 'outputs': { 'out': { 'default': 0.0 } } },
+						  { 'inputs': { 'envelope': { 'default': 0.0 } } },
+						  { 'memoize': True },
+						  { 'code': None, 'expression': 'point = point + amount' } ]:
+			with self.assertRaises( PluginException, msg=str( settings ) ):
+				dict( support.make_plugin( deformer( **settings ) ).generate_all( ) )
+
+	@unittest.skipIf( support.compiler is None, "no C++ compiler" )
+	def test_compiles( self ):
+		folder = tempfile.mkdtemp( )
+		try:
+			project = os.path.join( folder, 'project' )
+			support.write_project( self.plugin, project )
+			include = support.write_sdk( project, os.path.join( folder, 'sdk' ) )
+
+			for name in 'Push.cpp', 'Push_main.cpp', 'Jiggle.cpp', 'Jiggle_main.cpp', 'plugin_main.cpp':
+				code, output = support.compile_source( os.path.join( project, name ), include )
+				self.assertEqual( code, 0, "%s does not compile:\n%s" % (name, output) )
+		finally:
+			shutil.rmtree( folder, ignore_errors=True )
+
+
+if __name__ == '__main__':
+	unittest.main( )
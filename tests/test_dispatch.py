@@ -0,0 +1,89 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_DISPATCH.PY
+
+compute() dispatch: the branch of a plug is found through one attribute
+index lookup, and each branch fetches every data handle once.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, re, shutil, tempfile, unittest
+
+import support
+
+## ----------------------------------------------------------------------
+
+nodes = {
+	'Two': {
+		'node_name': 'two', 'id': '0x00E101', 'code': 'outA = a * 2;\noutB = b;',
+		'inputs': { 'a': { 'default': 0.0 }, 'b': { 'default': 0.0, 'array': True } },
+		'outputs': { 'outA': { 'default': 0.0, 'affects': [ 'a' ] },
+			'outB': { 'default': 0.0, 'array': True, 'affects': [ 'b' ] } },
+	},
+	'One': {
+		'node_name': 'one', 'id': '0x00E102', 'expression': 'out = a + b',
+		'inputs': { 'a': { 'default': 0.0 }, 'b': { 'default': 0.0 } },
+		'outputs': { 'out': { 'default': 0.0 } },
+	},
+}
+
+
+## ----------------------------------------------------------------------
+class DispatchTest( unittest.TestCase ):
+
+	@classmethod
+	def setUpClass( cls ):
+		cls.plugin = support.make_plugin( nodes )
+		cls.files = dict( cls.plugin.generate_all( ) )
+
+	def compute( self, name ):
+		code = self.files[name + '.cpp']
+		return (code[code.index( '::compute(' ):code.index( '::creator(' )])
+
+	def test_index( self ):
+		code = self.files['Two.cpp']
+		self.assertIn( 'static const AttributeIndex index {\n\t\t{ Two::oOutA, 0 },\n\t\t{ Two::oOutB, 1 },\n\t};', code )
+		self.assertIn( 'return index.find( plug );', code )
+		self.assertIn( 'class AttributeIndex', self.files['common.h'] )
+
+	def test_branches( self ):
+		compute = self.compute( 'Two' )
+		self.assertIn( 'switch( Two_branch(plug) ) {', compute )
+		self.assertEqual( re.findall( r'case (\d+):', compute ), [ '0', '1' ] )
+		self.assertNotIn( 'plug ==', compute )
+
+		## a single branch needs no switch
+		compute = self.compute( 'One' )
+		self.assertIn( 'if( One_branch(plug) >= 0 ) {', compute )
+		self.assertNotIn( 'switch', compute )
+
+	def test_handles_are_fetched_once( self ):
+		compute = self.compute( 'Two' )
+		for call in 'inputValue(iA)', 'outputValue(oOutA)', 'inputArrayValue(iB)', 'outputArrayValue(oOutB)':
+			self.assertEqual( compute.count( call ), 1, call )
+
+		compute = self.compute( 'One' )
+		self.assertEqual( compute.count( 'outputValue(oOut)' ), 1 )
+		self.assertIn( 'h_out.setFloat(out);\n\t\th_out.setClean();', compute )
+
+	@unittest.skipIf( support.compiler is None, "no C++ compiler" )
+	def test_compiles( self ):
+		folder = tempfile.mkdtemp( )
+		try:
+			project = os.path.join( folder, 'project' )
+			support.write_project( self.plugin, project )
+			include = support.write_sdk( project, os.path.join( folder, 'sdk' ) )
+
+			for name in 'Two.cpp', 'One.cpp':
+				code, output = support.compile_source( os.path.join( project, name ), include )
+				self.assertEqual( code, 0, "%s does not compile:\n%s" % (name, output) )
+		finally:
+			shutil.rmtree( folder, ignore_errors=True )
+
+
+if __name__ == '__main__':
+	unittest.main( )
@@ -0,0 +1,90 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_EXPRESSION.PY
+
+Expression compiler: type checks, constant folding, common
+subexpressions and the constants C++ cannot spell.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import unittest
+
+import support
+
+from nodesmith.expression import ExpressionException, Symbol, compile_expression, kMatrix, kScalar, kVector
+
+## ----------------------------------------------------------------------
+
+symbols = {
+	'a': Symbol( 'a', kScalar ),
+	'b': Symbol( 'b', kScalar ),
+	'v': Symbol( 'v', kVector ),
+	'm': Symbol( 'm', kMatrix ),
+	'out': Symbol( 'out', kScalar, writable=True ),
+	'vout': Symbol( 'vout', kVector, writable=True ),
+}
+
+constants = { 'GAIN': 2.5, 'COUNT': '4', 'NAME': 'text', 'HUGE': '1e999' }
+
+
+## ----------------------------------------------------------------------
+class ExpressionTest( unittest.TestCase ):
+
+	def compile( self, text ):
+		return (compile_expression( text, symbols, constants )[2])
+
+	def assertRejected( self, text, message ):
+		with self.assertRaises( ExpressionException ) as context:
+			self.compile( text )
+		self.assertIn( message, str( context.exception ) )
+
+	def test_folding( self ):
+		self.assertEqual( self.compile( 'out = a * (2 + 3)' ), [ 'out = a * 5;' ] )
+		self.assertEqual( self.compile( 'out = a * GAIN * COUNT' ), [ 'out = a * 2.5 * 4;' ] )
+		self.assertEqual( self.compile( 'out = a + 7 / 2 + -7 / 2' ), [ 'out = a + 3 + -3;' ] )
+		self.assertEqual( self.compile( 'out = a + 1 / 4.0' ), [ 'out = a + 0.25;' ] )
+		self.assertEqual( self.compile( 'out = a + sqrt(16)' ), [ 'out = a + 4.0;' ] )
+
+	def test_grouping_is_kept( self ):
+		## reassociating would change floating point results
+		self.assertEqual( self.compile( 'out = a + (b + 1)' ), [ 'out = a + (b + 1);' ] )
+		self.assertEqual( self.compile( 'out = a - (b - 1)' ), [ 'out = a - (b - 1);' ] )
+
+	def test_common_subexpressions( self ):
+		lines = self.compile( 'out = sin(a * b) + sin(b * a) * 2' )
+		self.assertEqual( lines, [ 'const auto _cse0 = std::sin(a * b);', 'out = _cse0 + _cse0 * 2;' ] )
+
+		## a local is computed once and read by name
+		lines = self.compile( 't = a * b;\nout = t * t' )
+		self.assertEqual( lines, [ 'const auto t = a * b;', 'out = t * t;' ] )
+
+	def test_types( self ):
+		self.assertEqual( self.compile( 'vout = v * m * a' ), [ 'vout = v * m * a;' ] )
+		self.assertRejected( 'out = v', "'out' is scalar but is assigned vector" )
+		self.assertRejected( 'out = a + v', "cannot apply '+' to scalar and vector" )
+		self.assertRejected( 'a = 1', "'a' is an input and cannot be assigned" )
+		self.assertRejected( 'out = a;\nout = b', "'out' is assigned more than once" )
+		self.assertRejected( 'out = nope', "'nope': unknown name" )
+		self.assertRejected( 'out = NAME', "'NAME': constant is not numeric" )
+		self.assertRejected( 'out = 1 / 0', "division by zero" )
+		self.assertRejected( 'out = sqrt(-1)', "cannot be evaluated" )
+
+	def test_non_finite_constants( self ):
+		self.assertRejected( 'out = a + 1e400', "constant evaluates to inf" )
+		self.assertRejected( 'out = a + HUGE', "constant evaluates to inf" )
+		self.assertRejected( 'out = a + 1e308 * 10', "'*': constant evaluates to inf" )
+		self.assertRejected( 'out = a + (-1e308 - 1e308)', "constant evaluates to -inf" )
+		self.assertRejected( 'out = a + 1e308 * 10 * 0', "constant evaluates to inf" )
+
+	def test_integers_past_64_bits( self ):
+		self.assertEqual( self.compile( 'out = a + 4294967296 * 2' ), [ 'out = a + 8589934592;' ] )
+		self.assertRejected( 'out = a + 99999999999 * 99999999999', "does not fit in a 64-bit integer" )
+		self.assertRejected( 'out = a + 9223372036854775808', "does not fit in a 64-bit integer" )
+
+
+if __name__ == '__main__':
+	unittest.main( )
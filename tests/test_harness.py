@@ -0,0 +1,88 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_HARNESS.PY
+
+Benchmark harness: the generated bench_<Class>.cpp builds against the
+stub SDK and runs.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, re, shutil, subprocess, tempfile, unittest
+
+import support
+
+## ----------------------------------------------------------------------
+
+p_report = re.compile( r'^(\w+): (\d+) evals in [\d.]+ s, [\d.]+ ns/eval, [\d.]+ Mevals/s, checksum (\S+)$', re.M )
+
+nodes = {
+	'Scalar': {
+		'node_name': 'scalar', 'id': '0x00D101',
+		'expression': 'out = sin(a * GAIN) + b;\nangle = clamp(b, 0, 1)',
+		'inputs': { 'a': { 'default': 1.0 }, 'b': { 'default': 0.5 } },
+		'outputs': { 'out': { 'default': 0.0 }, 'angle': { 'default': 0.0, 'type': 'angle' } },
+	},
+	'Arr': {
+		'node_name': 'arr', 'id': '0x00D102',
+		'expression': 'out = a * b * scale',
+		'inputs': { 'a': { 'default': 0.0, 'array': True }, 'b': { 'default': 0.0, 'array': True },
+			'scale': { 'default': 1.0 } },
+		'outputs': { 'out': { 'default': 0.0, 'array': True } },
+	},
+}
+
+
+## ----------------------------------------------------------------------
+@unittest.skipIf( support.compiler is None, "no C++ compiler" )
+class HarnessTest( unittest.TestCase ):
+
+	@classmethod
+	def setUpClass( cls ):
+		from nodesmith.stub_sdk import write_stub_sdk
+
+		cls.folder = tempfile.mkdtemp( )
+		cls.project = os.path.join( cls.folder, 'project' )
+
+		support.write_project( support.make_plugin( nodes, constants={ 'GAIN': 2.5 } ), cls.project, harness=True )
+		write_stub_sdk( cls.project, os.path.join( cls.folder, 'sdk' ) )
+		cls.include = os.path.join( cls.folder, 'sdk', 'include' )
+
+	@classmethod
+	def tearDownClass( cls ):
+		shutil.rmtree( cls.folder, ignore_errors=True )
+
+	def build( self, class_name ):
+		source = os.path.join( self.project, 'harness', 'bench_%s.cpp' % class_name )
+		program = os.path.join( self.folder, 'bench_%s' % class_name )
+
+		code, output = support.compile_source( source, self.include, program )
+		self.assertEqual( code, 0, "bench_%s.cpp does not compile:\n%s" % (class_name, output) )
+		return (program)
+
+	def run_bench( self, program, *args ):
+		process = subprocess.Popen( [ program ] + list( args ), stdout=subprocess.PIPE, stderr=subprocess.STDOUT )
+		output = process.communicate( )[0].decode( 'utf-8', 'replace' )
+		self.assertEqual( process.returncode, 0, output )
+		return (output)
+
+	def test_benchmarks_build_and_run( self ):
+		for class_name in sorted( nodes ):
+			program = self.build( class_name )
+			output = self.run_bench( program, '-iterations', '1000', '-elements', '16', '-seed', '7' )
+
+			match = p_report.search( output )
+			self.assertIsNotNone( match, "unexpected report:\n%s" % output )
+			self.assertEqual( match.group( 1 ), class_name )
+			self.assertEqual( int( match.group( 2 ) ), 1000 )
+
+			## the same seed fills the same inputs, so the checksum repeats
+			again = p_report.search( self.run_bench( program, '-iterations', '1000', '-elements', '16', '-seed', '7' ) )
+			self.assertEqual( again.group( 3 ), match.group( 3 ) )
+
+
+if __name__ == '__main__':
+	unittest.main( )
@@ -0,0 +1,71 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_INCLUDES.PY
+
+Per-node includes: each node header includes the Maya headers its own
+plugs need, and common.h only the ones every node needs.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import re, unittest
+
+import support
+
+## ----------------------------------------------------------------------
+
+nodes = {
+	'Plain': {
+		'node_name': 'plain', 'id': '0x00DC01', 'expression': 'out = a',
+		'inputs': { 'a': { 'default': 0.0 } }, 'outputs': { 'out': { 'default': 0.0 } },
+	},
+	'Mat': {
+		'node_name': 'mat', 'id': '0x00DC02', 'code': 'out = m;',
+		'inputs': { 'm': { 'type': 'matrix', 'array': True, 'default': 0 } },
+		'outputs': { 'out': { 'type': 'matrix', 'array': True, 'default': 0 } },
+	},
+	'Curve': {
+		'node_name': 'curve', 'id': '0x00DC03', 'expression': 'out = falloff(turn)',
+		'inputs': { 'falloff': { 'type': 'ramp', 'default': [ [ 0, 0 ], [ 1, 1 ] ] },
+			'turn': { 'type': 'angle', 'default': 0.0 } },
+		'outputs': { 'out': { 'default': 0.0 } },
+	},
+}
+
+p_include = re.compile( r'#include <(maya/\w+\.h)>' )
+
+per_node = set( [ 'maya/MFnNumericAttribute.h', 'maya/MFnMatrixAttribute.h', 'maya/MFnUnitAttribute.h',
+	'maya/MRampAttribute.h', 'maya/MArrayDataHandle.h', 'maya/MArrayDataBuilder.h' ] )
+
+
+## ----------------------------------------------------------------------
+class IncludesTest( unittest.TestCase ):
+
+	@classmethod
+	def setUpClass( cls ):
+		cls.files = dict( support.make_plugin( nodes ).generate_all( ) )
+
+	def includes( self, name ):
+		return (set( p_include.findall( self.files[name] ) ))
+
+	def test_node_headers( self ):
+		self.assertEqual( self.includes( 'Plain.h' ) & per_node, set( [ 'maya/MFnNumericAttribute.h' ] ) )
+		self.assertEqual( self.includes( 'Mat.h' ) & per_node, set( [ 'maya/MFnMatrixAttribute.h',
+			'maya/MArrayDataHandle.h', 'maya/MArrayDataBuilder.h' ] ) )
+		self.assertEqual( self.includes( 'Curve.h' ) & per_node, set( [ 'maya/MFnNumericAttribute.h',
+			'maya/MFnUnitAttribute.h', 'maya/MRampAttribute.h' ] ) )
+
+	def test_common_header( self ):
+		## the ramp lookup table is a shared helper, so only it comes along
+		self.assertEqual( self.includes( 'common.h' ) & per_node, set( [ 'maya/MRampAttribute.h' ] ) )
+		self.assertIn( 'maya/MPxNode.h', self.includes( 'common.h' ) )
+
+		common = dict( support.make_plugin( { 'Plain': nodes['Plain'] } ).generate_all( ) )['common.h']
+		self.assertFalse( set( p_include.findall( common ) ) & per_node )
+
+
+if __name__ == '__main__':
+	unittest.main( )
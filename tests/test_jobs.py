@@ -0,0 +1,78 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_JOBS.PY
+
+Parallel generation: -jobs N writes the same bytes as a serial run.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, shutil, tempfile, unittest, zipfile
+
+import support
+
+## ----------------------------------------------------------------------
+
+def make_nodes( count ):
+	"""
+	Nodes of every flavour: scalar and array plugs, sparse affects and an
+	explicit scheduling.
+	"""
+	result = { }
+	for index in range( count ):
+		array = index % 2 == 0
+		node = {
+			'node_name': 'node%02d' % index, 'id': '0x00D6%02X' % index,
+			'expression': 'out = a * %d + b;\nother = b - a' % index,
+			'inputs': { 'a': { 'default': 1.0 }, 'b': { 'default': 2.0, 'array': array } },
+			'outputs': { 'out': { 'default': 0.0, 'array': array }, 'other': { 'default': 0.0, 'array': array } },
+		}
+		if index % 3 == 0:
+			node['scheduling'] = 'serial'
+		if not array:
+			node['expression'] = 'out = a * %d;\nother = b - a' % index
+			node['outputs']['out']['affects'] = [ 'a' ]
+		result['Node%02d' % index] = node
+	return (result)
+
+
+## ----------------------------------------------------------------------
+class JobsTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.folder = tempfile.mkdtemp( )
+		self.spec = support.write_spec( self.folder, make_nodes( 12 ), unity_batches=3 )
+
+	def tearDown( self ):
+		shutil.rmtree( self.folder, ignore_errors=True )
+
+	def generate( self, *args ):
+		code, output = support.run_cli( self.spec, '-harness', *args )
+		self.assertEqual( code, 0, output )
+		return (output)
+
+	def test_folder_output_matches_serial( self ):
+		serial = os.path.join( self.folder, 'serial' )
+		parallel = os.path.join( self.folder, 'parallel' )
+
+		report = self.generate( '-folder', serial, '-jobs', '1' )
+		self.assertEqual( self.generate( '-folder', parallel, '-jobs', '4' ).replace( parallel, serial ), report )
+
+		self.assertEqual( support.read_folder( parallel ), support.read_folder( serial ) )
+
+	def test_archive_matches_serial( self ):
+		contents = [ ]
+		for jobs in '1', '4':
+			archive = os.path.join( self.folder, 'jobs%s.zip' % jobs )
+			self.generate( '-archive', archive, '-jobs', jobs )
+			with zipfile.ZipFile( archive ) as fp:
+				contents.append( [ (x, fp.read( x )) for x in fp.namelist( ) ] )
+
+		self.assertEqual( contents[1], contents[0] )
+
+
+if __name__ == '__main__':
+	unittest.main( )
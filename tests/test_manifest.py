@@ -0,0 +1,139 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_MANIFEST.PY
+
+Incremental regeneration: unchanged files are not rewritten and
+hand-edited node main files are kept.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, shutil, tempfile, unittest
+
+import support
+
+from nodesmith.manifest import Manifest, kAdded, kChanged, kKept, kUnchanged
+
+## ----------------------------------------------------------------------
+
+def node_spec( type_id, expression ):
+	return ({
+		'node_name': 'n%s' % type_id, 'id': type_id, 'expression': expression,
+		'inputs': { 'a': { 'default': 1.0 }, 'b': { 'default': 2.0 } },
+		'outputs': { 'out': { 'default': 0.0 } },
+	})
+
+
+## ----------------------------------------------------------------------
+class ManifestTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.folder = tempfile.mkdtemp( )
+
+	def tearDown( self ):
+		shutil.rmtree( self.folder, ignore_errors=True )
+
+	def path( self, name ):
+		return (os.path.join( self.folder, name ))
+
+	def test_statuses( self ):
+		manifest = Manifest( self.folder, generator='g' )
+		self.assertEqual( manifest.write( 'a.cpp', 'a' ), kAdded )
+		self.assertEqual( manifest.write( 'n_main.cpp', 'main', protect=True ), kAdded )
+		manifest.save( )
+
+		## make a rewrite visible through the modification time
+		os.utime( self.path( 'a.cpp' ), (0, 0) )
+		with open( self.path( 'n_main.cpp' ), 'w' ) as fp:
+			fp.write( 'edited' )
+
+		manifest = Manifest( self.folder, generator='g' )
+		self.assertEqual( manifest.write( 'a.cpp', 'a' ), kUnchanged )
+		self.assertEqual( os.stat( self.path( 'a.cpp' ) ).st_mtime, 0 )
+		self.assertEqual( manifest.write( 'n_main.cpp', 'new main', protect=True ), kKept )
+		manifest.save( )
+
+		with open( self.path( 'n_main.cpp' ), 'r' ) as fp:
+			self.assertEqual( fp.read( ), 'edited' )
+
+		## still protected on the next run, until forced
+		manifest = Manifest( self.folder, generator='g' )
+		self.assertEqual( manifest.write( 'n_main.cpp', 'new main', protect=True ), kKept )
+		self.assertEqual( manifest.write( 'n_main.cpp', 'new main', protect=True, force=True ), kChanged )
+		self.assertEqual( manifest.write( 'a.cpp', 'b' ), kChanged )
+
+	def generate( self, nodes, *args ):
+		spec = support.write_spec( self.folder, nodes )
+		code, output = support.run_cli( spec, '-folder', self.path( 'out' ), *args )
+		self.assertEqual( code, 0, output )
+		return (output)
+
+	def test_regeneration( self ):
+		nodes = { 'Gain': node_spec( '0x00D501', 'out = a * b' ), 'Sum': node_spec( '0x00D502', 'out = a + b' ) }
+		self.generate( nodes )
+		before = support.read_folder( self.path( 'out' ) )
+
+		output = self.generate( nodes )
+		self.assertIn( 'Files: 0 added, 0 changed, %d unchanged' % (len( before ) - 1), output )
+		self.assertEqual( support.read_folder( self.path( 'out' ) ), before )
+
+		## a hand-edited main file survives a change of its node
+		main = self.path( os.path.join( 'out', 'Gain_main.cpp' ) )
+		with open( main, 'a' ) as fp:
+			fp.write( '// edited\n' )
+
+		nodes['Gain'] = node_spec( '0x00D501', 'out = a - b' )
+		output = self.generate( nodes )
+		self.assertIn( 'Gain_main.cpp has been edited by hand', output )
+		self.assertIn( 'Nodes changed: Gain\n', output )
+		self.assertIn( 'Files: 0 added, 0 changed, %d unchanged, 1 kept' % (len( before ) - 2), output )
+		with open( main, 'r' ) as fp:
+			self.assertTrue( fp.read( ).endswith( '// edited\n' ) )
+
+		output = self.generate( nodes, '-force' )
+		self.assertIn( 'Files: 0 added, 1 changed', output )
+		with open( main, 'r' ) as fp:
+			self.assertIn( 'a - b', fp.read( ) )
+
+	def test_removed_node( self ):
+		nodes = { 'Gain': node_spec( '0x00D501', 'out = a * b' ), 'Sum': node_spec( '0x00D502', 'out = a + b' ),
+			'Diff': node_spec( '0x00D503', 'out = a - b' ) }
+		self.generate( nodes, '-harness' )
+		with open( self.path( os.path.join( 'out', 'Sum_main.cpp' ) ), 'a' ) as fp:
+			fp.write( '// edited\n' )
+
+		del nodes['Sum'], nodes['Diff']
+		output = self.generate( nodes )
+		self.assertIn( 'Nodes removed: Diff, Sum\n', output )
+		self.assertIn( 'left in place: Sum_main.cpp\n', output )
+
+		files = support.read_folder( self.path( 'out' ) )
+		for name in 'Diff.h', 'Diff.cpp', 'Diff_main.cpp', 'Sum.h', 'Sum.cpp':
+			self.assertNotIn( name, files )
+		self.assertIn( 'Sum_main.cpp', files )
+		self.assertIn( 'Gain.cpp', files )
+
+		## harness files are only generated with -harness, and their folder goes with them
+		self.assertFalse( [ x for x in files if x.startswith( 'harness/' ) ] )
+
+		## the edited file is the user's now
+		output = self.generate( nodes )
+		self.assertNotIn( 'Sum_main.cpp', output )
+		self.assertTrue( os.path.isfile( self.path( os.path.join( 'out', 'Sum_main.cpp' ) ) ) )
+
+	def test_removed_edited_file_is_forced( self ):
+		nodes = { 'Gain': node_spec( '0x00D501', 'out = a * b' ), 'Sum': node_spec( '0x00D502', 'out = a + b' ) }
+		self.generate( nodes )
+		with open( self.path( os.path.join( 'out', 'Sum_main.cpp' ) ), 'a' ) as fp:
+			fp.write( '// edited\n' )
+
+		del nodes['Sum']
+		self.generate( nodes, '-force' )
+		self.assertFalse( os.path.exists( self.path( os.path.join( 'out', 'Sum_main.cpp' ) ) ) )
+
+
+if __name__ == '__main__':
+	unittest.main( )
@@ -0,0 +1,94 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_MEMOIZE.PY
+
+Memoized nodes: node_main() is skipped while the inputs a branch reads
+match the last run, and never on a branch's first compute.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, re, shutil, tempfile, unittest
+
+import support
+
+## ----------------------------------------------------------------------
+
+nodes = {
+	'Wide': {
+		'node_name': 'wide', 'id': '0x00D901', 'memoize': True,
+		'expression': 'outA = in1 * 2;\noutB = in2 + in3',
+		'inputs': { 'in1': { 'default': 0.0 }, 'in2': { 'default': 0.0 }, 'in3': { 'default': 0.0, 'type': 'angle' } },
+		'outputs': { 'outA': { 'default': 0.0, 'affects': [ 'in1' ] },
+			'outB': { 'default': 0.0, 'type': 'angle', 'affects': [ 'in2', 'in3' ] } },
+	},
+	'Arr': {
+		'node_name': 'arr', 'id': '0x00D902', 'memoize': True,
+		'expression': 'out = a * scale',
+		'inputs': { 'a': { 'default': 0.0, 'array': True }, 'scale': { 'default': 1.0 } },
+		'outputs': { 'out': { 'default': 0.0, 'array': True } },
+	},
+}
+
+
+## ----------------------------------------------------------------------
+class MemoizeTest( unittest.TestCase ):
+
+	@classmethod
+	def setUpClass( cls ):
+		cls.plugin = support.make_plugin( nodes )
+		cls.files = dict( cls.plugin.generate_all( ) )
+
+	def branches( self, code ):
+		switch = code[code.index( 'switch(' ):code.index( 'return MS::kUnknownParameter;' )]
+		return (re.split( r'\n\tcase \d+: ', switch )[1:])
+
+	def test_state_is_initialized( self ):
+		header = self.files['Wide.h']
+		for name in 'in1', 'in2', 'in3':
+			self.assertIn( 'prev_%s {};' % name, header )
+		self.assertIn( 'bool memo_valid[2] {};', header )
+
+		header = self.files['Arr.h']
+		self.assertIn( 'uint64_t prev_hash_a {};', header )
+		self.assertIn( 'float prev_scale {};', header )
+		self.assertIn( 'bool memo_valid {false};', header )
+
+	def test_branches_compare_their_own_inputs( self ):
+		first, second = self.branches( self.files['Wide.cpp'] )
+
+		self.assertIn( 'if( !memo_valid[0] || in1 != prev_in1 ) {', first )
+		self.assertIn( 'prev_in1 = in1;', first )
+		self.assertIn( 'memo_valid[0] = true;', first )
+		self.assertNotIn( 'in2', first )
+
+		self.assertIn( '!memo_valid[1] || in2 != prev_in2', second )
+		self.assertIn( 'prev_in3 = in3;', second )
+		self.assertNotIn( 'in1', second )
+
+	def test_arrays_compare_by_hash( self ):
+		code = self.files['Arr.cpp']
+		self.assertIn( 'hash_a = hash_buffer(a);', code )
+		self.assertIn( 'hash_a != prev_hash_a', code )
+		self.assertIn( 'prev_hash_a = hash_a;', code )
+
+	@unittest.skipIf( support.compiler is None, "no C++ compiler" )
+	def test_compiles( self ):
+		folder = tempfile.mkdtemp( )
+		try:
+			project = os.path.join( folder, 'project' )
+			support.write_project( self.plugin, project )
+			include = support.write_sdk( project, os.path.join( folder, 'sdk' ) )
+
+			for name in 'Wide.cpp', 'Arr.cpp':
+				code, output = support.compile_source( os.path.join( project, name ), include )
+				self.assertEqual( code, 0, "%s does not compile:\n%s" % (name, output) )
+		finally:
+			shutil.rmtree( folder, ignore_errors=True )
+
+
+if __name__ == '__main__':
+	unittest.main( )
@@ -0,0 +1,63 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_NODE.PY
+
+Node plug model: the cached plug orderings, and their invalidation.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import unittest
+
+import support
+
+from nodesmith.mpxnode import MPxNodeCPP, MPxNodeCPPException, Plug
+
+## ----------------------------------------------------------------------
+class PlugModelTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.node = MPxNodeCPP( 'Node', 'node', '0x00D701' )
+		for name in 'b', 'c', 'a':
+			self.node.add_input_plug( name, 0.0 )
+		for name in 'z', 'y':
+			self.node.add_output_plug( name, 0.0 )
+
+	def names( self, plugs ):
+		return ([ x.name for x in plugs ])
+
+	def test_orderings( self ):
+		self.assertEqual( self.names( self.node.inputs ), [ 'b', 'c', 'a' ] )
+		self.assertEqual( self.names( self.node.outputs ), [ 'z', 'y' ] )
+		self.assertEqual( self.names( self.node.sorted_inputs ), [ 'a', 'b', 'c' ] )
+		self.assertEqual( self.names( self.node.sorted_outputs ), [ 'y', 'z' ] )
+		self.assertEqual( [ x[0] for x in self.node.sorted_attributes ], [ 'a', 'b', 'c', 'y', 'z' ] )
+
+	def test_index_is_cached_until_a_plug_is_added( self ):
+		inputs = self.node.sorted_inputs
+		self.assertIs( self.node.sorted_inputs, inputs )
+
+		self.node.add_input_plug( 'aa', 0.0 )
+		self.assertIsNot( self.node.sorted_inputs, inputs )
+		self.assertEqual( self.names( self.node.sorted_inputs ), [ 'a', 'aa', 'b', 'c' ] )
+		self.assertEqual( self.names( self.node.inputs ), [ 'b', 'c', 'a', 'aa' ] )
+
+	def test_plugs_are_slotted( self ):
+		plug = self.node.attributes['a']
+		self.assertIsInstance( plug, Plug )
+		self.assertEqual( plug.attr_name, 'iA' )
+		with self.assertRaises( AttributeError ):
+			plug.colour = 'red'
+
+	def test_bad_plugs( self ):
+		with self.assertRaises( MPxNodeCPPException ):
+			self.node.add_input_plug( 'v', 0.0, type='vec' )
+		with self.assertRaises( MPxNodeCPPException ):
+			self.node.add_plug( 'w', 0.0, True, affects=[ 'a' ] )
+
+
+if __name__ == '__main__':
+	unittest.main( )
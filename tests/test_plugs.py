@@ -0,0 +1,60 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_PLUGS.PY
+
+Plug types: single and array plugs of every type the validator accepts
+generate code that compiles.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, shutil, tempfile, unittest
+
+import support
+
+## ----------------------------------------------------------------------
+
+nodes = {
+	'Mat': {
+		'node_name': 'mat', 'id': '0x00D201',
+		'code': 'outM = m;\noutMs = ms;',
+		'inputs': { 'm': { 'type': 'matrix', 'default': 0 },
+			'ms': { 'type': 'matrix', 'array': True, 'default': 0 } },
+		'outputs': { 'outM': { 'type': 'matrix', 'default': 0 },
+			'outMs': { 'type': 'matrix', 'array': True, 'default': 0 } },
+	},
+	'Num': {
+		'node_name': 'num', 'id': '0x00D202',
+		'expression': 'out = a * b;\nangles = b + 1',
+		'inputs': { 'a': { 'default': 1.0, 'min': 0.0, 'max': 10.0 },
+			'b': { 'default': 0.0, 'array': True },
+			'turn': { 'default': 0.0, 'type': 'angle' } },
+		'outputs': { 'out': { 'default': 0.0, 'array': True },
+			'angles': { 'default': 0.0, 'type': 'angle', 'array': True } },
+	},
+}
+
+
+## ----------------------------------------------------------------------
+@unittest.skipIf( support.compiler is None, "no C++ compiler" )
+class PlugCompileTest( unittest.TestCase ):
+
+	def test_plug_types_compile( self ):
+		folder = tempfile.mkdtemp( )
+		try:
+			project = os.path.join( folder, 'project' )
+			support.write_project( support.make_plugin( nodes ), project )
+			include = support.write_sdk( project, os.path.join( folder, 'sdk' ) )
+
+			for name in 'Mat.cpp', 'Mat_main.cpp', 'Num.cpp', 'Num_main.cpp', 'plugin_main.cpp':
+				code, output = support.compile_source( os.path.join( project, name ), include )
+				self.assertEqual( code, 0, "%s does not compile:\n%s" % (name, output) )
+		finally:
+			shutil.rmtree( folder, ignore_errors=True )
+
+
+if __name__ == '__main__':
+	unittest.main( )
@@ -0,0 +1,76 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_PROFILE.PY
+
+MProfiler instrumentation: only profiled nodes get it, and it compiles.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, shutil, tempfile, unittest
+
+import support
+
+## ----------------------------------------------------------------------
+
+def node_spec( type_id, profile ):
+	return ({
+		'node_name': 'n%s' % type_id, 'id': type_id, 'profile': profile,
+		'expression': 'out = a * b',
+		'inputs': { 'a': { 'default': 1.0 }, 'b': { 'default': 2.0 } },
+		'outputs': { 'out': { 'default': 0.0 } },
+	})
+
+
+## ----------------------------------------------------------------------
+class ProfileTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.plugin = support.make_plugin( {
+			'Profiled': node_spec( '0x00D001', True ),
+			'Plain':    node_spec( '0x00D002', False ),
+		} )
+		self.files = dict( self.plugin.generate_all( ) )
+
+	def test_profiled_node_is_instrumented( self ):
+		code = self.files['Profiled.cpp']
+		self.assertIn( 'MProfilingScope profile_compute(plugin_profiler_category', code )
+		self.assertIn( 'MProfiler::eventBegin(plugin_profiler_category', code )
+		self.assertEqual( code.count( 'MProfiler::eventBegin' ), code.count( 'MProfiler::eventEnd' ) )
+
+	def test_plain_node_is_not_instrumented( self ):
+		for name in 'Plain.h', 'Plain.cpp', 'Plain_main.cpp':
+			self.assertNotIn( 'MProfil', self.files[name] )
+			self.assertNotIn( 'plugin_profiler_category', self.files[name] )
+
+	def test_category_only_with_profiled_nodes( self ):
+		self.assertIn( 'MProfiler::addCategory', self.files['plugin_main.cpp'] )
+		self.assertIn( 'maya/MProfiler.h', self.files['common.h'] )
+
+		files = dict( support.make_plugin( { 'Plain': node_spec( '0x00D002', False ) } ).generate_all( ) )
+		for name in 'plugin_main.cpp', 'common.h':
+			self.assertNotIn( 'MProfiler', files[name] )
+			self.assertNotIn( 'plugin_profiler_category', files[name] )
+
+	@unittest.skipIf( support.compiler is None, "no C++ compiler" )
+	def test_profiled_output_compiles( self ):
+		folder = tempfile.mkdtemp( )
+		try:
+			project = os.path.join( folder, 'project' )
+			support.write_project( self.plugin, project )
+			include = support.write_sdk( project, os.path.join( folder, 'sdk' ) )
+
+			self.assertTrue( os.path.isfile( os.path.join( include, 'maya', 'MProfiler.h' ) ) )
+
+			for name in 'Profiled.cpp', 'Profiled_main.cpp', 'Plain.cpp', 'plugin_main.cpp':
+				code, output = support.compile_source( os.path.join( project, name ), include )
+				self.assertEqual( code, 0, "%s does not compile:\n%s" % (name, output) )
+		finally:
+			shutil.rmtree( folder, ignore_errors=True )
+
+
+if __name__ == '__main__':
+	unittest.main( )
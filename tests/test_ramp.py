@@ -0,0 +1,104 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_RAMP.PY
+
+Ramp inputs: their default entries, the lookup table resampled only
+after a ramp was dirtied, and ramp nodes compiling against the stub.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, shutil, tempfile, unittest
+
+import support
+
+from nodesmith.plugin import PluginException
+
+## ----------------------------------------------------------------------
+
+nodes = {
+	'Curve': {
+		'node_name': 'curve', 'id': '0x00E201', 'expression': 'out = falloff(turn) * gain(0.5)',
+		'inputs': { 'falloff': { 'type': 'ramp', 'default': [ [ 0, 0 ], [ 1, 1, 'smooth' ] ] },
+			'gain': { 'type': 'ramp', 'default': [ [ 0.5, 2 ] ] },
+			'turn': { 'type': 'angle', 'default': 0.0 } },
+		'outputs': { 'out': { 'default': 0.0 } },
+	},
+	'Spread': {
+		'node_name': 'spread', 'id': '0x00E202', 'memoize': True, 'expression': 'out = falloff(a)',
+		'inputs': { 'falloff': { 'type': 'ramp', 'default': [ [ 0, 1 ], [ 1, 0 ] ] },
+			'a': { 'default': 0.0, 'array': True } },
+		'outputs': { 'out': { 'default': 0.0, 'array': True } },
+	},
+}
+
+def ramp_node( **settings ):
+	node = {
+		'node_name': 'bad', 'id': '0x00E203', 'code': '',
+		'inputs': { 'r': { 'type': 'ramp', 'default': [ [ 0, 0 ] ] } },
+		'outputs': { 'out': { 'default': 0.0 } },
+	}
+	node['inputs']['r'].update( settings )
+	return ({ 'Bad': node })
+
+
+## ----------------------------------------------------------------------
+class RampTest( unittest.TestCase ):
+
+	@classmethod
+	def setUpClass( cls ):
+		cls.plugin = support.make_plugin( nodes )
+		cls.files = dict( cls.plugin.generate_all( ) )
+
+	def test_defaults( self ):
+		code = self.files['Curve.cpp']
+		self.assertIn( 'positions.append( 1.0f ); values.append( 1.0f ); interps.append( MRampAttribute::kSmooth );', code )
+		self.assertIn( 'positions.append( 0.5f ); values.append( 2.0f ); interps.append( MRampAttribute::kLinear );', code )
+		self.assertEqual( code.count( 'ramp.setRamp( values, positions, interps );' ), 2 )
+
+	def test_resampled_when_dirty( self ):
+		code = self.files['Curve.cpp']
+		self.assertIn( 'if( dirtied == iFalloff )\n\t\tfalloff.invalidate();', code )
+		self.assertIn( 'if( falloff.dirty() ) {\n\t\t\tMRampAttribute r_falloff( node, iFalloff );\n'
+			'\t\t\tfalloff.sample( r_falloff );', code )
+
+		self.assertIn( 'RampTable falloff {};', self.files['Curve.h'] )
+		self.assertEqual( self.files['common.h'].count( 'class RampTable' ), 1 )
+
+	def test_lookup( self ):
+		self.assertIn( 'out = falloff(turn) * gain(0.5);', self.files['Curve_main.cpp'] )
+
+		## element-wise loops read the table through a pointer
+		main = self.files['Spread_main.cpp']
+		self.assertIn( 'const RampTable *s_falloff = &falloff;', main )
+		self.assertIn( 'p_out[i] = (*s_falloff)(p_a[i]);', main )
+
+		## memoized nodes compare the table's version
+		self.assertIn( 'falloff.version() != prev_falloff', self.files['Spread.cpp'] )
+
+	def test_errors( self ):
+		for settings in [ { 'default': 0.0 }, { 'default': [ [ 0 ] ] }, { 'default': [ [ 0, 0, 'cubic' ] ] },
+						  { 'array': True } ]:
+			with self.assertRaises( PluginException, msg=str( settings ) ):
+				dict( support.make_plugin( ramp_node( **settings ) ).generate_all( ) )
+
+	@unittest.skipIf( support.compiler is None, "no C++ compiler" )
+	def test_compiles( self ):
+		folder = tempfile.mkdtemp( )
+		try:
+			project = os.path.join( folder, 'project' )
+			support.write_project( self.plugin, project )
+			include = support.write_sdk( project, os.path.join( folder, 'sdk' ) )
+
+			for name in 'Curve.cpp', 'Curve_main.cpp', 'Spread.cpp', 'Spread_main.cpp':
+				code, output = support.compile_source( os.path.join( project, name ), include )
+				self.assertEqual( code, 0, "%s does not compile:\n%s" % (name, output) )
+		finally:
+			shutil.rmtree( folder, ignore_errors=True )
+
+
+if __name__ == '__main__':
+	unittest.main( )
@@ -0,0 +1,135 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_SPEC.PY
+
+Multi-file specs: node files pulled in by 'include', and -only loading
+and generating a few nodes of them.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import json, os, shutil, tempfile, unittest
+
+import support
+
+from nodesmith.spec import SpecException, SpecIndex, index_name, load_spec
+
+## ----------------------------------------------------------------------
+
+def node( index, expression='out = a' ):
+	return ({
+		'node_name': 'node%d' % index, 'id': '0x00DD%02X' % index, 'expression': expression,
+		'inputs': { 'a': { 'default': 0.0 } }, 'outputs': { 'out': { 'default': 0.0 } },
+	})
+
+def write_json( path, data ):
+	if not os.path.isdir( os.path.dirname( path ) ):
+		os.makedirs( os.path.dirname( path ) )
+	with open( path, 'w' ) as fp:
+		json.dump( data, fp )
+
+
+## ----------------------------------------------------------------------
+class IncludeTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.folder = tempfile.mkdtemp( )
+		write_json( os.path.join( self.folder, 'nodes', 'Second.json' ), node( 2 ) )
+		write_json( os.path.join( self.folder, 'nodes', 'Third.json' ), node( 3 ) )
+		write_json( os.path.join( self.folder, 'extra', 'Fourth.json' ), node( 4 ) )
+		self.spec = support.write_spec( self.folder, { 'First': node( 1 ) },
+			include=[ 'nodes/*.json', 'extra/Fourth.json' ] )
+
+	def tearDown( self ):
+		shutil.rmtree( self.folder, ignore_errors=True )
+
+	def test_include( self ):
+		data = load_spec( self.spec )
+
+		self.assertNotIn( 'include', data )
+		self.assertEqual( sorted( data['nodes'] ), [ 'First', 'Fourth', 'Second', 'Third' ] )
+		self.assertEqual( data['nodes']['Third']['node_name'], 'node3' )
+
+	def test_folder_include( self ):
+		support.write_spec( self.folder, { }, include=[ 'nodes' ] )
+		self.assertEqual( sorted( load_spec( self.spec )['nodes'] ), [ 'Second', 'Third' ] )
+
+	def test_only( self ):
+		index = SpecIndex( self.folder )
+		data = load_spec( self.spec, only=[ 'Third' ], index=index )
+
+		self.assertEqual( list( data['nodes'] ), [ 'Third' ] )
+
+		## the other files are indexed but not parsed for their nodes
+		self.assertEqual( sorted( index.entries ), [ 'extra/Fourth.json', 'nodes/Second.json', 'nodes/Third.json' ] )
+
+		with self.assertRaises( SpecException ):
+			load_spec( self.spec, only=[ 'Missing' ] )
+
+	def test_duplicates_across_files( self ):
+		duplicate = node( 2 )
+		duplicate['node_name'] = 'node3'
+		write_json( os.path.join( self.folder, 'extra', 'Fourth.json' ), duplicate )
+
+		with self.assertRaises( SpecException ) as context:
+			load_spec( self.spec, only=[ 'First' ] )
+
+		message = str( context.exception )
+		self.assertIn( 'Fourth (extra/Fourth.json)', message )
+		self.assertIn( 'Second (nodes/Second.json)', message )
+		self.assertIn( 'Third (nodes/Third.json)', message )
+
+	def test_errors( self ):
+		for include in [ 'nodes/*.json', [ 'missing/Node.json' ] ]:
+			support.write_spec( self.folder, { }, include=include )
+			with self.assertRaises( SpecException ):
+				load_spec( self.spec )
+
+		support.write_spec( self.folder, { 'Second': node( 5 ) }, include=[ 'nodes/*.json' ] )
+		with self.assertRaises( SpecException ):
+			load_spec( self.spec )
+
+	def test_index_is_kept_with_the_output( self ):
+		output = os.path.join( self.folder, 'out' )
+		code, text = support.run_cli( self.spec, '-folder', output )
+		self.assertEqual( code, 0, text )
+
+		self.assertFalse( os.path.exists( os.path.join( self.folder, index_name ) ) )
+		self.assertTrue( os.path.isfile( os.path.join( output, index_name ) ) )
+
+		index = SpecIndex( self.folder, output )
+		self.assertEqual( sorted( index.entries ), [ 'extra/Fourth.json', 'nodes/Second.json', 'nodes/Third.json' ] )
+		self.assertEqual( index.entry( 'nodes/Third.json' )['node_name'], 'node3' )
+		self.assertFalse( index.dirty )
+
+		## entries made for another spec folder are not reused
+		self.assertEqual( SpecIndex( os.path.join( self.folder, 'nodes' ), output ).entries, { } )
+
+	def test_cli_only( self ):
+		output = os.path.join( self.folder, 'out' )
+		code, text = support.run_cli( self.spec, '-folder', output )
+		self.assertEqual( code, 0, text )
+		before = support.read_folder( output )
+
+		write_json( os.path.join( self.folder, 'nodes', 'Third.json' ), node( 3, 'out = a * 2' ) )
+		write_json( os.path.join( self.folder, 'nodes', 'Second.json' ), node( 2, 'out = a * 3' ) )
+
+		code, text = support.run_cli( self.spec, '-folder', output, '-only', 'Third' )
+		self.assertEqual( code, 0, text )
+		after = support.read_folder( output )
+
+		self.assertIn( b'a * 2', after['Third_main.cpp'] )
+		for name in 'Second_main.cpp', 'common.h', 'plugin_main.cpp', 'CMakeLists.txt':
+			self.assertTrue( before[name] == after[name], name )
+
+		## the nodes left out are kept in the manifest
+		code, text = support.run_cli( self.spec, '-folder', output, '-only', 'First' )
+		self.assertEqual( code, 0, text )
+		self.assertTrue( support.read_folder( output ) == after )
+
+
+if __name__ == '__main__':
+	unittest.main( )
@@ -0,0 +1,147 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_THREADSAFETY.PY
+
+Scheduling types: the scan of hand-written node code and how it
+settles a node's scheduling.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, shutil, tempfile, unittest
+
+import support
+
+from nodesmith.mpxnode import MPxNodeCPP, MPxNodeCPPException
+from nodesmith.threadsafety import ThreadSafetyException, resolve_scheduling, scan_code
+
+## ----------------------------------------------------------------------
+class ScanTest( unittest.TestCase ):
+
+	def levels( self, code, constants=None ):
+		return ([ x[0] for x in scan_code( code, constants ) ])
+
+	def test_static_variables( self ):
+		self.assertEqual( self.levels( 'static double total = 0;' ), [ 'globally_serial' ] )
+		self.assertEqual( self.levels( 'static std::vector<float> cache;' ), [ 'globally_serial' ] )
+		self.assertEqual( self.levels( 'static const double k = 2.0;' ), [ ] )
+		self.assertEqual( self.levels( 'static constexpr int n = 4;' ), [ ] )
+
+	def test_read_only_statics( self ):
+		self.assertEqual( self.levels( 'const static double k = 2.0;' ), [ ] )
+		self.assertEqual( self.levels( 'constexpr static int n = 4;' ), [ ] )
+		self.assertEqual( self.levels( 'static double const k = 2.0;' ), [ ] )
+		self.assertEqual( self.levels( 'static const char *names[] = { "a" };' ), [ ] )
+
+		## const only in a template argument does not make the variable read-only
+		self.assertEqual( self.levels( 'static std::vector<const char *> names;' ), [ 'globally_serial' ] )
+		self.assertEqual( self.levels( 'static std::map<int, std::vector<const int *>> cache;' ), [ 'globally_serial' ] )
+
+	def test_mglobal( self ):
+		self.assertEqual( self.levels( 'MGlobal::displayInfo("x");\nMGlobal :: executeCommand(c);' ),
+			[ 'untrusted', 'untrusted' ] )
+
+	def test_constants( self ):
+		self.assertEqual( self.levels( 'GAIN += 1;', [ 'GAIN' ] ), [ 'globally_serial' ] )
+		self.assertEqual( self.levels( '++GAIN;', [ 'GAIN' ] ), [ 'globally_serial' ] )
+		self.assertEqual( self.levels( 'x = GAIN == 2 ? GAIN : 0;', [ 'GAIN' ] ), [ ] )
+
+	def test_comments_and_strings_are_ignored( self ):
+		self.assertEqual( self.levels( '// static int x;\n/* MGlobal::foo */ s = "static int y;";' ), [ ] )
+
+	def test_resolve( self ):
+		findings = scan_code( 'static int calls = 0;' )
+
+		self.assertEqual( resolve_scheduling( None, [ ] ), ('parallel', [ ]) )
+		self.assertEqual( resolve_scheduling( None, findings )[0], 'globally_serial' )
+		self.assertEqual( resolve_scheduling( 'untrusted', findings ), ('untrusted', [ ]) )
+
+		## the spec's choice wins, with a warning
+		scheduling, warnings = resolve_scheduling( 'parallel', findings )
+		self.assertEqual( scheduling, 'parallel' )
+		self.assertEqual( len( warnings ), 1 )
+
+		with self.assertRaises( ThreadSafetyException ):
+			resolve_scheduling( 'bogus', [ ] )
+
+	def test_node( self ):
+		node = MPxNodeCPP( 'Node', 'node', '0x00DA01', 'out = a' )
+		node.add_input_plug( 'a', 0.0 )
+		node.add_output_plug( 'out', 0.0 )
+		node.code = 'static int calls = 0;\n++calls;'
+
+		node.check_scheduling( )
+		self.assertEqual( node.scheduling_type, 'globally_serial' )
+		self.assertIn( 'return kGloballySerial;', node.generate_include( ) )
+
+		node.check_scheduling( main_code='void Node::node_main() { out = a; }' )
+		self.assertEqual( node.scheduling_type, 'parallel' )
+
+		## the expression is not scanned, nor compiled
+		node.code = ''
+		node.expression = 'out = missing'
+		self.assertEqual( node.check_scheduling( ), [ ] )
+		self.assertEqual( node.scheduling_type, 'parallel' )
+
+		node.scheduling = 'bogus'
+		with self.assertRaises( MPxNodeCPPException ):
+			node.check_scheduling( )
+
+
+## ----------------------------------------------------------------------
+class GenerateTest( unittest.TestCase ):
+	""" the scan runs in the node workers, and its warnings come back with the files """
+
+	def setUp( self ):
+		self.folder = tempfile.mkdtemp( )
+		self.output = os.path.join( self.folder, 'out' )
+
+		nodes = { }
+		for index in range( 4 ):
+			nodes['Node%d' % index] = {
+				'node_name': 'node%d' % index, 'id': '0x00DA1%d' % index, 'code': 'out = a;',
+				'inputs': { 'a': { 'default': 0.0 } }, 'outputs': { 'out': { 'default': 0.0 } },
+			}
+		nodes['Node1'].update( code='static int calls = 0;\n++calls;', scheduling='parallel' )
+		self.spec = support.write_spec( self.folder, nodes )
+
+	def tearDown( self ):
+		shutil.rmtree( self.folder, ignore_errors=True )
+
+	def run_cli( self, *args ):
+		code, output = support.run_cli( self.spec, '-folder', self.output, *args )
+		self.assertEqual( code, 0, output )
+		return ([ x for x in output.splitlines( ) if 'Node' in x ])
+
+	def test_warnings_do_not_depend_on_jobs( self ):
+		serial = self.run_cli( '-jobs', '1' )
+		shutil.rmtree( self.output )
+		parallel = self.run_cli( '-jobs', '3' )
+
+		self.assertEqual( serial, parallel )
+		warning = [ x for x in serial if x.startswith( '\t! Node Node1:' ) ]
+		self.assertEqual( len( warning ), 1 )
+		self.assertEqual( serial.index( warning[0] ) + 1, serial.index( '\t+ Writing Node: Node1' ) )
+
+	def test_hand_edited_main_file_is_scanned( self ):
+		self.run_cli( '-jobs', '3' )
+		header = os.path.join( self.output, 'Node2.h' )
+		with open( header, 'r' ) as fp:
+			self.assertIn( 'return kParallel;', fp.read( ) )
+
+		main = os.path.join( self.output, 'Node2_main.cpp' )
+		with open( main, 'r' ) as fp:
+			code = fp.read( )
+		with open( main, 'w' ) as fp:
+			fp.write( code.replace( 'out = a;', 'static float last = 0;\nout = last = a;' ) )
+
+		self.run_cli( '-jobs', '3' )
+		with open( header, 'r' ) as fp:
+			self.assertIn( 'return kGloballySerial;', fp.read( ) )
+
+
+if __name__ == '__main__':
+	unittest.main( )
@@ -0,0 +1,128 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_UNITY.PY
+
+Unity builds: node class sources compiled in batches, with common.h
+precompiled.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, re, shutil, sys, tempfile, unittest
+
+import support
+
+## ----------------------------------------------------------------------
+
+def make_nodes( count ):
+	result = { }
+	for index in range( count ):
+		result['Node%02d' % index] = {
+			'node_name': 'node%02d' % index, 'id': '0x00DB%02X' % index,
+			'expression': 'out = a * %d' % index,
+			'inputs': { 'a': { 'default': 1.0 } },
+			'outputs': { 'out': { 'default': 0.0 } },
+		}
+	return (result)
+
+p_include = re.compile( r'#include "(\w+)\.cpp"' )
+
+
+## ----------------------------------------------------------------------
+class UnityTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.plugin = support.make_plugin( make_nodes( 7 ) )
+		self.plugin.unity_batches = 3
+		self.files = dict( self.plugin.generate_all( ) )
+
+	def test_every_node_in_one_batch( self ):
+		included = [ ]
+		for name in self.plugin.unity_batch_names( ):
+			self.assertEqual( self.files[name].count( '#include "common.h"' ), 1 )
+			included += p_include.findall( self.files[name] )
+
+		self.assertEqual( sorted( included ), sorted( self.plugin.nodes ) )
+
+	def test_batches_are_balanced( self ):
+		for count, batches in (7, 3), (12, 5), (3, 4):
+			self.plugin = support.make_plugin( make_nodes( count ) )
+			self.plugin.unity_batches = batches
+			partition = self.plugin.unity_partition( )
+
+			self.assertEqual( len( partition ), batches )
+			self.assertEqual( sum( partition, [ ] ), sorted( self.plugin.nodes ) )
+			sizes = [ len( x ) for x in partition ]
+			self.assertLessEqual( max( sizes ) - min( sizes ), 1, sizes )
+
+	def test_settings_are_checked( self ):
+		from nodesmith.plugin import Plugin, PluginException
+
+		for key, value in ('unity_batches', '4'), ('unity_batches', -1), ('unity_batches', True), \
+				('parallel_threshold', 1.5), ('parallel_threshold', None):
+			data = { 'name': 'tests', 'author': 'tests', 'version': '1.0', 'nodes': make_nodes( 1 ) }
+			data[key] = value
+			with self.assertRaises( PluginException, msg='%s: %r' % (key, value) ):
+				Plugin( ).from_json( data )
+
+		nodes = make_nodes( 1 )
+		nodes['Node00']['parallel_threshold'] = '64'
+		with self.assertRaises( PluginException ):
+			support.make_plugin( nodes )
+
+	def test_cmake_project( self ):
+		cmake = self.files['CMakeLists.txt']
+		sources = re.search( r'set\( SOURCE_FILES ([^)]*)\)', cmake ).group( 1 ).split( )
+
+		self.assertEqual( [ x for x in sources if x.startswith( 'unity_' ) ], [ 'unity_0.cpp', 'unity_1.cpp', 'unity_2.cpp' ] )
+		self.assertNotIn( 'Node00.cpp', sources )
+		self.assertIn( 'Node00_main.cpp', sources )
+		self.assertIn( 'target_precompile_headers( tests PRIVATE common.h )', cmake )
+
+	def test_off( self ):
+		self.plugin.unity_batches = 0
+		files = dict( self.plugin.generate_all( ) )
+
+		self.assertFalse( [ x for x in files if x.startswith( 'unity_' ) ] )
+		self.assertIn( 'Node00.cpp', files['CMakeLists.txt'] )
+		self.assertNotIn( 'target_precompile_headers', files['CMakeLists.txt'] )
+
+	@unittest.skipIf( support.compiler is None, "no C++ compiler" )
+	def test_batches_compile( self ):
+		folder = tempfile.mkdtemp( )
+		try:
+			project = os.path.join( folder, 'project' )
+			support.write_project( self.plugin, project )
+			include = support.write_sdk( project, os.path.join( folder, 'sdk' ) )
+
+			for name in self.plugin.unity_batch_names( ):
+				code, output = support.compile_source( os.path.join( project, name ), include )
+				self.assertEqual( code, 0, "%s does not compile:\n%s" % (name, output) )
+		finally:
+			shutil.rmtree( folder, ignore_errors=True )
+
+	@unittest.skipIf( not sys.platform.startswith( 'linux' ), "Linux only" )
+	@unittest.skipIf( support.cmake is None or support.compiler is None, "no cmake or C++ compiler" )
+	def test_builds_with_precompiled_header( self ):
+		folder = tempfile.mkdtemp( )
+		try:
+			project = os.path.join( folder, 'project' )
+			build = os.path.join( folder, 'build' )
+			sdk = os.path.join( folder, 'sdk' )
+			support.write_project( self.plugin, project )
+			support.write_sdk( project, sdk )
+
+			code, output = support.build_project( project, sdk, build, '-DUSE_CCACHE=OFF' )
+			self.assertEqual( code, 0, output )
+
+			self.assertTrue( os.path.isfile( os.path.join( project, 'tests.so' ) ) )
+			self.assertTrue( os.path.isfile( os.path.join( build, 'CMakeFiles', 'tests.dir', 'cmake_pch.hxx' ) ) )
+		finally:
+			shutil.rmtree( folder, ignore_errors=True )
+
+
+if __name__ == '__main__':
+	unittest.main( )
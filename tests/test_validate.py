@@ -0,0 +1,116 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_VALIDATE.PY
+
+Spec validation: every error is collected with its file and path,
+across included node files too.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import json, os, shutil, tempfile, unittest
+
+import support
+
+from nodesmith.mpxnode import array_types, creatable_types
+from nodesmith.validate import validate_spec
+
+## ----------------------------------------------------------------------
+
+def node_spec( type_id, node_name, **plug ):
+	plug.setdefault( 'default', 0.0 )
+	return ({
+		'node_name': node_name, 'id': type_id,
+		'inputs': { 'a': plug },
+		'outputs': { 'out': { 'default': 0.0 } },
+	})
+
+
+## ----------------------------------------------------------------------
+class ValidateTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.folder = tempfile.mkdtemp( )
+
+	def tearDown( self ):
+		shutil.rmtree( self.folder, ignore_errors=True )
+
+	def write( self, name, data ):
+		path = os.path.join( self.folder, name )
+		if not os.path.isdir( os.path.dirname( path ) ):
+			os.makedirs( os.path.dirname( path ) )
+		with open( path, 'w' ) as fp:
+			json.dump( data, fp )
+		return (path)
+
+	def validate( self, nodes, **root ):
+		data = { 'name': 'tests', 'author': 'tests', 'version': '1.0', 'nodes': nodes }
+		data.update( root )
+		return (validate_spec( self.write( 'plugin.json', data ), compile_expressions=True ))
+
+	def paths( self, errors ):
+		return (set( [ path for _, path, _ in errors ] ))
+
+	def test_valid_spec( self ):
+		self.assertEqual( self.validate( { 'A': node_spec( '0x00D301', 'a' ) } ), [ ] )
+
+	def test_every_error_is_collected( self ):
+		errors = self.validate( {
+			'A': { 'node_name': 'a', 'id': '0x12', 'inputs': { 'x': { } }, 'outputs': { } },
+			'B': { 'node_name': 'b', 'id': '0x00D302', 'scheduling': 'bogus', 'inputs': { } },
+		}, parallel_threshold=-1 )
+
+		self.assertEqual( self.paths( errors ), set( [ 'parallel_threshold', 'nodes.A.id',
+			'nodes.A.inputs.x.default', 'nodes.B.scheduling' ] ) )
+		for where, _, _ in errors:
+			self.assertEqual( where, 'plugin.json' )
+
+	def test_unknown_keys( self ):
+		node = node_spec( '0x00D303', 'a', bogus=1 )
+		node['colour'] = 'red'
+		errors = self.validate( { 'A': node }, frob=1 )
+
+		self.assertEqual( self.paths( errors ), set( [ 'frob', 'nodes.A.colour', 'nodes.A.inputs.a.bogus' ] ) )
+		for _, _, message in errors:
+			self.assertEqual( message, 'unknown setting.' )
+
+	def test_duplicates_across_included_files( self ):
+		self.write( 'nodes/B.json', node_spec( '0x00D304', 'shared' ) )
+		self.write( 'nodes/C.json', node_spec( '0x00d304', 'shared' ) )
+		errors = self.validate( { 'A': node_spec( '0x00D305', 'a' ) }, include=[ 'nodes' ] )
+
+		self.assertEqual( len( errors ), 2 )
+		for where, _, message in errors:
+			self.assertEqual( where, 'nodes/C.json' )
+			self.assertIn( 'nodes/B.json', message )
+		self.assertEqual( self.paths( errors ), set( [ 'id', 'node_name' ] ) )
+
+	def test_node_also_inline( self ):
+		self.write( 'nodes/A.json', node_spec( '0x00D306', 'b' ) )
+		errors = self.validate( { 'A': node_spec( '0x00D307', 'a' ) }, include=[ 'nodes' ] )
+		self.assertEqual( [ x[0] for x in errors ], [ 'nodes/A.json' ] )
+
+	def test_only_generated_plug_types( self ):
+		for index, plug_type in enumerate( creatable_types ):
+			default = [ [ 0, 0 ], [ 1, 1 ] ] if plug_type == 'ramp' else 0.0
+			nodes = { 'A': node_spec( '0x00D3%02d' % (10 + index), 'a', type=plug_type, default=default ) }
+			self.assertEqual( self.validate( nodes ), [ ], plug_type )
+
+		for plug_type in array_types:
+			nodes = { 'A': node_spec( '0x00D320', 'a', type=plug_type, array=True ) }
+			self.assertEqual( self.validate( nodes ), [ ], plug_type )
+
+		for plug_type in 'double', 'short', 'bool', 'double3', 'point', 'vec':
+			errors = self.validate( { 'A': node_spec( '0x00D321', 'a', type=plug_type ) } )
+			self.assertEqual( self.paths( errors ), set( [ 'nodes.A.inputs.a.type' ] ), plug_type )
+
+		errors = self.validate( { 'A': node_spec( '0x00D322', 'a', type='ramp', array=True,
+			default=[ [ 0, 0 ] ] ) } )
+		self.assertEqual( self.paths( errors ), set( [ 'nodes.A.inputs.a' ] ) )
+
+
+if __name__ == '__main__':
+	unittest.main( )
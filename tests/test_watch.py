@@ -0,0 +1,153 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_WATCH.PY
+
+Watch mode: which nodes a change of the spec regenerates, and the
+polling of the spec and its node files.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import argparse, copy, json, os, shutil, tempfile, threading, time, unittest
+
+import support
+
+from nodesmith.plugin import Plugin
+from nodesmith.spec import SpecIndex
+from nodesmith.watch import SpecWatcher, changed_nodes
+
+## ----------------------------------------------------------------------
+
+spec = {
+	'name': 'tests', 'author': 'tests', 'version': '1.0',
+	'nodes': {
+		'Gain': {
+			'node_name': 'gain', 'id': '0x00DF01', 'expression': 'out = a * 2',
+			'inputs': { 'a': { 'default': 0.0 } }, 'outputs': { 'out': { 'default': 0.0 } },
+		},
+		'Offset': {
+			'node_name': 'offset', 'id': '0x00DF02', 'expression': 'out = a + 1',
+			'inputs': { 'a': { 'default': 0.0 } }, 'outputs': { 'out': { 'default': 0.0 } },
+		},
+	},
+}
+
+def load( data, previous=None ):
+	plugin = Plugin( )
+	plugin.from_json( copy.deepcopy( data ), previous=previous )
+	return (plugin)
+
+
+## ----------------------------------------------------------------------
+class ChangedNodesTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.previous = load( spec )
+		self.data = copy.deepcopy( spec )
+
+	def test_first_run( self ):
+		self.assertIsNone( changed_nodes( None, self.previous ) )
+
+	def test_unchanged( self ):
+		plugin = load( self.data, self.previous )
+
+		self.assertEqual( changed_nodes( self.previous, plugin ), [ ] )
+		## unchanged nodes are carried over rather than built again
+		self.assertIs( plugin.nodes['Gain'], self.previous.nodes['Gain'] )
+
+	def test_changed_node( self ):
+		self.data['nodes']['Offset']['expression'] = 'out = a + 2'
+		plugin = load( self.data, self.previous )
+
+		self.assertEqual( changed_nodes( self.previous, plugin ), [ 'Offset' ] )
+		self.assertIs( plugin.nodes['Gain'], self.previous.nodes['Gain'] )
+		self.assertIsNot( plugin.nodes['Offset'], self.previous.nodes['Offset'] )
+
+	def test_added_node( self ):
+		self.data['nodes']['Scale'] = dict( spec['nodes']['Gain'], node_name='scale', id='0x00DF03' )
+		self.assertEqual( changed_nodes( self.previous, load( self.data, self.previous ) ), [ 'Scale' ] )
+
+	def test_everything( self ):
+		del self.data['nodes']['Offset']
+		self.assertIsNone( changed_nodes( self.previous, load( self.data, self.previous ) ) )
+
+		self.data = copy.deepcopy( spec )
+		self.data['version'] = '1.1'
+		plugin = load( self.data, self.previous )
+		self.assertIsNone( changed_nodes( self.previous, plugin ) )
+		self.assertIsNot( plugin.nodes['Gain'], self.previous.nodes['Gain'] )
+
+	def test_regenerating_changed_nodes( self ):
+		""" writing only the changed nodes leaves the same output as a full run """
+		folder = tempfile.mkdtemp( )
+		try:
+			path = support.write_spec( folder, spec['nodes'] )
+			partial = os.path.join( folder, 'partial' )
+			full = os.path.join( folder, 'full' )
+			self.assertEqual( support.run_cli( path, '-folder', partial )[0], 0 )
+
+			self.data['nodes']['Offset']['expression'] = 'out = a + 2'
+			plugin = load( self.data, self.previous )
+
+			from nodesmith.cli import Session, run_project
+			args = argparse.Namespace( folder=partial, force=False, debug=False, cmake=True, harness=False )
+			with Session( 1 ) as session:
+				failed, summary = run_project( args, plugin, session, nodes=changed_nodes( self.previous, plugin ),
+											   log=lambda x: None )
+
+			self.assertEqual( failed, [ ] )
+			self.assertEqual( summary['nodes_changed'], [ 'Offset' ] )
+
+			support.write_spec( folder, self.data['nodes'] )
+			self.assertEqual( support.run_cli( path, '-folder', full )[0], 0 )
+			self.assertTrue( support.read_folder( partial ) == support.read_folder( full ) )
+		finally:
+			shutil.rmtree( folder, ignore_errors=True )
+
+
+## ----------------------------------------------------------------------
+class SpecWatcherTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.folder = tempfile.mkdtemp( )
+		self.node_file = os.path.join( self.folder, 'nodes', 'Gain.json' )
+		os.makedirs( os.path.dirname( self.node_file ) )
+		self.write( self.node_file, spec['nodes']['Gain'] )
+		self.spec = support.write_spec( self.folder, { }, include=[ 'nodes/*.json' ] )
+
+		self.watcher = SpecWatcher( self.spec, SpecIndex( self.folder ), interval=0.01 )
+
+	def tearDown( self ):
+		shutil.rmtree( self.folder, ignore_errors=True )
+
+	def write( self, path, data ):
+		with open( path, 'w' ) as fp:
+			json.dump( data, fp )
+
+	def wait_for( self, change ):
+		""" runs a change while the watcher waits for it """
+		thread = threading.Thread( target=lambda: (time.sleep( 0.05 ), change( )) )
+		thread.start( )
+		start = time.time( )
+		self.watcher.wait( )
+		thread.join( )
+		return (time.time( ) - start)
+
+	def test_files( self ):
+		self.assertEqual( self.watcher.files( ), [ os.path.abspath( self.spec ), self.node_file ] )
+
+	def test_node_file_changed( self ):
+		changed = dict( spec['nodes']['Gain'], expression='out = a * 3.5' )
+		self.assertLess( self.wait_for( lambda: self.write( self.node_file, changed ) ), 5.0 )
+
+	def test_node_file_added( self ):
+		added = os.path.join( self.folder, 'nodes', 'Offset.json' )
+		self.wait_for( lambda: self.write( added, spec['nodes']['Offset'] ) )
+		self.assertIn( added, self.watcher.files( ) )
+
+
+if __name__ == '__main__':
+	unittest.main( )
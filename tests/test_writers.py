@@ -0,0 +1,179 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+TESTS/TEST_WRITERS.PY
+
+Output writers: the atomic directory writer leaving the previous output
+as it was when aborted, and the archive and memory backends.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, shutil, tarfile, tempfile, unittest, zipfile
+
+import support
+
+from nodesmith.writers import ArchiveWriter, AtomicDirectoryWriter, MemoryWriter, WriterException
+
+## ----------------------------------------------------------------------
+
+files = [ ('common.h', '// common\n'), ('harness/bench.cpp', '// bench\n') ]
+
+nodes = {
+	'Gain': {
+		'node_name': 'gain', 'id': '0x00DE01', 'expression': 'out = a * 2',
+		'inputs': { 'a': { 'default': 0.0 } }, 'outputs': { 'out': { 'default': 0.0 } },
+	},
+}
+
+
+## ----------------------------------------------------------------------
+class AtomicDirectoryTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.parent = tempfile.mkdtemp( )
+		self.folder = os.path.join( self.parent, 'out' )
+
+	def tearDown( self ):
+		shutil.rmtree( self.parent, ignore_errors=True )
+
+	def leftovers( self ):
+		return ([ x for x in os.listdir( self.parent ) if x != 'out' ])
+
+	def test_new_folder( self ):
+		with AtomicDirectoryWriter( self.folder ) as writer:
+			writer.write_all( files )
+			self.assertFalse( os.path.exists( self.folder ) )
+
+		self.assertEqual( support.read_folder( self.folder ),
+			{ 'common.h': b'// common\n', 'harness/bench.cpp': b'// bench\n' } )
+		self.assertEqual( self.leftovers( ), [ ] )
+
+	def test_existing_folder_keeps_other_files( self ):
+		os.makedirs( os.path.join( self.folder, 'build' ) )
+		with open( os.path.join( self.folder, 'build', 'notes.txt' ), 'w' ) as fp:
+			fp.write( 'mine' )
+
+		with AtomicDirectoryWriter( self.folder ) as writer:
+			writer.write_all( files )
+
+		self.assertEqual( sorted( support.read_folder( self.folder ) ),
+			[ 'build/notes.txt', 'common.h', 'harness/bench.cpp' ] )
+		self.assertEqual( self.leftovers( ), [ ] )
+
+	def test_abort( self ):
+		with AtomicDirectoryWriter( self.folder ) as writer:
+			writer.write_all( files )
+		before = support.read_folder( self.folder )
+
+		writer = AtomicDirectoryWriter( self.folder )
+		writer.write( 'common.h', '// changed\n' )
+		writer.write( 'extra.h', '// extra\n' )
+		writer.abort( )
+
+		self.assertEqual( support.read_folder( self.folder ), before )
+		self.assertEqual( self.leftovers( ), [ ] )
+
+		with self.assertRaises( WriterException ):
+			writer.write( 'late.h', '' )
+
+	def test_remove( self ):
+		with AtomicDirectoryWriter( self.folder ) as writer:
+			writer.write_all( files )
+
+		writer = AtomicDirectoryWriter( self.folder )
+		writer.write( 'common.h', '// changed\n' )
+		writer.remove( 'harness/bench.cpp' )
+		self.assertTrue( os.path.isfile( os.path.join( self.folder, 'harness', 'bench.cpp' ) ) )
+		writer.close( )
+
+		## the emptied folder goes too
+		self.assertEqual( os.listdir( self.folder ), [ 'common.h' ] )
+
+		writer = AtomicDirectoryWriter( self.folder )
+		writer.remove( 'common.h' )
+		writer.abort( )
+		self.assertEqual( os.listdir( self.folder ), [ 'common.h' ] )
+
+	def test_exception_aborts( self ):
+		with self.assertRaises( ValueError ):
+			with AtomicDirectoryWriter( self.folder ) as writer:
+				writer.write_all( files )
+				raise ValueError( 'generation failed' )
+
+		self.assertFalse( os.path.exists( self.folder ) )
+		self.assertEqual( self.leftovers( ), [ ] )
+
+	def test_failed_node_writes_nothing( self ):
+		spec = support.write_spec( self.parent, nodes )
+		code, text = support.run_cli( spec, '-folder', self.folder )
+		self.assertEqual( code, 0, text )
+		before = support.read_folder( self.folder )
+
+		broken = dict( nodes['Gain'], expression='out = missing * 2' )
+		support.write_spec( self.parent, dict( nodes, Broken=dict( broken, node_name='broken', id='0x00DE02' ) ) )
+		code, text = support.run_cli( spec, '-folder', self.folder )
+
+		self.assertEqual( code, 1 )
+		self.assertIn( 'nothing was written', text )
+		self.assertTrue( support.read_folder( self.folder ) == before )
+		self.assertEqual( sorted( self.leftovers( ) ), [ 'plugin.json' ] )
+
+
+## ----------------------------------------------------------------------
+class ArchiveTest( unittest.TestCase ):
+
+	def setUp( self ):
+		self.folder = tempfile.mkdtemp( )
+
+	def tearDown( self ):
+		shutil.rmtree( self.folder, ignore_errors=True )
+
+	def test_zip( self ):
+		path = os.path.join( self.folder, 'out.zip' )
+		with ArchiveWriter( path, prefix='plugin' ) as writer:
+			writer.write_all( files )
+
+		with zipfile.ZipFile( path ) as archive:
+			self.assertEqual( archive.namelist( ), [ 'plugin/common.h', 'plugin/harness/bench.cpp' ] )
+			self.assertEqual( archive.read( 'plugin/common.h' ), b'// common\n' )
+		self.assertEqual( os.listdir( self.folder ), [ 'out.zip' ] )
+
+	def test_tar( self ):
+		path = os.path.join( self.folder, 'out.tar.gz' )
+		with ArchiveWriter( path ) as writer:
+			writer.write_all( files )
+
+		with tarfile.open( path ) as archive:
+			self.assertEqual( archive.getnames( ), [ 'common.h', 'harness/bench.cpp' ] )
+			self.assertEqual( archive.extractfile( 'harness/bench.cpp' ).read( ), b'// bench\n' )
+
+	def test_abort( self ):
+		writer = ArchiveWriter( os.path.join( self.folder, 'out.tar' ) )
+		writer.write_all( files )
+		writer.abort( )
+
+		self.assertEqual( os.listdir( self.folder ), [ ] )
+
+	def test_unknown_format( self ):
+		with self.assertRaises( WriterException ):
+			ArchiveWriter( os.path.join( self.folder, 'out.rar' ) )
+
+
+## ----------------------------------------------------------------------
+class MemoryTest( unittest.TestCase ):
+
+	def test_memory( self ):
+		writer = MemoryWriter( )
+		self.assertEqual( writer.write_all( files ), 2 )
+		self.assertEqual( list( writer.files ), [ 'common.h', 'harness/bench.cpp' ] )
+		self.assertEqual( writer.read( 'common.h' ), '// common\n' )
+
+		writer.abort( )
+		self.assertIsNone( writer.read( 'common.h' ) )
+
+
+if __name__ == '__main__':
+	unittest.main( )
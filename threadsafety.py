@@ -0,0 +1,131 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+THREADSAFETY.PY
+
+Picks the Evaluation Manager scheduling type of a node. Node code is
+scanned for the obvious ways to break under parallel evaluation: static
+variables shared by every instance, calls into MGlobal, and writes to
+the plugin's #define constants. Nodes are only ever moved to a safer
+scheduling type, never a less safe one.
+
+This is a pattern scan, not a parser; it catches the common mistakes
+and leaves the rest to the author.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import re
+
+## ----------------------------------------------------------------------
+
+## spec name -> MPxNode::SchedulingType, from least to most restrictive
+scheduling_types = [
+	( 'parallel',        'kParallel' ),
+	( 'serial',          'kSerial' ),
+	( 'globally_serial', 'kGloballySerial' ),
+	( 'untrusted',       'kUntrusted' ),
+]
+scheduling_names  = [ x[0] for x in scheduling_types ]
+scheduling_values = dict( scheduling_types )
+
+default_scheduling = 'parallel'
+
+p_comment = re.compile( r'//[^\n]*|/\*.*?\*/', re.S )
+p_string  = re.compile( r'"(?:\\.|[^"\\\n])*"' )
+
+## static variables (not functions), with the qualifiers around 'static'
+## to tell read-only data, e.g. 'const static' or 'static double const'
+p_static = re.compile( r'(?:\b(const|constexpr)\s+)?\bstatic\s+([\w:<>,\s\*&]*?)\b(\w+)\s*(?:=|;|\[|\{)' )
+p_template_args = re.compile( r'<[^<>]*>' )
+p_mglobal = re.compile( r'\bMGlobal\s*::\s*(\w+)' )
+
+
+## ----------------------------------------------------------------------
+class ThreadSafetyException( Exception ):
+	pass
+
+
+## ----------------------------------------------------------------------
+def strip_code( code ):
+	"""
+	Blanks out comments and string literals so they cannot match.
+	"""
+	code = p_comment.sub( ' ', code )
+	return (p_string.sub( '""', code ))
+
+def read_only( match ):
+	"""
+	True if a p_static match declares a constant. Only the declaration's
+	own qualifiers count, not those in template arguments.
+	"""
+	qualifiers = match.group( 2 )
+	while True:
+		stripped = p_template_args.sub( ' ', qualifiers )
+		if stripped == qualifiers:
+			break
+		qualifiers = stripped
+
+	words = set( re.findall( r'\w+', qualifiers ) )
+	return (match.group( 1 ) is not None or 'const' in words or 'constexpr' in words)
+
+def scan_code( code, constants=None ):
+	"""
+	Scans C++ for thread-unsafe patterns.
+	:param code: Hand-written code of the node, or a whole _main.cpp.
+	:param constants: Names of the plugin's #define constants.
+	:return: list of (scheduling name required, message) pairs.
+	"""
+	result = [ ]
+	if not code:
+		return (result)
+
+	code = strip_code( code )
+
+	for match in p_static.finditer( code ):
+		if not read_only( match ):
+			result.append( ('globally_serial', "static variable '%s' is shared by every instance" % match.group( 3 )) )
+
+	for name in sorted( set( p_mglobal.findall( code ) ) ):
+		result.append( ('untrusted', "calls MGlobal::%s" % name) )
+
+	for name in sorted( constants or () ):
+		pattern = r'(?:\b{0}\s*(?:[-+*/%&|^]?=(?!=)|\+\+|--)|(?:\+\+|--)\s*{0}\b)'.format( re.escape( name ) )
+		if re.search( pattern, code ):
+			result.append( ('globally_serial', "writes to the global constant %s" % name) )
+
+	return (result)
+
+def strictest( names ):
+	"""
+	:return: the most restrictive of a list of scheduling names.
+	"""
+	return (max( [ default_scheduling ] + list( names ), key=scheduling_names.index ))
+
+def resolve_scheduling( requested, findings ):
+	"""
+	Chooses a node's scheduling type from what its spec asked for and what
+	the scan found.
+	:param requested: Scheduling name from the spec, or None.
+	:param findings: Result of scan_code().
+	:return: (scheduling name, list of warning messages).
+	"""
+	if requested is not None and requested not in scheduling_values:
+		raise ThreadSafetyException( "unknown scheduling '%s' (expected one of %s)" % \
+			(requested, ', '.join( scheduling_names )) )
+
+	required = strictest( [ x[0] for x in findings ] )
+	warnings = [ ]
+
+	if requested is None:
+		if required != default_scheduling:
+			warnings = [ "%s; using '%s' scheduling" % (message, required) for _, message in findings ]
+		return (required, warnings)
+
+	for level, message in findings:
+		if scheduling_names.index( level ) > scheduling_names.index( requested ):
+			warnings.append( "%s but scheduling is '%s' (needs at least '%s')" % (message, requested, level) )
+
+	return (requested, warnings)
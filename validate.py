@@ -0,0 +1,334 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+VALIDATE.PY
+
+Checks a plugin spec without generating anything. Unlike
+Plugin.from_json(), which stops at the first problem, the validator
+walks the whole spec once, included node files too, and reports every
+error with the file and JSON path it was found at. The spec is only
+read, never changed.
+
+Type IDs and node names are checked for duplicates across all nodes
+through a dictionary of the ones seen so far, so the check stays linear
+in the number of nodes.
+
+	python main.py rigging.json -validate [-expressions]
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os
+
+from .buildprofiles import BuildProfileException, resolve_profiles
+from .deformer import reserved_names
+from .mpxnode import MPxNodeCPPException, StringTypes, array_types, creatable_types, ramp_entries, types_mapping_table
+from .plugin import node_kinds
+from .spec import SpecException, find_includes, p_typeID, read_json, type_id_key
+from .threadsafety import scheduling_names, scheduling_values
+
+## ----------------------------------------------------------------------
+
+root_required = [ 'name', 'author', 'version' ]
+
+root_keys = set( root_required + [ 'win_lib_path', 'win_include_path', 'mac_lib_path',
+	'mac_include_path', 'lin_lib_path', 'lin_include_path', 'install_destination',
+	'parallel_threshold', 'profile', 'unity_batches', 'constants', 'build', 'nodes', 'include' ] )
+
+node_keys = set( [ 'node_name', 'id', 'expression', 'code', 'parallel_threshold', 'profile',
+	'memoize', 'scheduling', 'inputs', 'outputs', 'kind' ] )
+
+## settings add_input_plug() and add_output_plug() take besides the default
+input_keys = set( [ 'default', 'type', 'min', 'max', 'array', 'keyable', 'storable',
+	'cached', 'hidden', 'short_name' ] )
+output_keys = input_keys.union( [ 'affects' ] )
+
+
+## ----------------------------------------------------------------------
+class SpecValidator( object ):
+	"""
+	Collects every error of a spec as (file, path, message) tuples.
+	"""
+
+	def __init__( self, compile_expressions=False ):
+		"""
+		:param compile_expressions: If True, node expressions are compiled
+			too, catching type errors and unknown names. Off by default:
+			compiling costs several times more than the other checks.
+		"""
+		self.compile_expressions = compile_expressions
+		self.errors     = [ ]
+		self.type_ids   = { }   ## normalized type ID -> where it was first seen
+		self.node_names = { }
+		self.constants  = { }
+
+	def error( self, where, path, message ):
+		self.errors.append( (where, path, message) )
+
+	def validate_file( self, filename ):
+		"""
+		Validates a root spec and every node file it includes.
+		:return: list of errors; empty if the spec is fine.
+		"""
+		where = os.path.basename( filename )
+
+		try:
+			data = read_json( filename )
+		except SpecException as e:
+			self.error( where, '', str( e ) )
+			return (self.errors)
+
+		self.validate_root( data, where )
+
+		if isinstance( data, dict ) and 'include' in data:
+			root = os.path.dirname( os.path.abspath( filename ) )
+			inline = data.get( 'nodes', { } ) if isinstance( data.get( 'nodes', None ), dict ) else { }
+
+			try:
+				includes = find_includes( root, data['include'] )
+			except SpecException as e:
+				self.error( where, 'include', str( e ) )
+				includes = [ ]
+
+			for class_name, relative in includes:
+				if class_name in inline:
+					self.error( relative, '', "node %s is also in %s." % (class_name, where) )
+					continue
+				try:
+					node_data = read_json( os.path.join( root, relative ) )
+				except SpecException as e:
+					self.error( relative, '', str( e ) )
+					continue
+				self.validate_node( class_name, node_data, relative, '' )
+
+		return (self.errors)
+
+	def validate_root( self, data, where ):
+		"""
+		Validates a plugin object, including its inline nodes.
+		:return: list of errors; empty if the spec is fine.
+		"""
+		if not isinstance( data, dict ):
+			self.error( where, '', "expected a plugin object." )
+			return (self.errors)
+
+		for key in root_required:
+			if key not in data:
+				self.error( where, key, "missing." )
+
+		for key in sorted( set( data ).difference( root_keys ) ):
+			self.error( where, key, "unknown setting." )
+
+		self.check_int( data, 'parallel_threshold', where, '' )
+		self.check_int( data, 'unity_batches', where, '' )
+
+		constants = data.get( 'constants', { } )
+		if isinstance( constants, dict ):
+			self.constants = constants
+		else:
+			self.error( where, 'constants', "expected a dictionary." )
+
+		if 'build' in data:
+			if not isinstance( data['build'], dict ):
+				self.error( where, 'build', "expected a dictionary." )
+			else:
+				try:
+					resolve_profiles( data['build'] )
+				except BuildProfileException as e:
+					self.error( where, 'build', str( e ) )
+
+		nodes = data.get( 'nodes', { } )
+		if not isinstance( nodes, dict ):
+			self.error( where, 'nodes', "expected a dictionary." )
+		else:
+			for class_name, node_data in nodes.items( ):
+				self.validate_node( class_name, node_data, where, 'nodes.%s.' % class_name )
+
+		return (self.errors)
+
+	def check_int( self, data, key, where, path ):
+		value = data.get( key, None )
+		if value is not None and (isinstance( value, bool ) or not isinstance( value, int ) or value < 0):
+			self.error( where, path + key, "expected a non-negative integer (found %r)." % (value,) )
+
+	def check_unique( self, index, key, label, where, path ):
+		"""
+		Records a type ID or node name, reporting it if already in use.
+		"""
+		location = '%s: %s' % (where, path.rstrip( '.' ) or where)
+		if key in index:
+			self.error( where, path, "%s is already used by %s." % (label, index[key]) )
+		else:
+			index[key] = location
+
+	def validate_node( self, class_name, data, where, path ):
+		if not isinstance( data, dict ):
+			self.error( where, path.rstrip( '.' ), "expected a node object." )
+			return
+
+		for key in sorted( set( data ).difference( node_keys ) ):
+			self.error( where, path + key, "unknown setting." )
+
+		node_name = data.get( 'node_name', None )
+		if node_name is None:
+			self.error( where, path + 'node_name', "missing." )
+		elif not isinstance( node_name, StringTypes ):
+			self.error( where, path + 'node_name', "expected a string." )
+		else:
+			self.check_unique( self.node_names, node_name, "node name '%s'" % node_name, where, path + 'node_name' )
+
+		typeID = data.get( 'id', None )
+		if typeID is None:
+			self.error( where, path + 'id', "missing." )
+		elif not isinstance( typeID, StringTypes ) or not p_typeID.match( typeID ):
+			self.error( where, path + 'id', "should be in format 0x123456 (found %s)." % (typeID,) )
+		else:
+			self.check_unique( self.type_ids, type_id_key( typeID ), "type ID %s" % typeID, where, path + 'id' )
+
+		scheduling = data.get( 'scheduling', None )
+		if scheduling is not None and scheduling not in scheduling_values:
+			self.error( where, path + 'scheduling', "unknown scheduling '%s' (expected one of %s)." % \
+				(scheduling, ', '.join( scheduling_names )) )
+
+		kind = data.get( 'kind', 'node' )
+		if kind not in node_kinds:
+			self.error( where, path + 'kind', "unknown kind '%s' (expected one of %s)." % \
+				(kind, ', '.join( node_kinds.keys( ) )) )
+			kind = 'node'
+
+		if kind != 'node' and data.get( 'memoize', False ):
+			self.error( where, path + 'memoize', "only supported by kind 'node'." )
+
+		for key in 'expression', 'code':
+			if not isinstance( data.get( key, '' ), StringTypes ):
+				self.error( where, path + key, "expected a string." )
+
+		self.check_int( data, 'parallel_threshold', where, path )
+
+		inputs = data.get( 'inputs', None )
+		outputs = data.get( 'outputs', { } )
+		plugs_ok = True
+
+		if not isinstance( inputs, dict ):
+			self.error( where, path + 'inputs', "missing or not a dictionary." )
+			inputs, plugs_ok = { }, False
+		if not isinstance( outputs, dict ):
+			self.error( where, path + 'outputs', "not a dictionary." )
+			outputs, plugs_ok = { }, False
+
+		for name, plug in inputs.items( ):
+			plugs_ok &= self.validate_plug( name, plug, True, where, path + 'inputs.' )
+
+		for name, plug in outputs.items( ):
+			plugs_ok &= self.validate_plug( name, plug, False, where, path + 'outputs.' )
+
+			affects = plug.get( 'affects', None ) if isinstance( plug, dict ) else None
+			if affects is not None:
+				if not isinstance( affects, list ):
+					self.error( where, path + 'outputs.%s.affects' % name, "expected a list of input names." )
+					plugs_ok = False
+				else:
+					unknown = [ x for x in affects if x not in inputs ]
+					if unknown:
+						self.error( where, path + 'outputs.%s.affects' % name,
+									"unknown input(s) %s." % ', '.join( [ str( x ) for x in unknown ] ) )
+						plugs_ok = False
+
+		for name in sorted( set( inputs ).intersection( outputs ) ):
+			self.error( where, path + 'outputs.%s' % name, "plug name is also used by an input." )
+			plugs_ok = False
+
+		if kind == 'deformer':
+			for name in sorted( outputs ):
+				self.error( where, path + 'outputs.%s' % name, "a deformer has no outputs besides its deformed geometry." )
+				plugs_ok = False
+			for name in sorted( set( inputs ).intersection( reserved_names ) ):
+				self.error( where, path + 'inputs.%s' % name, "name is reserved in deformers." )
+				plugs_ok = False
+
+		if self.compile_expressions and plugs_ok and data.get( 'expression', None ) \
+				and isinstance( data['expression'], StringTypes ):
+			self.validate_expression( class_name, data, inputs, outputs, where, path, kind )
+
+	def validate_plug( self, name, data, is_input, where, path ):
+		"""
+		:return: True if the plug can be built.
+		"""
+		path = path + name
+		keys = input_keys if is_input else output_keys
+
+		if not isinstance( data, dict ):
+			self.error( where, path, "expected a plug object." )
+			return (False)
+
+		result = True
+
+		if data.get( 'default', None ) is None:
+			self.error( where, path + '.default', "missing." )
+			result = False
+
+		plug_type = data.get( 'type', 'float' )
+		if plug_type not in types_mapping_table:
+			self.error( where, path + '.type', "invalid plug type %s." % (plug_type,) )
+			result = False
+		elif plug_type not in creatable_types:
+			self.error( where, path + '.type', "plugs of %s type are not yet implemented (expected one of %s)." % \
+				(plug_type, ', '.join( creatable_types )) )
+			result = False
+		elif data.get( 'array', False ) and plug_type not in array_types and plug_type != 'ramp':
+			self.error( where, path + '.array', "%s plugs cannot be arrays (expected one of %s)." % \
+				(plug_type, ', '.join( array_types )) )
+			result = False
+
+		if plug_type == 'ramp':
+			if not is_input or data.get( 'array', False ):
+				self.error( where, path, "a ramp can only be a single input." )
+				result = False
+			elif data.get( 'default', None ) is not None:
+				try:
+					ramp_entries( data['default'] )
+				except MPxNodeCPPException as e:
+					self.error( where, path + '.default', str( e ) )
+					result = False
+
+		for key in sorted( set( data ).difference( keys ) ):
+			self.error( where, path + '.' + key, "unknown setting." )
+			result = False
+
+		return (result)
+
+	def validate_expression( self, class_name, data, inputs, outputs, where, path, kind='node' ):
+		## builds a throwaway node from copies, so the spec stays untouched
+		node = node_kinds[kind]( class_name, data.get( 'node_name', '' ), '0x000000', data['expression'] )
+		node.constants = self.constants
+
+		for name, plug in inputs.items( ):
+			node.add_input_plug( name, **plug )
+		for name, plug in outputs.items( ):
+			node.add_output_plug( name, **plug )
+
+		try:
+			node.generate_expression( )
+		except MPxNodeCPPException as e:
+			message = str( e )
+			prefix = "Node %s: " % class_name
+			if message.startswith( prefix ):
+				message = message[len( prefix ):]
+			self.error( where, path + 'expression', message )
+
+
+## ----------------------------------------------------------------------
+def format_errors( errors ):
+	"""
+	:return: one line per error, as 'file: path: message'.
+	"""
+	return ([ '%s: %s: %s' % (where, path, message) if path else '%s: %s' % (where, message) \
+			for where, path, message in errors ])
+
+def validate_spec( filename, compile_expressions=False ):
+	"""
+	:return: list of (file, JSON path, message) errors of a spec file.
+	"""
+	return (SpecValidator( compile_expressions ).validate_file( filename ))
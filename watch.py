@@ -0,0 +1,110 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+WATCH.PY
+
+Support for main.py -watch, which keeps one process running and
+regenerates a plugin whenever its spec changes. The spec and every node
+file it includes are polled for changes, standard library only. On a
+change, only the files that changed are parsed again, the new plugin
+reuses the nodes of the previous one whose spec is unchanged, and only
+the nodes that differ are regenerated.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import os, time
+
+from .spec import SpecException, find_includes
+
+## ----------------------------------------------------------------------
+
+default_interval = 0.2   ## seconds between polls
+
+
+## ----------------------------------------------------------------------
+class SpecWatcher( object ):
+	"""
+	Polls a root spec and its included node files for changes.
+	"""
+
+	def __init__( self, filename, index, interval=default_interval ):
+		"""
+		:param filename: Path of the root spec.
+		:param index: spec.SpecIndex of the root spec, shared with
+			load_spec() so the root spec is parsed once per change.
+		:param interval: Seconds between polls.
+		"""
+		self.filename = os.path.abspath( filename )
+		self.index    = index
+		self.interval = interval
+		self.last     = self.stamps( )
+
+	def files( self ):
+		"""
+		:return: paths of the root spec and of every file it includes now.
+		"""
+		result = [ self.filename ]
+
+		try:
+			data = self.index.read( self.filename )
+			patterns = data.get( 'include', [ ] ) if isinstance( data, dict ) else [ ]
+			result += [ os.path.join( self.index.root, x[1] ) for x in find_includes( self.index.root, patterns ) ]
+		except SpecException:
+			## a broken root spec is still watched, to pick up the fix
+			pass
+
+		return (result)
+
+	def stamps( self ):
+		result = { }
+		for path in self.files( ):
+			try:
+				stat = os.stat( path )
+				result[path] = (stat.st_mtime, stat.st_size)
+			except OSError:
+				result[path] = None
+		return (result)
+
+	def wait( self ):
+		"""
+		Blocks until a watched file is changed, added or removed, and for
+		one more poll until the files are stable again, since editors often
+		save in several steps.
+		"""
+		while True:
+			time.sleep( self.interval )
+			current = self.stamps( )
+			if current == self.last:
+				continue
+
+			while True:
+				time.sleep( self.interval )
+				settled = self.stamps( )
+				if settled == current:
+					break
+				current = settled
+
+			self.last = current
+			return
+
+
+## ----------------------------------------------------------------------
+def changed_nodes( previous, plugin ):
+	"""
+	Compares two loads of a spec.
+	:param previous: Plugin from the last successful run, or None.
+	:param plugin: Plugin just loaded.
+	:return: list of the class names of the nodes to regenerate, or None if
+		everything has to be, i.e. on the first run, after the plugin
+		settings changed or after nodes were removed.
+	"""
+	if previous is None or previous.settings_hash != plugin.settings_hash:
+		return (None)
+
+	if set( previous.nodes ).difference( plugin.nodes ):
+		return (None)
+
+	return ([ x for x in plugin.nodes if previous.spec_hashes.get( x, None ) != plugin.spec_hashes[x] ])
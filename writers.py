@@ -0,0 +1,345 @@
+## ----------------------------------------------------------------------
+"""
+NODESMITH
+
+WRITERS.PY
+
+Output backends for generated projects. A writer takes (relative path,
+contents) pairs, e.g. from Plugin.generate_all(), and is closed once the
+project is complete, or aborted if generation failed:
+
+	with AtomicDirectoryWriter( 'build/rigging' ) as writer:
+		writer.write_all( plugin.generate_all() )
+
+DirectoryWriter writes straight into a folder. AtomicDirectoryWriter
+stages everything in a temporary folder next to the target and only
+moves it into place on close(), so a run that fails before then leaves
+the previous output as it was. ArchiveWriter streams a tar or zip archive and
+MemoryWriter keeps the files in a dictionary, for tests and tools.
+
+Created: 18 October 2026
+"""
+## ----------------------------------------------------------------------
+
+import io, os, shutil, tarfile, tempfile, threading, time, zipfile
+from collections import OrderedDict
+
+## ----------------------------------------------------------------------
+
+## archive format -> file name endings
+archive_formats = OrderedDict( [
+	( 'zip',    ( '.zip', ) ),
+	( 'tar.gz', ( '.tar.gz', '.tgz' ) ),
+	( 'tar',    ( '.tar', ) ),
+] )
+
+
+## ----------------------------------------------------------------------
+class WriterException( Exception ):
+	pass
+
+
+## ----------------------------------------------------------------------
+def make_folder( path ):
+	"""
+	Creates a folder and its parents; safe to call from several threads.
+	"""
+	try:
+		os.makedirs( path )
+	except OSError:
+		if not os.path.isdir( path ):
+			raise
+
+def archive_format( filename ):
+	for name, endings in archive_formats.items( ):
+		if filename.lower( ).endswith( endings ):
+			return (name)
+
+	raise WriterException( "Unknown archive type %s (expected one of %s)." % \
+		(filename, ', '.join( [ x for endings in archive_formats.values( ) for x in endings ] )) )
+
+
+## ----------------------------------------------------------------------
+class OutputWriter( object ):
+	"""
+	Base class of the writers. Used as a context manager, it closes on
+	success and aborts if the block raises.
+	"""
+
+	def write( self, name, content ):
+		"""
+		:param name: Path relative to the output root, with '/' separators.
+		:param content: Text of the file.
+		"""
+		raise NotImplementedError
+
+	def write_all( self, files ):
+		"""
+		Writes every (name, content) pair of an iterable, e.g. a generator.
+		:return: the number of files written.
+		"""
+		count = 0
+		for name, content in files:
+			self.write( name, content )
+			count += 1
+		return (count)
+
+	def read( self, name ):
+		"""
+		:return: the current text of a file at the destination, or None.
+		"""
+		return (None)
+
+	def remove( self, name ):
+		"""
+		Deletes a file at the destination, e.g. one the project no longer
+		has. Archives start out empty, so they have nothing to delete.
+		"""
+		pass
+
+	def close( self ):
+		pass
+
+	def abort( self ):
+		pass
+
+	def __enter__( self ):
+		return (self)
+
+	def __exit__( self, exc_type, exc_value, traceback ):
+		if exc_type is None:
+			self.close( )
+		else:
+			self.abort( )
+		return (False)
+
+
+## ----------------------------------------------------------------------
+class MemoryWriter( OutputWriter ):
+	"""
+	Keeps the files in an ordered dictionary of name to text.
+	"""
+
+	def __init__( self ):
+		self.files = OrderedDict( )
+		self.lock  = threading.Lock( )
+
+	def write( self, name, content ):
+		with self.lock:
+			self.files[name] = content
+
+	def read( self, name ):
+		return (self.files.get( name, None ))
+
+	def remove( self, name ):
+		with self.lock:
+			self.files.pop( name, None )
+
+	def abort( self ):
+		self.files.clear( )
+
+
+## ----------------------------------------------------------------------
+class DirectoryWriter( OutputWriter ):
+	"""
+	Writes each file straight into a folder.
+	"""
+
+	def __init__( self, folder ):
+		self.folder = folder
+
+	def path( self, name ):
+		return (os.path.join( self.folder, *name.split( '/' ) ))
+
+	def write_file( self, path, content ):
+		make_folder( os.path.dirname( path ) or '.' )
+		with open( path, 'w' ) as fp:
+			fp.write( content )
+
+	def write( self, name, content ):
+		self.write_file( self.path( name ), content )
+
+	def read( self, name ):
+		path = self.path( name )
+		if not os.path.isfile( path ):
+			return (None)
+		with open( path, 'r' ) as fp:
+			return (fp.read( ))
+
+	def remove( self, name ):
+		path = self.path( name )
+		if os.path.isfile( path ):
+			os.remove( path )
+
+		## folders left empty go too, e.g. harness/
+		folder = os.path.dirname( path )
+		root = os.path.abspath( self.folder )
+		while os.path.abspath( folder ).startswith( root + os.sep ):
+			try:
+				os.rmdir( folder )
+			except OSError:
+				break
+			folder = os.path.dirname( folder )
+
+
+## ----------------------------------------------------------------------
+class AtomicDirectoryWriter( DirectoryWriter ):
+	"""
+	Stages the files in a temporary sibling of the target folder. On
+	close() a new target is renamed into place in one step; an existing
+	one gets each staged file renamed over its old version, so files this
+	run did not write or remove(), like hand-edited ones or build
+	folders, stay. The
+	renames are on one filesystem, so no single file is ever half-written,
+	but replacing the files of an existing target is only atomic per
+	file: if close() itself is interrupted, the target holds new versions
+	of the files moved so far and old versions of the rest. abort()
+	throws the staging folder away.
+	"""
+
+	def __init__( self, folder ):
+		DirectoryWriter.__init__( self, folder )
+
+		parent = os.path.dirname( os.path.abspath( folder ) )
+		make_folder( parent )
+
+		self.staging = tempfile.mkdtemp( prefix='.%s.' % os.path.basename( os.path.abspath( folder ) ),
+										 suffix='.tmp', dir=parent )
+		self.names   = [ ]
+		self.removed = [ ]
+		self.lock    = threading.Lock( )
+		self.done    = False
+
+	def write( self, name, content ):
+		if self.done:
+			raise WriterException( "Writer for %s is already closed." % self.folder )
+
+		self.write_file( os.path.join( self.staging, *name.split( '/' ) ), content )
+		with self.lock:
+			self.names.append( name )
+
+	def remove( self, name ):
+		"""
+		Deletes the file from the target on close(), after the new files are
+		in place.
+		"""
+		if self.done:
+			raise WriterException( "Writer for %s is already closed." % self.folder )
+
+		with self.lock:
+			self.removed.append( name )
+
+	def close( self ):
+		if self.done:
+			return
+		self.done = True
+
+		if not os.path.exists( self.folder ):
+			## mkdtemp() makes the folder private; give it the usual permissions
+			umask = os.umask( 0 )
+			os.umask( umask )
+			os.chmod( self.staging, 0o777 & ~umask )
+			os.rename( self.staging, self.folder )
+			return
+
+		for name in self.names:
+			target = self.path( name )
+			make_folder( os.path.dirname( target ) or '.' )
+			os.replace( os.path.join( self.staging, *name.split( '/' ) ), target )
+
+		for name in self.removed:
+			DirectoryWriter.remove( self, name )
+
+		shutil.rmtree( self.staging, ignore_errors=True )
+
+	def abort( self ):
+		if self.done:
+			return
+		self.done = True
+
+		shutil.rmtree( self.staging, ignore_errors=True )
+
+
+## ----------------------------------------------------------------------
+class ArchiveWriter( OutputWriter ):
+	"""
+	Streams the files into a zip, tar or gzipped tar archive, either a
+	file or any writable binary stream such as sys.stdout.buffer. A file
+	is written under a temporary name and renamed on close().
+	"""
+
+	def __init__( self, target, format=None, prefix='' ):
+		"""
+		:param target: File name or writable binary stream.
+		:param format: 'zip', 'tar' or 'tar.gz'; taken from the file name
+			if None.
+		:param prefix: Optional folder the files are stored under.
+		"""
+		if format is None:
+			if not isinstance( target, str ):
+				raise WriterException( "Archive format needed when writing to a stream." )
+			format = archive_format( target )
+		elif format not in archive_formats:
+			raise WriterException( "Unknown archive format %s." % format )
+
+		self.format   = format
+		self.prefix   = prefix.strip( '/' ) + '/' if prefix else ''
+		self.filename = None
+		self.done     = False
+		self.lock     = threading.Lock( )
+		self.mtime    = time.time( )
+
+		if isinstance( target, str ):
+			self.filename = target
+			self.stream = open( target + '.tmp', 'wb' )
+		else:
+			self.stream = target
+
+		if format == 'zip':
+			self.archive = zipfile.ZipFile( self.stream, 'w', zipfile.ZIP_DEFLATED )
+		else:
+			## '|' streams without seeking, so pipes work too
+			self.archive = tarfile.open( fileobj=self.stream, mode='w|gz' if format == 'tar.gz' else 'w|' )
+
+	def write( self, name, content ):
+		data = content.encode( 'utf-8' )
+		name = self.prefix + name
+
+		with self.lock:
+			if self.format == 'zip':
+				info = zipfile.ZipInfo( name, time.localtime( self.mtime )[:6] )
+				info.compress_type = zipfile.ZIP_DEFLATED
+				info.external_attr = 0o644 << 16
+				self.archive.writestr( info, data )
+			else:
+				info = tarfile.TarInfo( name )
+				info.size  = len( data )
+				info.mtime = self.mtime
+				info.mode  = 0o644
+				self.archive.addfile( info, io.BytesIO( data ) )
+
+	def close( self ):
+		if self.done:
+			return
+		self.done = True
+
+		self.archive.close( )
+		if self.filename is not None:
+			self.stream.close( )
+			os.replace( self.filename + '.tmp', self.filename )
+
+	def abort( self ):
+		if self.done:
+			return
+		self.done = True
+
+		## the archive writes its trailer to the stream when closed, so it
+		## has to go before the stream does
+		try:
+			self.archive.close( )
+		except (IOError, OSError, ValueError, tarfile.TarError, zipfile.BadZipfile):
+			pass
+
+		if self.filename is not None:
+			self.stream.close( )
+			os.remove( self.filename + '.tmp' )